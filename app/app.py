@@ -8,6 +8,7 @@ from controllers.apriori_controller import AprioriController
 from controllers.correlation_controller import CorrelationController
 from controllers.id3_controller import ID3Controller
 from models.scrollable_frame import create_scrollable_frame
+from models.graph_renderer import GraphRenderer
 
 class App:
     def __init__(self):
@@ -22,6 +23,9 @@ class App:
         # Quản lý frames
         self.frames = {}
 
+        # Vẽ biểu đồ Graphviz nền, dùng chung bộ nhớ đệm cho mọi màn hình
+        self.graph_renderer = GraphRenderer()
+
         # Tạo controller cho Main Menu và các thuật toán
         self.main_menu_controller = MainMenuController(self)
         self.kmeans_controller = KMeansController(self)
@@ -1,9 +1,21 @@
 import pandas as pd 
 from models.apriori_model import AprioriModel
+from models.itemset_cache import FrequentItemsetCache
 from tkinter import filedialog, messagebox
 
 
 class AprioriController:
+    # Ánh xạ tên thuật toán trên giao diện sang tên trong model
+    ALGORITHMS = {"Apriori": "apriori", "FP-Growth": "fpgrowth", "Eclat": "eclat", "SON (song song)": "son"}
+    # Số item phân biệt từ đó ma trận nhị phân được lưu dạng thưa (CSR)
+    SPARSE_ITEM_THRESHOLD = 1000
+    # Ánh xạ độ đo xếp hạng gợi ý trên giao diện sang tên trong RuleIndex
+    RECOMMEND_METRICS = {"Độ Tin Cậy": "confidence", "Lift": "lift"}
+    RECOMMEND_TOP_K = 5
+    # Kích thước tối đa của phần ma trận nhị phân hiển thị trên TreeView
+    PREVIEW_ROWS = 100
+    PREVIEW_COLUMNS = 50
+
     def __init__(self, app):
         """
         Khởi tạo controller cho thuật toán Apriori.
@@ -15,7 +27,10 @@ class AprioriController:
         self.binary_matrix = None  # Ma trận nhị phân
         self.frequent_itemsets = None  # Tập phổ biến
         self.maximal_itemsets = None  # Tập phổ biến tối đại
+        self.closed_itemsets = None  # Tập phổ biến đóng
         self.rules = None  # Các luật kết hợp
+        self.itemset_cache = FrequentItemsetCache(max_datasets=8)  # Kết quả khai thác theo bộ dữ liệu
+        self.dataset_fingerprint = None  # Dấu vân tay của ma trận nhị phân đang dùng
         self.init_view()
 
     def init_view(self):
@@ -40,21 +55,30 @@ class AprioriController:
             data = pd.read_excel(file_path)
             self.data = data
 
-            # Chuẩn bị giao dịch và tạo ma trận nhị phân
+            # Chuẩn bị giao dịch và tạo ma trận nhị phân (dạng thưa khi có nhiều item)
             self.model.prepare_transactions(data)
-            self.binary_matrix = self.model.generate_binary_matrix()
+            sparse = data['items'].nunique() > self.SPARSE_ITEM_THRESHOLD
+            self.binary_matrix = self.model.generate_binary_matrix(sparse=sparse)
+            self.dataset_fingerprint = self.itemset_cache.fingerprint(self.binary_matrix)
 
             # Hiển thị dữ liệu ban đầu
             self.view.update_treeview(self.view.data_tree, data.values.tolist(), data.columns.tolist())
 
-            # Hiển thị ma trận nhị phân
-            self.view.update_treeview(
-                self.view.binary_tree,
-                self.binary_matrix.values.tolist(),
-                self.binary_matrix.columns.tolist()
+            # Chỉ hiển thị một phần ma trận nhị phân
+            preview_rows, preview_columns = self.model.binary_matrix_preview(
+                self.binary_matrix, self.PREVIEW_ROWS, self.PREVIEW_COLUMNS
             )
+            self.view.update_treeview(self.view.binary_tree, preview_rows, preview_columns)
 
             self.view.update_log("Tải file thành công.")
+            n_transactions = len(self.binary_matrix)
+            n_items = self.binary_matrix.shape[1] - ('ID' in self.binary_matrix.columns)
+            if n_transactions > self.PREVIEW_ROWS or n_items > self.PREVIEW_COLUMNS:
+                self.view.update_log(
+                    f"Ma trận nhị phân {n_transactions} x {n_items}"
+                    f"{' (thưa)' if sparse else ''}: chỉ hiển thị {len(preview_rows)} giao dịch"
+                    f" và {len(preview_columns) - 1} item đầu tiên."
+                )
             self.app.center_frame()
 
         except Exception as e:
@@ -67,6 +91,9 @@ class AprioriController:
             messagebox.showwarning("Cảnh báo", "Vui lòng tải dữ liệu và tạo ma trận nhị phân trước.")
             self.view.update_log("Không thể tìm tập phổ biến: Dữ liệu hoặc ma trận nhị phân chưa được tạo.")
             return
+        if self.view.top_k_var.get():
+            self.find_top_k_itemsets()
+            return
         try:
             # Lấy ngưỡng min_sup từ giao diện
             min_sup = self.view.min_sup_entry.get()
@@ -79,12 +106,38 @@ class AprioriController:
 
             min_sup = float(min_sup)
             self.model.set_params(min_sup, self.model.min_conf)
+            self.model.set_algorithm(self.ALGORITHMS[self.view.algorithm_combobox.get()])
+
+            sampling = self.view.sampling_var.get()
+            if sampling:
+                try:
+                    sample_fraction = float(self.view.sample_fraction_entry.get())
+                    self.model.set_sampling(sample_fraction)
+                except ValueError:
+                    messagebox.showerror("Lỗi", "Tỉ lệ lấy mẫu không hợp lệ. Vui lòng nhập một số trong khoảng (0, 1].")
+                    self.view.update_log("Tỉ lệ lấy mẫu không hợp lệ.")
+                    return
+            else:
+                self.model.set_sampling(None)
 
             # Loại bỏ cột ID khỏi binary_matrix
             binary_matrix_no_id = self.binary_matrix.drop(columns=["ID"], errors="ignore")
 
-            # Tìm tập phổ biến
-            frequent_itemsets_df = self.model.find_frequent_itemsets(binary_matrix_no_id)
+            # Dùng lại kết quả đã khai thác ở ngưỡng thấp hơn nếu có, ngược lại khai thác mới.
+            # Kết quả lấy mẫu là xấp xỉ nên không đọc/ghi bộ nhớ đệm.
+            cached_counts = None if sampling else self.itemset_cache.get(self.dataset_fingerprint, min_sup)
+            if sampling:
+                frequent_itemsets_df = self.model.find_frequent_itemsets(binary_matrix_no_id)
+                self.log_sampling_report()
+            elif cached_counts is not None:
+                frequent_itemsets_df = self.model.set_frequent_itemsets(cached_counts)
+                self.view.update_log(
+                    f"Dùng kết quả đã lưu (min_sup đã khai thác = "
+                    f"{self.itemset_cache.mined_min_sup(self.dataset_fingerprint)})."
+                )
+            else:
+                frequent_itemsets_df = self.model.find_frequent_itemsets(binary_matrix_no_id)
+                self.itemset_cache.put(self.dataset_fingerprint, min_sup, self.model.itemset_counts, self.model.n_transactions)
 
             # Kiểm tra dữ liệu trả về
             if frequent_itemsets_df.empty:
@@ -108,12 +161,133 @@ class AprioriController:
 
             # Hiển thị tập phổ biến
             self.view.update_treeview(self.view.frequent_tree, frequent_data, ["Tập Phổ Biến", "Hỗ Trợ", "Độ Dài"])
-            self.view.update_log("Tìm tập phổ biến thành công.")
+            self.view.update_log(f"Tìm tập phổ biến thành công ({self.view.algorithm_combobox.get()}).")
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể tìm tập phổ biến: {e}")
             self.view.update_log(f"Lỗi khi tìm tập phổ biến: {e}")
 
 
+    def find_top_k_itemsets(self):
+        """Tìm k tập phổ biến nhất (không cần min_sup), có thể giới hạn khoảng độ dài."""
+        try:
+            k = int(self.view.top_k_entry.get())
+            min_len = int(self.view.min_len_entry.get() or 1)
+            max_len = int(self.view.max_len_entry.get()) if self.view.max_len_entry.get() else None
+            if k < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Lỗi", "k và khoảng độ dài phải là số nguyên dương.")
+            self.view.update_log("Tham số top-k không hợp lệ.")
+            return
+        try:
+            top_k_df = self.model.find_top_k_itemsets(k, min_len, max_len)
+            if top_k_df.empty:
+                messagebox.showinfo("Thông báo", "Không tìm thấy tập phổ biến nào.")
+                self.view.update_log("Không tìm thấy tập phổ biến nào.")
+                return
+
+            complete = min_len == 1 and max_len is None
+            if complete:
+                # Kết quả là toàn bộ tập phổ biến ở min_sup tương ứng: dùng được để sinh luật và cập nhật gia tăng
+                self.itemset_cache.put(
+                    self.dataset_fingerprint, self.model.min_sup, self.model.itemset_counts, self.model.n_transactions
+                )
+                self.maximal_itemsets = None
+                self.view.update_log(f"min_sup tương ứng với top-{k}: {self.model.min_sup:.4f}.")
+            else:
+                self.view.update_log(
+                    "Kết quả top-k có giới hạn độ dài chỉ dùng để hiển thị, không dùng để sinh luật hay thêm giao dịch."
+                )
+
+            top_k_df = top_k_df.copy()
+            top_k_df["support"] = top_k_df["support"].round(3)
+            self.frequent_itemsets = {
+                frozenset(itemset): support
+                for itemset, support in zip(top_k_df['itemsets'], top_k_df['support'])
+            } if complete else None
+            frequent_data = [
+                [", ".join(itemset), support, len(itemset)]
+                for itemset, support in zip(top_k_df['itemsets'], top_k_df['support'])
+            ]
+            self.view.update_treeview(self.view.frequent_tree, frequent_data, ["Tập Phổ Biến", "Hỗ Trợ", "Độ Dài"])
+            self.view.update_log(f"Tìm top-{k} tập phổ biến thành công ({len(top_k_df)} tập, kể cả các tập đồng hạng).")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể tìm top-k tập phổ biến: {e}")
+            self.view.update_log(f"Lỗi khi tìm top-k tập phổ biến: {e}")
+
+    def log_sampling_report(self):
+        """Ghi kết quả lượt kiểm tra của chế độ lấy mẫu vào log."""
+        report = self.model.sampling_report
+        self.view.update_log(
+            f"Lấy mẫu {report['sample_size']}/{self.model.n_rows} giao dịch, min_sup trên mẫu "
+            f"= {report['lowered_min_sup']:.4f}; đếm lại {report['n_candidates']} ứng viên "
+            f"({report['n_border']} tập biên âm) trên toàn bộ dữ liệu."
+        )
+        if report["exact"]:
+            self.view.update_log("Không tập biên âm nào phổ biến: kết quả chắc chắn chính xác.")
+        else:
+            self.view.update_log(
+                f"Có {report['border_frequent']} tập biên âm phổ biến: kết quả có thể thiếu một số tập phổ biến. "
+                f"Hãy tăng tỉ lệ lấy mẫu hoặc tắt chế độ lấy mẫu."
+            )
+
+    def append_transactions(self):
+        """
+        Tải thêm một file giao dịch và cập nhật tập phổ biến theo kiểu gia tăng (FUP),
+        sau đó làm mới các luật kết hợp nếu đã sinh trước đó.
+        """
+        if not self.frequent_itemsets or len(self.frequent_itemsets) == 0:
+            messagebox.showwarning("Cảnh báo", "Vui lòng tìm tập phổ biến trước.")
+            self.view.update_log("Không thể thêm giao dịch: Tập phổ biến chưa được tìm.")
+            return
+        try:
+            file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
+            if not file_path:
+                return
+            new_data = pd.read_excel(file_path)
+
+            frequent_itemsets_df = self.model.update_frequent_itemsets(new_data)
+            self.data = pd.concat([self.data, new_data], ignore_index=True)
+
+            # Tạo lại ma trận nhị phân cho phần hiển thị và bộ nhớ đệm (không khai thác lại)
+            sparse = self.data['items'].nunique() > self.SPARSE_ITEM_THRESHOLD
+            self.binary_matrix = self.model.generate_binary_matrix(sparse=sparse)
+            self.dataset_fingerprint = self.itemset_cache.fingerprint(self.binary_matrix)
+            self.itemset_cache.put(
+                self.dataset_fingerprint, self.model.itemset_min_sup, self.model.itemset_counts, self.model.n_transactions
+            )
+            self.maximal_itemsets = None
+            self.closed_itemsets = None
+
+            self.view.update_treeview(self.view.data_tree, self.data.values.tolist(), self.data.columns.tolist())
+            preview_rows, preview_columns = self.model.binary_matrix_preview(
+                self.binary_matrix, self.PREVIEW_ROWS, self.PREVIEW_COLUMNS
+            )
+            self.view.update_treeview(self.view.binary_tree, preview_rows, preview_columns)
+
+            frequent_itemsets_df["support"] = frequent_itemsets_df["support"].round(3)
+            self.frequent_itemsets = {
+                frozenset(itemset): support
+                for itemset, support in zip(frequent_itemsets_df['itemsets'], frequent_itemsets_df['support'])
+            }
+            frequent_data = [
+                [", ".join(itemset), support, len(itemset)]
+                for itemset, support in self.frequent_itemsets.items()
+            ]
+            self.view.update_treeview(self.view.frequent_tree, frequent_data, ["Tập Phổ Biến", "Hỗ Trợ", "Độ Dài"])
+            self.view.update_log(
+                f"Đã thêm {new_data['ID'].nunique()} giao dịch. Cập nhật tập phổ biến thành công "
+                f"({self.model.rescanned_itemsets} tập phải đếm lại trên dữ liệu cũ)."
+            )
+
+            # Làm mới luật kết hợp từ tập phổ biến đã cập nhật
+            if self.model.rules is not None and not self.view.closed_rules_var.get():
+                self.generate_rules()
+            self.app.center_frame()
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể thêm giao dịch: {e}")
+            self.view.update_log(f"Lỗi khi thêm giao dịch: {e}")
+
     def find_maximal_itemsets(self):
         """Tìm tập phổ biến tối đại từ tập phổ biến."""
         if not self.frequent_itemsets or len(self.frequent_itemsets) == 0:
@@ -154,9 +328,51 @@ class AprioriController:
 
 
 
+    def find_closed_itemsets(self):
+        """Tìm tập phổ biến đóng trực tiếp từ ma trận nhị phân."""
+        if self.data is None or self.binary_matrix is None:
+            messagebox.showwarning("Cảnh báo", "Vui lòng tải dữ liệu và tạo ma trận nhị phân trước.")
+            self.view.update_log("Không thể tìm tập phổ biến đóng: Dữ liệu hoặc ma trận nhị phân chưa được tạo.")
+            return
+        try:
+            # Lấy ngưỡng min_sup từ giao diện
+            min_sup = self.view.min_sup_entry.get()
+            if not min_sup or not min_sup.replace('.', '', 1).isdigit() or float(min_sup) <= 0 or float(min_sup) > 1:
+                messagebox.showerror("Lỗi", "Ngưỡng hỗ trợ (min_sup) không hợp lệ. Vui lòng nhập một số trong khoảng (0, 1].")
+                self.view.update_log("Ngưỡng hỗ trợ không hợp lệ.")
+                return
+            self.model.set_params(float(min_sup), self.model.min_conf)
+
+            closed_itemsets_df = self.model.find_closed_frequent_itemsets(self.binary_matrix)
+            self.closed_itemsets = closed_itemsets_df
+
+            if closed_itemsets_df.empty:
+                messagebox.showinfo("Thông báo", "Không tìm thấy tập phổ biến đóng nào.")
+                self.view.update_log("Không tìm thấy tập phổ biến đóng nào.")
+                return
+
+            closed_data = [
+                [", ".join(map(str, itemset)), round(support, 3), len(itemset)]
+                for itemset, support in zip(closed_itemsets_df['itemsets'], closed_itemsets_df['support'])
+            ]
+            self.view.update_treeview(
+                self.view.closed_tree,
+                closed_data,
+                ["Tập Phổ Biến Đóng", "Hỗ Trợ", "Độ Dài"]
+            )
+            self.view.update_log(f"Tìm tập phổ biến đóng thành công: {len(closed_itemsets_df)} tập.")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể tìm tập phổ biến đóng: {e}")
+            self.view.update_log(f"Lỗi khi tìm tập phổ biến đóng: {e}")
+
     def generate_rules(self):
-        """Sinh các luật kết hợp từ tập phổ biến."""
-        if not self.frequent_itemsets or len(self.frequent_itemsets) == 0:
+        """Sinh các luật kết hợp từ tập phổ biến (hoặc từ tập phổ biến đóng nếu được chọn)."""
+        use_closed = self.view.closed_rules_var.get()
+        if use_closed and (self.closed_itemsets is None or self.closed_itemsets.empty):
+            messagebox.showwarning("Cảnh báo", "Vui lòng tìm tập phổ biến đóng trước.")
+            self.view.update_log("Không thể sinh luật kết hợp: Tập phổ biến đóng chưa được tìm.")
+            return
+        if not use_closed and (not self.frequent_itemsets or len(self.frequent_itemsets) == 0):
             messagebox.showwarning("Cảnh báo", "Vui lòng tìm tập phổ biến trước.")
             self.view.update_log("Không thể sinh luật kết hợp: Tập phổ biến chưa được tìm.")
             return
@@ -171,20 +387,14 @@ class AprioriController:
 
             min_conf = float(min_conf)
             self.model.set_params(self.model.min_sup, min_conf)
-            
-            # Chuyển đổi self.frequent_itemsets từ dict sang DataFrame
-            frequent_itemsets_df = pd.DataFrame(
-                {
-                    "itemsets": list(self.frequent_itemsets.keys()),
-                    "support": list(self.frequent_itemsets.values())
-                }
-            )
-            frequent_itemsets_df["itemsets"] = frequent_itemsets_df["itemsets"].apply(
-                lambda x: frozenset(x) if not isinstance(x, frozenset) else x
-            )
 
-            # Gọi model để sinh luật
-            rules = self.model.generate_rules(frequent_itemsets_df)
+            if use_closed:
+                # Sinh luật trên biểu diễn nén, không cần toàn bộ tập phổ biến
+                rules = self.model.generate_rules_from_closed(self.closed_itemsets)
+            else:
+                # Sinh luật trên bảng itemset mã hóa số nguyên, chỉ giải mã để hiển thị
+                self.model.generate_rules_native()
+                rules = self.model.rules_to_frame()
 
             # Chuyển đổi dữ liệu luật kết hợp sang danh sách để hiển thị
             # Làm tròn các cột hỗ trợ và độ tin cậy
@@ -201,12 +411,34 @@ class AprioriController:
                 rules_data,
                 ["Tiền Đề", "Kết Quả", "Hỗ Trợ Tiền Đề", "Hỗ Trợ Kết Quả", "Hỗ Trợ", "Độ Tin Cậy"]
             )
-            self.view.update_log("Sinh luật kết hợp thành công.")
+            self.view.update_log(f"Sinh luật kết hợp thành công{' (từ tập đóng)' if use_closed else ''}.")
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể sinh luật kết hợp: {e}")
             self.view.update_log(f"Lỗi khi sinh luật kết hợp: {e}")
 
 
+    def recommend(self):
+        """Gợi ý các item tiếp theo cho giỏ hàng nhập trên giao diện (các item cách nhau bởi dấu phẩy)."""
+        if self.model.rules is None or self.model.rules.empty:
+            messagebox.showwarning("Cảnh báo", "Vui lòng sinh luật kết hợp trước.")
+            self.view.update_log("Không thể gợi ý: Luật kết hợp chưa được sinh.")
+            return
+        try:
+            basket = [item.strip() for item in self.view.basket_entry.get().split(",") if item.strip()]
+            if not basket:
+                messagebox.showwarning("Cảnh báo", "Vui lòng nhập các item trong giỏ hàng.")
+                return
+            metric = self.RECOMMEND_METRICS[self.view.recommend_metric_combobox.get()]
+            recommendations = self.model.recommend(basket, self.RECOMMEND_TOP_K, metric)
+            if not recommendations:
+                self.view.update_log(f"Không có gợi ý cho giỏ hàng {basket}.")
+                return
+            suggestion = ", ".join(f"{item} ({score:.3f})" for item, score in recommendations)
+            self.view.update_log(f"Gợi ý cho {basket}: {suggestion}")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể gợi ý: {e}")
+            self.view.update_log(f"Lỗi khi gợi ý: {e}")
+
     def reset(self):
         """
         Đặt lại toàn bộ dữ liệu và giao diện.
@@ -215,12 +447,14 @@ class AprioriController:
             # Reset dữ liệu trong class
             self.data = None
             self.binary_matrix = None
+            self.dataset_fingerprint = None
             self.frequent_itemsets = None
             self.maximal_itemsets = None
+            self.closed_itemsets = None
             self.rules = None
 
             # Reset tất cả các TreeView (bao gồm cả xóa heading)
-            for tree in [self.view.data_tree, self.view.binary_tree, self.view.frequent_tree, self.view.maximal_tree, self.view.rules_tree]:
+            for tree in [self.view.data_tree, self.view.binary_tree, self.view.frequent_tree, self.view.maximal_tree, self.view.closed_tree, self.view.rules_tree]:
                 # Xóa toàn bộ các hàng trong TreeView
                 tree.delete(*tree.get_children())
                 # Xóa các heading nếu có
@@ -231,6 +465,17 @@ class AprioriController:
             # Reset các ô nhập liệu và log
             self.view.min_sup_entry.delete(0, "end")
             self.view.min_conf_entry.delete(0, "end")
+            self.view.algorithm_combobox.current(0)
+            self.view.closed_rules_var.set(False)
+            self.view.sampling_var.set(False)
+            self.view.top_k_var.set(False)
+            for entry, default in ((self.view.top_k_entry, "10"), (self.view.min_len_entry, "1"), (self.view.max_len_entry, "")):
+                entry.delete(0, "end")
+                entry.insert(0, default)
+            self.view.sample_fraction_entry.delete(0, "end")
+            self.view.sample_fraction_entry.insert(0, "0.1")
+            self.view.basket_entry.delete(0, "end")
+            self.view.recommend_metric_combobox.current(0)
             self.view.log_text.configure(state="normal")
             self.view.log_text.delete(1.0, "end")
             self.view.log_text.configure(state="disabled")
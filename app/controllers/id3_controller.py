@@ -62,26 +62,90 @@ class ID3Controller:
             self.view.update_log("Không thể huấn luyện mô hình: Dữ liệu bị thiếu.")
             return
         try:
+            max_depth = int(self.view.max_depth_entry.get()) if self.view.max_depth_entry.get() else None
+            min_samples_split = int(self.view.min_samples_entry.get() or 2)
+            min_gain = float(self.view.min_gain_entry.get() or 0)
+            if (max_depth is not None and max_depth < 0) or min_samples_split < 2 or min_gain < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Lỗi", "Độ sâu tối đa phải là số nguyên >= 0, số mẫu tối thiểu là số nguyên >= 2 và Gain tối thiểu >= 0.")
+            self.view.update_log("Điều kiện dừng không hợp lệ.")
+            return
+        try:
+            pruning_modes = {"Không": None, "Bi quan (C4.5)": "pessimistic", "Giảm lỗi": "reduced_error"}
+            self.model.set_growth_limits(max_depth, min_samples_split, min_gain, pruning_modes.get(self.view.pruning_combobox.get()))
+
+            # Cách chia thuộc tính số: mỗi giá trị một nhánh, ngưỡng C4.5 hoặc khoảng phân vị
+            numeric_modes = {"Phân loại": "categorical", "Ngưỡng (C4.5)": "threshold", "Histogram": "histogram"}
+            self.model.set_numeric_splits(numeric_modes.get(self.view.numeric_combobox.get(), "categorical"))
+
             # Tính toán cây quyết định bằng phương pháp Gain hoặc Gini
             if method == "Gain":
-                self.tree_result = self.model.build_tree(self.data, self.target_column, method="gain")
+                self.tree_result = self.model.build_tree_and_store(self.data, self.target_column, method="gain")
             elif method == "Gini":
-                self.tree_result = self.model.build_tree(self.data, self.target_column, method="gini")
+                self.tree_result = self.model.build_tree_and_store(self.data, self.target_column, method="gini")
             else:
                 raise ValueError("Phương pháp tính toán không hợp lệ.")
 
             # Hiển thị kết quả trên giao diện
             self.view.display_results(self.tree_result)
             
-            # Tạo và hiển thị biểu đồ
-            graph_data = self.model.generate_graph(self.tree_result)
-            self.view.display_graph(graph_data)
-            
-            self.view.update_log(f"Huấn luyện thành công với phương pháp: {method}")
+            # Vẽ biểu đồ trên luồng nền, hiển thị khi xong để giao diện không bị treo
+            self.app.graph_renderer.render_async(
+                self.view, self.model.build_graph(self.tree_result).source, self.view.display_graph,
+                error_callback=self.show_graph_error, channel="id3",
+            )
+
+            self.view.update_log(f"Huấn luyện thành công với phương pháp: {method}. Đang vẽ biểu đồ...")
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể huấn luyện mô hình: {e}")
             self.view.update_log(f"Lỗi khi huấn luyện mô hình: {e}")
 
+    def save_model(self):
+        """
+        Lưu cây đã huấn luyện vào file mô hình nhị phân.
+        """
+        if self.tree_result is None:
+            messagebox.showwarning("Cảnh báo", "Vui lòng huấn luyện mô hình trước khi lưu.")
+            return
+        try:
+            file_path = filedialog.asksaveasfilename(defaultextension=".dmm", filetypes=[("Model files", "*.dmm")])
+            if not file_path:
+                return
+            self.model.save_model(file_path)
+            self.view.update_log(f"Đã lưu mô hình: {file_path}")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể lưu mô hình: {e}")
+            self.view.update_log(f"Lỗi khi lưu mô hình: {e}")
+
+    def load_model(self):
+        """
+        Tải cây đã lưu và hiển thị, không cần huấn luyện lại từ file Excel.
+        """
+        try:
+            file_path = filedialog.askopenfilename(filetypes=[("Model files", "*.dmm")])
+            if not file_path:
+                return
+            self.tree_result = self.model.load_model(file_path)
+            self.view.display_results(self.tree_result)
+            self.app.graph_renderer.render_async(
+                self.view, self.model.build_graph(self.tree_result).source, self.view.display_graph,
+                error_callback=self.show_graph_error, channel="id3",
+            )
+            params = self.model.params
+            self.view.update_log(
+                f"Đã tải mô hình (cột mục tiêu: {params.get('target')}, phương pháp: {params.get('method')}, "
+                f"dữ liệu: {str(self.model.fingerprint)[:12]})."
+            )
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể tải mô hình: {e}")
+            self.view.update_log(f"Lỗi khi tải mô hình: {e}")
+
+    def show_graph_error(self, error):
+        """Báo lỗi khi vẽ biểu đồ nền thất bại."""
+        messagebox.showerror("Lỗi", f"Không thể vẽ biểu đồ: {error}")
+        self.view.update_log(f"Lỗi khi vẽ biểu đồ: {error}")
+
     def reset(self):
         """
         Đặt lại toàn bộ dữ liệu và giao diện.
@@ -92,6 +156,7 @@ class ID3Controller:
             self.data = None
             self.target_column = None
             self.tree_result = None
+            self.app.graph_renderer.cancel("id3")  # Bỏ biểu đồ đang vẽ dở
 
             # Reset giao diện
             self.view.reset()
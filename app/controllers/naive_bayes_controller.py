@@ -1,3 +1,7 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
 from tkinter import messagebox, filedialog
 from models.naive_bayes_model import NaiveBayesModel
@@ -12,6 +16,13 @@ class NaiveBayesController:
         self.feature_columns = []
         self.target_column = None
         self.inputs = {}
+        self.model_loaded = False  # Mô hình được tải từ file (phân loại không cần dữ liệu huấn luyện)
+        self.data_version = 0  # Tăng mỗi lần tải dữ liệu: định danh bộ dữ liệu trong khóa bộ nhớ đệm
+        self.fit_cache = OrderedDict()  # (bộ dữ liệu, cột đặc trưng, cột mục tiêu, Laplace) -> mô hình đã huấn luyện
+        self.max_cached_models = 8
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.last_fit_time = None  # Thời gian (giây) của lần huấn luyện gần nhất
         self.init_view()
         
 
@@ -31,6 +42,8 @@ class NaiveBayesController:
 
             # Đọc dữ liệu từ file
             self.data = pd.read_excel(file_path)
+            self.data_version += 1
+            self.model_loaded = False
             self.view.file_label.config(text=f"Tải thành công: {file_path.split('/')[-1]}")
             self.update_treeview(self.data)
             self.update_column_listboxes(self.data)
@@ -92,7 +105,7 @@ class NaiveBayesController:
     def classify_sample(self):
         """Phân loại một mẫu dựa trên dữ liệu đã tải."""
         try:
-            if self.data is None:
+            if self.data is None and not self.model_loaded:
                 messagebox.showwarning("Cảnh báo", "Vui lòng tải dữ liệu trước khi phân loại.")
                 return
 
@@ -101,24 +114,147 @@ class NaiveBayesController:
                 messagebox.showwarning("Cảnh báo", "Vui lòng điền đầy đủ thông tin mẫu.")
                 return
 
-            if not self.target_column or not self.feature_columns:
+            if not self.feature_columns or (not self.target_column and not self.model_loaded):
                 messagebox.showwarning("Cảnh báo", "Vui lòng chọn các cột đặc trưng và cột mục tiêu.")
                 return
 
-            # Huấn luyện model
-            X_train = self.data[self.feature_columns]
-            y_train = self.data[self.target_column]
-            self.model.fit(X_train, y_train)
+            # Lấy mô hình đã huấn luyện từ bộ nhớ đệm (bỏ qua nếu dùng mô hình đã tải từ file)
+            cache_info = ""
+            if not self.model_loaded:
+                cached = self.get_fitted_model()
+                cache_info = (
+                    f" | Bộ nhớ đệm: {'trúng' if cached else 'huấn luyện mới'} "
+                    f"({self.cache_hits} trúng / {self.cache_misses} lần huấn luyện, "
+                    f"huấn luyện gần nhất {self.last_fit_time * 1000:.1f} ms)"
+                )
 
             # Phân loại mẫu
             prediction = self.model.predict(sample)
             self.view.show_result(prediction)
-            self.view.update_log(f"Phân loại thành công. Kết quả: {prediction}")
+            self.view.update_log(f"Phân loại thành công. Kết quả: {prediction}{cache_info}")
             self.app.center_frame()
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể phân loại: {e}")
             self.view.update_log(f"Lỗi khi phân loại: {e}")
 
+    def classify_file(self):
+        """Phân loại toàn bộ bản ghi của một file bằng predict_batch rồi lưu kết quả ra file."""
+        try:
+            if self.data is None and not self.model_loaded:
+                messagebox.showwarning("Cảnh báo", "Vui lòng tải dữ liệu hoặc mô hình trước khi phân loại.")
+                return
+            if not self.model_loaded:
+                self.feature_columns = [self.view.selected_columns_listbox.get(i) for i in range(self.view.selected_columns_listbox.size())]
+                self.target_column = self.view.target_combobox.get()
+                if not self.feature_columns or not self.target_column:
+                    messagebox.showwarning("Cảnh báo", "Vui lòng chọn các cột đặc trưng và cột mục tiêu.")
+                    return
+                self.get_fitted_model()
+
+            file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")])
+            if not file_path:
+                return
+            records = pd.read_csv(file_path) if file_path.lower().endswith(".csv") else pd.read_excel(file_path)
+
+            start = time.perf_counter()
+            labels, log_posteriors = self.model.predict_batch(records)
+            elapsed = time.perf_counter() - start
+
+            # Kết quả: dữ liệu gốc kèm nhãn dự đoán và xác suất hậu nghiệm của nhãn đó
+            results = records.assign(**{
+                "Dự đoán": labels,
+                "Xác suất": np.exp(log_posteriors.to_numpy().max(axis=1)),
+            })
+            counts = pd.Series(labels).value_counts()
+            summary = "\n".join(f"  {label}: {count}" for label, count in counts.items())
+            self.view.show_batch_result(
+                f"Đã phân loại {len(records)} bản ghi trong {elapsed:.3f} giây "
+                f"({len(records) / max(elapsed, 1e-9):,.0f} bản ghi/giây).\nSố bản ghi theo nhãn:\n{summary}"
+            )
+
+            save_path = filedialog.asksaveasfilename(
+                defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx")]
+            )
+            if save_path:
+                if save_path.lower().endswith(".xlsx"):
+                    results.to_excel(save_path, index=False)
+                else:
+                    results.to_csv(save_path, index=False)
+                self.view.update_log(f"Đã phân loại {len(records)} bản ghi và lưu kết quả: {save_path}")
+            else:
+                self.view.update_log(f"Đã phân loại {len(records)} bản ghi (không lưu kết quả).")
+            self.app.center_frame()
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể phân loại file: {e}")
+            self.view.update_log(f"Lỗi khi phân loại file: {e}")
+
+    def get_fitted_model(self):
+        """
+        Đặt self.model là mô hình đã huấn luyện cho bộ dữ liệu, cột đặc trưng, cột mục tiêu và tùy chọn
+        Laplace hiện tại; chỉ huấn luyện lại khi một trong các yếu tố đó thay đổi (loại bỏ theo LRU).
+        Returns:
+            bool: True nếu lấy được từ bộ nhớ đệm.
+        """
+        laplace = bool(self.view.laplace_var.get())
+        key = (self.data_version, tuple(self.feature_columns), self.target_column, laplace)
+        model = self.fit_cache.get(key)
+        if model is not None:
+            self.fit_cache.move_to_end(key)
+            self.cache_hits += 1
+            self.model = model
+            return True
+
+        self.cache_misses += 1
+        model = NaiveBayesModel(laplace_smoothing=laplace)
+        start = time.perf_counter()
+        model.fit(self.data[self.feature_columns], self.data[self.target_column])
+        self.last_fit_time = time.perf_counter() - start
+        self.fit_cache[key] = model
+        while len(self.fit_cache) > self.max_cached_models:
+            self.fit_cache.popitem(last=False)
+        self.model = model
+        return False
+
+    def save_model(self):
+        """Lưu mô hình đã huấn luyện vào file mô hình nhị phân."""
+        if not self.model.is_trained:
+            messagebox.showwarning("Cảnh báo", "Vui lòng phân loại ít nhất một mẫu để huấn luyện mô hình trước khi lưu.")
+            return
+        try:
+            file_path = filedialog.asksaveasfilename(defaultextension=".dmm", filetypes=[("Model files", "*.dmm")])
+            if not file_path:
+                return
+            self.model.save_model(file_path)
+            self.view.update_log(f"Đã lưu mô hình: {file_path}")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể lưu mô hình: {e}")
+            self.view.update_log(f"Lỗi khi lưu mô hình: {e}")
+
+    def load_model(self):
+        """Tải mô hình đã lưu và tạo các trường nhập mẫu theo các thuộc tính của mô hình."""
+        try:
+            file_path = filedialog.askopenfilename(filetypes=[("Model files", "*.dmm")])
+            if not file_path:
+                return
+            # Mô hình mới để không ghi đè các mô hình trong bộ nhớ đệm
+            model = NaiveBayesModel()
+            model.load_model(file_path)
+            self.model = model
+            self.model_loaded = True
+            self.view.laplace_var.set(model.laplace_smoothing)
+            self.feature_columns = list(self.model.log_tables)
+            self.target_column = None
+            self.view.clear_input_frame()
+            self.inputs = {
+                feature: self.view.add_input_combobox(feature, sorted(self.model.feature_values[feature], key=str))
+                for feature in self.feature_columns
+            }
+            self.view.update_log(f"Đã tải mô hình với {len(self.feature_columns)} thuộc tính (dữ liệu: {str(self.model.fingerprint)[:12]}).")
+            self.app.center_frame()
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể tải mô hình: {e}")
+            self.view.update_log(f"Lỗi khi tải mô hình: {e}")
+
     def reset_data(self):
         """
         Reset giao diện và dữ liệu.
@@ -126,6 +262,9 @@ class NaiveBayesController:
         try:
             # Đặt lại model
             self.model.reset()
+            self.model_loaded = False
+            self.fit_cache.clear()
+            self.view.laplace_var.set(False)
             # Đặt lại giao diện
             self.view.file_label.config(text="Chưa tải file")  # Nhãn file
             self.view.tree.delete(*self.view.tree.get_children())  # Xóa TreeView
@@ -108,9 +108,20 @@ class RoughSetsController:
             messagebox.showerror("Lỗi", f"Không thể phân tích: {e}")
 
     def display_graph(self, lower, upper, boundary, outside, X):
-        """Tạo và hiển thị biểu đồ trong Canvas."""
+        """Tạo biểu đồ trên luồng nền và hiển thị trong Canvas khi vẽ xong."""
+        try:
+            source = self.model.build_graph(lower, upper, boundary, outside, X).source
+            self.app.graph_renderer.render_async(
+                self.view.canvas, source, self.show_graph_image,
+                error_callback=lambda e: messagebox.showerror("Lỗi", f"Không thể hiển thị biểu đồ: {e}"),
+                channel="rough_sets",
+            )
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể hiển thị biểu đồ: {e}")
+
+    def show_graph_image(self, graph_image):
+        """Hiển thị ảnh biểu đồ đã vẽ trong Canvas."""
         try:
-            graph_image = self.model.generate_graph(lower, upper, boundary, outside, X)
             image = Image.open(BytesIO(graph_image))
             photo = ImageTk.PhotoImage(image)
 
@@ -123,6 +134,7 @@ class RoughSetsController:
     def reset_data(self):
         """Reset giao diện và dữ liệu."""
         self.model = None  # Reset model
+        self.app.graph_renderer.cancel("rough_sets")  # Bỏ biểu đồ đang vẽ dở
         self.view.file_label.config(text="Chưa tải file")
         self.view.tree.delete(*self.view.tree.get_children())
         self.view.all_columns_listbox.delete(0, "end")
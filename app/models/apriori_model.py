@@ -1,15 +1,44 @@
+import numpy as np
 import pandas as pd
-from mlxtend.frequent_patterns import apriori, association_rules
-from mlxtend.preprocessing import TransactionEncoder
+from scipy.sparse import csr_matrix
+from mlxtend.frequent_patterns import apriori, fpgrowth, association_rules
+from models.eclat_model import closed_itemsets, code_bitmaps, eclat, min_support_count, top_k_itemsets
+from models.superset_index import SupersetIndex
+from models.fup_model import fup_update
+from models.son_model import son
+from models.sampling_model import toivonen
+from models.rule_generator import generate_rules as generate_rule_table
+from models.rule_index import RuleIndex
+from models.item_dictionary import build_item_labels, decode_transactions, encode_transactions, merge_item_labels
 
 
 class AprioriModel:
+    # Các thuật toán khai thác tập phổ biến được hỗ trợ
+    ALGORITHMS = ("apriori", "fpgrowth", "eclat", "son")
+
     def __init__(self):
         self.min_sup = None  # Ngưỡng hỗ trợ tối thiểu
         self.min_conf = None  # Ngưỡng độ tin cậy tối thiểu
-        self.transactions = []  # Danh sách các giao dịch
+        self.algorithm = "apriori"  # Thuật toán khai thác tập phổ biến
+        self.n_workers = None  # Số tiến trình cho chế độ phân vùng song song (None = số lõi CPU)
+        self.sample_fraction = None  # Tỉ lệ lấy mẫu cho chế độ xấp xỉ Toivonen (None = khai thác chính xác)
+        self.sample_seed = None  # Hạt giống ngẫu nhiên khi lấy mẫu
+        self.sampling_report = None  # Báo cáo lượt kiểm tra của lần khai thác bằng lấy mẫu gần nhất
+        self.transaction_offsets = np.zeros(1, dtype=np.int64)  # Giao dịch t gồm transaction_items[offsets[t]:offsets[t + 1]]
+        self.transaction_items = np.zeros(0, dtype=np.int32)  # Mã item của mọi giao dịch nối liền (CSR)
+        self.transaction_ids = []  # Nhãn ID của từng giao dịch, lưu tách khỏi ma trận
+        self.item_labels = None  # Từ điển item (pd.Index): vị trí của nhãn chính là mã int32 của item
         self.frequent_itemsets = None  # Tập phổ biến với độ hỗ trợ
+        self.itemset_counts = {}  # tuple mã item -> số giao dịch hỗ trợ chính xác của từng tập phổ biến
+        self.itemset_min_sup = None  # Ngưỡng min_sup đã dùng để khai thác self.frequent_itemsets
+        self.rescanned_itemsets = 0  # Số itemset phải đếm lại trên dữ liệu cũ ở lần cập nhật gần nhất
+        self.n_transactions = 0  # Số giao dịch ứng với self.itemset_counts
+        self.closed_itemsets = None  # Tập phổ biến đóng với độ hỗ trợ
+        self.closed_n_transactions = 0  # Số giao dịch ứng với self.closed_itemsets
         self.rules = None  # Các luật kết hợp
+        self.rule_table = None  # Luật kết hợp dạng cột (mảng NumPy, item mã hóa số nguyên)
+        self.rule_item_labels = None  # Nhãn item tương ứng với mã trong self.rule_table
+        self.rule_index = None  # Chỉ mục luật để gợi ý item cho giỏ hàng
 
     def set_params(self, min_sup, min_conf):
         """Đặt giá trị ngưỡng hỗ trợ và độ tin cậy."""
@@ -20,6 +49,32 @@ class AprioriModel:
         self.min_sup = min_sup
         self.min_conf = min_conf
 
+    def set_algorithm(self, algorithm, n_workers=None):
+        """
+        Chọn thuật toán khai thác tập phổ biến.
+        Args:
+            algorithm (str): "apriori" (duyệt theo mức), "fpgrowth" (cây FP),
+                "eclat" (bitmap giao dịch theo chiều dọc) hoặc "son" (phân vùng song song).
+            n_workers (int | None): Số tiến trình cho "son" (None = số lõi CPU).
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Thuật toán không hợp lệ: {algorithm}. Chọn một trong {self.ALGORITHMS}.")
+        if n_workers is not None and n_workers < 1:
+            raise ValueError("Số tiến trình (n_workers) phải >= 1.")
+        self.algorithm = algorithm
+        self.n_workers = n_workers
+
+    def set_sampling(self, sample_fraction=None, seed=None):
+        """
+        Bật/tắt chế độ khai thác xấp xỉ bằng lấy mẫu (Toivonen).
+        Args:
+            sample_fraction (float | None): Tỉ lệ giao dịch được lấy mẫu, trong khoảng (0, 1]; None để tắt.
+            seed (int | None): Hạt giống ngẫu nhiên.
+        """
+        if sample_fraction is not None and (sample_fraction <= 0 or sample_fraction > 1):
+            raise ValueError("Tỉ lệ lấy mẫu phải nằm trong khoảng (0, 1].")
+        self.sample_fraction = sample_fraction
+        self.sample_seed = seed
 
     def prepare_transactions(self, data):
         """
@@ -28,60 +83,463 @@ class AprioriModel:
         """
         if 'ID' not in data.columns or 'items' not in data.columns:
             raise ValueError("Dữ liệu phải chứa các cột 'ID' và 'items'.")
-        self.transactions = data.groupby('ID')['items'].apply(list).tolist()
+        # Mỗi item chỉ được băm một lần khi tạo từ điển; các bước sau chỉ làm việc trên mã số nguyên
+        self.item_labels = build_item_labels(data['items'].dropna())
+        self.transaction_ids, self.transaction_offsets, self.transaction_items = encode_transactions(data, self.item_labels)
+
+    @property
+    def transactions(self):
+        """Danh sách giao dịch đã giải mã về nhãn item (chỉ dùng để hiển thị)."""
+        if self.item_labels is None:
+            return []
+        return decode_transactions(self.transaction_offsets, self.transaction_items, self.item_labels)
 
-    def generate_binary_matrix(self):
+    @property
+    def n_rows(self):
+        """Số giao dịch hiện có."""
+        return len(self.transaction_offsets) - 1
+
+    def transaction_matrix(self):
+        """Ma trận CSR (giao dịch x mã item) dựng thẳng từ offsets/items, không sao chép dữ liệu."""
+        return csr_matrix(
+            (np.ones(len(self.transaction_items), dtype=bool), self.transaction_items, self.transaction_offsets),
+            shape=(self.n_rows, len(self.item_labels)),
+        )
+
+    def generate_binary_matrix(self, sparse=False):
         """
         Tạo ma trận nhị phân (one-hot encoding) từ danh sách giao dịch.
         Đảm bảo rằng dữ liệu đã được chuẩn bị trước.
+        Args:
+            sparse (bool): True để giữ ma trận dạng CSR (cột là mã item, không tạo ma trận dày).
+                Khi đó DataFrame trả về không có cột 'ID'; nhãn nằm trong self.transaction_ids.
         """
-        if not self.transactions:
+        if not self.n_rows:
             raise ValueError("Danh sách giao dịch rỗng. Hãy gọi prepare_transactions() trước.")
-        te = TransactionEncoder()
-        binary_matrix = te.fit(self.transactions).transform(self.transactions)
-        binary_matrix_df = pd.DataFrame(binary_matrix, columns=te.columns_)
-        binary_matrix_df.insert(0, 'ID', [f"o{i+1}" for i in range(len(self.transactions))])  # Thêm cột 'ID'
+        if sparse:
+            return self.generate_sparse_matrix()
+        binary_matrix_df = pd.DataFrame(self.transaction_matrix().toarray(), columns=self.item_labels)
+        binary_matrix_df.insert(0, 'ID', [f"o{i+1}" for i in range(self.n_rows)])  # Thêm cột 'ID'
         return binary_matrix_df
 
+    def generate_sparse_matrix(self):
+        """
+        Tạo ma trận thưa CSR từ giao dịch đã mã hóa: mã item chính là chỉ số cột,
+        chỉ lưu các ô có giá trị True.
+        Returns:
+            pd.DataFrame: DataFrame thưa (kiểu Sparse[bool]), không chứa cột 'ID'.
+        """
+        return pd.DataFrame.sparse.from_spmatrix(self.transaction_matrix(), columns=self.item_labels)
+
+    def binary_matrix_preview(self, binary_matrix, max_rows=100, max_columns=50):
+        """
+        Lấy một phần nhỏ của ma trận nhị phân để hiển thị.
+        Args:
+            binary_matrix (pd.DataFrame): Ma trận nhị phân (dày hoặc thưa).
+            max_rows (int): Số giao dịch tối đa.
+            max_columns (int): Số item tối đa.
+        Returns:
+            tuple: (danh sách hàng, danh sách tên cột), cột đầu tiên là 'ID'.
+        """
+        items = binary_matrix.drop(columns=['ID'], errors='ignore')
+        items = items.iloc[:max_rows, :max_columns]
+        if hasattr(items, "sparse"):
+            values = items.sparse.to_dense().to_numpy()
+        else:
+            values = items.to_numpy()
+        if 'ID' in binary_matrix.columns:
+            ids = binary_matrix['ID'].iloc[:max_rows].tolist()
+        else:
+            ids = self.transaction_ids[:max_rows]
+        rows = [[transaction_id, *row] for transaction_id, row in zip(ids, values.tolist())]
+        return rows, ['ID', *items.columns.tolist()]
+
     def find_frequent_itemsets(self, binary_matrix):
         """
-        Tìm tập phổ biến bằng thuật toán Apriori.
+        Tìm tập phổ biến bằng thuật toán đã chọn (Apriori, FP-Growth, Eclat hoặc SON),
+        hoặc bằng lấy mẫu nếu đã bật set_sampling(). Mọi thuật toán khai thác trên giao dịch đã mã hóa
+        (mã item int32 dạng CSR); nhãn item chỉ được giải mã một lần ở kết quả.
         Args:
-            binary_matrix (pd.DataFrame): Ma trận nhị phân, không chứa cột 'ID'.
+            binary_matrix (pd.DataFrame): Ma trận nhị phân từ generate_binary_matrix() (có thể có cột 'ID');
+                chỉ dùng để chọn dạng dày hay thưa khi gọi mlxtend.
         Returns:
             pd.DataFrame: DataFrame chứa các tập phổ biến, độ hỗ trợ và độ dài.
         """
         if self.min_sup is None:
             raise ValueError("min_sup chưa được thiết lập. Hãy gọi set_params().")
-        if 'ID' in binary_matrix.columns:
-            binary_matrix = binary_matrix.drop(columns=['ID'], errors='ignore')  # Loại bỏ cột 'ID'
+        self.check_binary_matrix(binary_matrix)
+
+        self.sampling_report = None
+        if self.sample_fraction is not None:
+            counts = self.find_frequent_itemsets_sampling()
+        elif self.algorithm == "fpgrowth":
+            # FP-Growth: nén giao dịch vào cây FP, không sinh ứng viên theo từng mức
+            counts = self.find_frequent_itemsets_mlxtend(fpgrowth, hasattr(binary_matrix, "sparse"))
+        elif self.algorithm == "eclat":
+            counts = self.find_frequent_itemsets_eclat()
+        elif self.algorithm == "son":
+            counts = self.find_frequent_itemsets_son()
+        else:
+            # Sử dụng hàm apriori từ mlxtend
+            counts = self.find_frequent_itemsets_mlxtend(apriori, hasattr(binary_matrix, "sparse"))
+        return self.store_itemset_counts(counts, self.n_rows, self.min_sup)
+
+    def check_binary_matrix(self, binary_matrix):
+        """Kiểm tra ma trận nhị phân ứng với các giao dịch đã mã hóa bởi prepare_transactions()."""
+        if not self.n_rows:
+            raise ValueError("Danh sách giao dịch rỗng. Hãy gọi prepare_transactions() trước.")
+        if len(binary_matrix) != self.n_rows:
+            raise ValueError("Ma trận nhị phân không khớp với giao dịch đã chuẩn bị. Hãy gọi generate_binary_matrix() lại.")
+
+    def find_frequent_itemsets_mlxtend(self, miner, sparse=False):
+        """
+        Chạy apriori/fpgrowth của mlxtend trên ma trận giao dịch mà tên cột là mã item (số nguyên).
+        Args:
+            miner (callable): mlxtend.frequent_patterns.apriori hoặc fpgrowth.
+            sparse (bool): Truyền ma trận thưa (Sparse[bool]) thay vì ma trận dày.
+        Returns:
+            dict: tuple mã item đã sắp xếp -> số giao dịch hỗ trợ.
+        """
+        matrix = self.transaction_matrix()
+        codes = pd.DataFrame.sparse.from_spmatrix(matrix) if sparse else pd.DataFrame(matrix.toarray())
+        result = miner(codes, min_support=self.min_sup, use_colnames=True)
+        return {
+            tuple(sorted(int(code) for code in itemset)): int(round(support * self.n_rows))
+            for itemset, support in zip(result['itemsets'], result['support'])
+        }
+
+    def code_tid_bitmaps(self, min_count):
+        """
+        Bitmap giao dịch của các item có số lần xuất hiện >= min_count, tạo trực tiếp từ giao dịch CSR.
+        Returns:
+            tuple: (mã các item được giữ, bitmap np.uint64 (n_items, n_words), số lần xuất hiện).
+        """
+        n_items = len(self.item_labels)
+        item_counts = np.bincount(self.transaction_items, minlength=n_items)
+        keep = np.flatnonzero(item_counts >= min_count)
+        bitmaps = code_bitmaps(self.transaction_offsets, self.transaction_items, n_items, keep)
+        return keep, bitmaps, item_counts[keep].astype(np.int64)
+
+    def set_frequent_itemsets(self, itemset_counts):
+        """
+        Dùng một kết quả tập phổ biến có sẵn (ví dụ lấy từ bộ nhớ đệm) thay vì khai thác lại.
+        Args:
+            itemset_counts (dict): tuple mã item đã sắp xếp -> số giao dịch hỗ trợ, khai thác ở ngưỡng min_sup hiện tại.
+        Returns:
+            pd.DataFrame: DataFrame chứa các tập phổ biến, độ hỗ trợ và độ dài.
+        """
+        return self.store_itemset_counts(itemset_counts, self.n_rows, self.min_sup)
 
-        # Sử dụng hàm apriori từ mlxtend
-        self.frequent_itemsets = apriori(binary_matrix, min_support=self.min_sup, use_colnames=True)
+    def store_itemset_counts(self, counts, n_transactions, min_sup):
+        """
+        Lưu kết quả khai thác dạng mã (số giao dịch hỗ trợ chính xác, cần cho việc cập nhật gia tăng)
+        làm tập phổ biến hiện tại; nhãn item chỉ được giải mã khi dựng DataFrame để hiển thị.
+        Args:
+            counts (dict): tuple mã item đã sắp xếp -> số giao dịch hỗ trợ.
+            n_transactions (int): Số giao dịch ứng với counts.
+            min_sup (float): Ngưỡng đã dùng để khai thác counts.
+        Returns:
+            pd.DataFrame: DataFrame chứa các tập phổ biến, độ hỗ trợ và độ dài.
+        """
+        self.itemset_counts = counts
+        self.itemset_min_sup = min_sup
+        self.n_transactions = n_transactions
+        self.frequent_itemsets = self.decode_itemsets(self.sort_itemsets(counts), n_transactions)
         self.frequent_itemsets['length'] = self.frequent_itemsets['itemsets'].apply(lambda x: len(x))  # Thêm cột 'length'
         self.num_itemsets = len(self.frequent_itemsets)
         return self.frequent_itemsets
 
+    def update_frequent_itemsets(self, new_data):
+        """
+        Cập nhật tập phổ biến khi thêm một lô giao dịch mới (thuật toán FUP),
+        không khai thác lại toàn bộ dữ liệu.
+        Args:
+            new_data (pd.DataFrame): Giao dịch mới với các cột 'ID' và 'items'.
+        Returns:
+            pd.DataFrame: Tập phổ biến trên toàn bộ dữ liệu (cũ + mới).
+        """
+        if self.frequent_itemsets is None or self.itemset_min_sup is None:
+            raise ValueError("Chưa có tập phổ biến. Hãy gọi find_frequent_itemsets() trước.")
+        if 'ID' not in new_data.columns or 'items' not in new_data.columns:
+            raise ValueError("Dữ liệu phải chứa các cột 'ID' và 'items'.")
+        # Item mới được thêm vào từ điển; mã cũ được ánh xạ lại để từ điển vẫn sắp xếp
+        self.item_labels, remap = merge_item_labels(self.item_labels, new_data['items'].dropna())
+        self.transaction_items = remap[self.transaction_items]
+        old_counts = {tuple(int(remap[item]) for item in itemset): count for itemset, count in self.itemset_counts.items()}
+        new_ids, new_offsets, new_items = encode_transactions(new_data, self.item_labels)
+        if not new_ids:
+            raise ValueError("Không có giao dịch mới.")
+
+        counts, self.rescanned_itemsets = fup_update(
+            old_counts, (self.transaction_offsets, self.transaction_items), (new_offsets, new_items),
+            len(self.item_labels), self.itemset_min_sup,
+        )
+        self.transaction_offsets = np.concatenate((self.transaction_offsets, new_offsets[1:] + self.transaction_offsets[-1]))
+        self.transaction_items = np.concatenate((self.transaction_items, new_items))
+        self.transaction_ids = self.transaction_ids + new_ids
+
+        return self.store_itemset_counts(counts, self.n_rows, self.itemset_min_sup)
+
+    def find_frequent_itemsets_eclat(self):
+        """
+        Tìm tập phổ biến bằng Eclat: mỗi item lưu danh sách giao dịch dưới dạng
+        bitmap np.uint64 (tạo từ giao dịch đã mã hóa), hỗ trợ của ứng viên được đếm bằng phép AND và popcount.
+        Returns:
+            dict: tuple mã item đã sắp xếp -> số giao dịch hỗ trợ.
+        """
+        min_count = min_support_count(self.min_sup, self.n_rows)
+        keep, bitmaps, counts = self.code_tid_bitmaps(min_count)
+        results = eclat(bitmaps, counts, min_count)
+        return {tuple(sorted(int(keep[position]) for position in itemset)): count for itemset, count in results}
+
+    def find_frequent_itemsets_son(self):
+        """
+        Tìm tập phổ biến bằng thuật toán SON: chia danh sách giao dịch từ
+        prepare_transactions() (dạng mã số nguyên) thành các phân vùng và khai thác trên nhiều tiến trình.
+        Returns:
+            dict: tuple mã item đã sắp xếp -> số giao dịch hỗ trợ.
+        """
+        if not self.n_rows:
+            raise ValueError("Danh sách giao dịch rỗng. Hãy gọi prepare_transactions() trước.")
+        return son(
+            self.transaction_offsets, self.transaction_items, len(self.item_labels), self.min_sup, self.n_workers
+        )
+
+    def find_frequent_itemsets_sampling(self):
+        """
+        Tìm tập phổ biến xấp xỉ: khai thác một mẫu ngẫu nhiên ở ngưỡng hạ thấp rồi kiểm tra bằng
+        một lượt đếm trên toàn bộ dữ liệu (gồm cả biên âm). Độ hỗ trợ trả về luôn chính xác;
+        self.sampling_report['exact'] cho biết có chắc chắn không bỏ sót tập phổ biến nào hay không.
+        Returns:
+            dict: tuple mã item đã sắp xếp -> số giao dịch hỗ trợ.
+        """
+        if not self.n_rows:
+            raise ValueError("Danh sách giao dịch rỗng. Hãy gọi prepare_transactions() trước.")
+        counts, self.sampling_report = toivonen(
+            self.transaction_offsets, self.transaction_items, len(self.item_labels),
+            self.min_sup, self.sample_fraction, seed=self.sample_seed,
+        )
+        return counts
+
+    def find_top_k_itemsets(self, k, min_len=1, max_len=None):
+        """
+        Tìm k tập phổ biến nhất mà không cần chọn min_sup: ngưỡng hỗ trợ được nâng dần trong
+        lúc duyệt nên thời gian chạy phụ thuộc vào k. Các tập cùng hỗ trợ với tập thứ k cũng được giữ.
+        Khi min_len = 1 và không giới hạn max_len, kết quả là toàn bộ tập phổ biến ở min_sup bằng hỗ trợ
+        của tập thứ k, nên được lưu làm tập phổ biến hiện tại để sinh luật và cập nhật gia tăng. Nếu có
+        min_len > 1 hoặc max_len, kết quả bị cắt theo độ dài (thiếu tập con ngắn hoặc tập cha dài) nên chỉ
+        được trả về để hiển thị; tập phổ biến hiện tại của mô hình giữ nguyên.
+        Args:
+            k (int): Số tập cần tìm.
+            min_len (int): Độ dài tối thiểu.
+            max_len (int | None): Độ dài tối đa.
+        Returns:
+            pd.DataFrame: DataFrame chứa các tập phổ biến, độ hỗ trợ và độ dài, theo hỗ trợ giảm dần.
+        """
+        if not self.n_rows:
+            raise ValueError("Danh sách giao dịch rỗng. Hãy gọi prepare_transactions() trước.")
+        if min_len < 1 or (max_len is not None and max_len < min_len):
+            raise ValueError("Khoảng độ dài không hợp lệ: cần 1 <= min_len <= max_len.")
+        n_items = len(self.item_labels)
+        bitmaps = code_bitmaps(self.transaction_offsets, self.transaction_items, n_items)
+        counts = np.bincount(self.transaction_items, minlength=n_items)
+        results = top_k_itemsets(bitmaps, counts, k, min_len, max_len)
+
+        top_k = self.decode_itemsets(dict(results), self.n_rows)
+        top_k['length'] = top_k['itemsets'].apply(lambda x: len(x))
+        if min_len == 1 and max_len is None and results:
+            self.min_sup = results[-1][1] / self.n_rows
+            self.store_itemset_counts(dict(results), self.n_rows, self.min_sup)
+        return top_k
+
+    def decode_itemsets(self, counts, n_transactions):
+        """
+        Giải mã bảng băm tuple mã item -> số giao dịch thành DataFrame tập phổ biến để hiển thị.
+        Returns:
+            pd.DataFrame: DataFrame gồm cột 'support' và 'itemsets' (frozenset nhãn item).
+        """
+        labels = np.asarray(self.item_labels, dtype=object)
+        return pd.DataFrame(
+            {
+                "support": [count / n_transactions for count in counts.values()],
+                "itemsets": [frozenset(labels[list(itemset)].tolist()) for itemset in counts],
+            }
+        )
+
+    @staticmethod
+    def sort_itemsets(counts):
+        """
+        Sắp xếp bảng đếm theo độ dài rồi theo mã item (cũng là thứ tự cột trong ma trận nhị phân),
+        để mọi thuật toán trả về cùng một thứ tự như Apriori.
+        Args:
+            counts (dict): tuple mã item đã sắp xếp -> số giao dịch hỗ trợ.
+        Returns:
+            dict: Bảng đếm đã sắp xếp.
+        """
+        return dict(sorted(counts.items(), key=lambda entry: (len(entry[0]), entry[0])))
+
     def find_maximal_frequent_itemsets(self):
         """
         Tìm tập phổ biến tối đại từ tập phổ biến.
-        Lọc các tập mà không có tập cha nào lớn hơn.
+        Lọc các tập mà không có tập cha nào lớn hơn, tra cứu qua chỉ mục đảo
+        item -> bitmap itemset thay vì so sánh từng cặp.
         Returns:
             pd.DataFrame: DataFrame chứa các tập phổ biến tối đại.
         """
         if self.frequent_itemsets is None or self.frequent_itemsets.empty:
             raise ValueError("Chưa có tập phổ biến. Hãy gọi find_frequent_itemsets() trước.")
-        
-        # Lọc ra các tập phổ biến tối đại
-        maximal_itemsets = self.frequent_itemsets.copy()
-        maximal_itemsets['is_subset'] = maximal_itemsets['itemsets'].apply(
-            lambda itemset: any(
-                itemset < other for other in maximal_itemsets['itemsets'] if itemset != other
-            )
-        )
-        maximal_itemsets = maximal_itemsets[~maximal_itemsets['is_subset']].drop(columns=['is_subset'])  # Loại bỏ cột phụ
+
+        index = SupersetIndex(self.frequent_itemsets['itemsets'])
+        is_maximal = [not index.has_proper_superset(itemset) for itemset in self.frequent_itemsets['itemsets']]
+        maximal_itemsets = self.frequent_itemsets[is_maximal].copy()
         return maximal_itemsets
 
+    def find_closed_frequent_itemsets(self, binary_matrix):
+        """
+        Tìm tập phổ biến đóng (không có tập cha nào cùng độ hỗ trợ) trực tiếp từ
+        giao dịch đã mã hóa, không cần sinh toàn bộ tập phổ biến trước.
+        Args:
+            binary_matrix (pd.DataFrame): Ma trận nhị phân từ generate_binary_matrix() (chỉ dùng để kiểm tra).
+        Returns:
+            pd.DataFrame: DataFrame chứa các tập phổ biến đóng, độ hỗ trợ và độ dài.
+        """
+        if self.min_sup is None:
+            raise ValueError("min_sup chưa được thiết lập. Hãy gọi set_params().")
+        self.check_binary_matrix(binary_matrix)
+
+        n_transactions = self.n_rows
+        min_count = min_support_count(self.min_sup, n_transactions)
+        keep, bitmaps, counts = self.code_tid_bitmaps(min_count)
+        results = closed_itemsets(bitmaps, counts, min_count, n_transactions)
+        closed = {tuple(int(keep[position]) for position in itemset): count for itemset, count in results}
+        self.closed_itemsets = self.decode_itemsets(self.sort_itemsets(closed), n_transactions)
+        self.closed_n_transactions = n_transactions
+        self.closed_itemsets['length'] = self.closed_itemsets['itemsets'].apply(lambda x: len(x))
+        return self.closed_itemsets
+
+    def generate_rules_from_closed(self, closed_itemsets_df):
+        """
+        Sinh luật kết hợp trực tiếp từ tập phổ biến đóng.
+        Với mỗi tập đóng C và tiền đề A ⊂ C, luật A -> C - A có hỗ trợ bằng hỗ trợ của C;
+        hỗ trợ của A là hỗ trợ lớn nhất trong các tập đóng chứa A. Mọi luật khác có cùng
+        hỗ trợ và độ tin cậy với một luật trong tập này, nên không cần toàn bộ tập phổ biến.
+        Độ tin cậy được tính từ số giao dịch hỗ trợ (số nguyên) nên luật đúng bằng ngưỡng không bị loại.
+        Args:
+            closed_itemsets_df (pd.DataFrame): DataFrame chứa các tập phổ biến đóng.
+        Returns:
+            pd.DataFrame: DataFrame có cùng các cột như generate_rules().
+        """
+        if closed_itemsets_df.empty:
+            raise ValueError("Tập phổ biến đóng rỗng. Không thể sinh luật kết hợp.")
+        if self.min_conf is None:
+            raise ValueError("min_conf chưa được thiết lập. Hãy gọi set_params().")
+
+        # Khôi phục số giao dịch hỗ trợ chính xác từ độ hỗ trợ count / n
+        n_transactions = self.closed_n_transactions
+        counts = np.rint(closed_itemsets_df['support'].to_numpy() * n_transactions).astype(np.int64).tolist()
+        index = SupersetIndex(closed_itemsets_df['itemsets'], counts)
+        rows = []
+        for itemset, count in zip(closed_itemsets_df['itemsets'], counts):
+            if len(itemset) < 2:
+                continue
+            # Duyệt tiền đề từ lớn đến nhỏ: nếu A -> C - A không đủ độ tin cậy
+            # thì mọi tập con của A cũng không đủ (hỗ trợ của tập con chỉ lớn hơn)
+            antecedents = {itemset - {item} for item in itemset}
+            while antecedents:
+                passed = set()
+                for antecedent in antecedents:
+                    antecedent_count = index.support(antecedent)
+                    confidence = count / antecedent_count
+                    if confidence < self.min_conf:
+                        continue
+                    passed.add(antecedent)
+                    consequent = itemset - antecedent
+                    rows.append([
+                        list(antecedent), list(consequent), antecedent_count / n_transactions,
+                        index.support(consequent) / n_transactions, count / n_transactions, confidence,
+                    ])
+                antecedents = {a - {item} for a in passed if len(a) > 1 for item in a}
+
+        rules = pd.DataFrame(rows, columns=[
+            "antecedents", "consequents", "antecedent support", "consequent support", "support", "confidence",
+        ])
+        self.rules = rules
+        self.rule_index = None
+        return rules
+
+    def encode_itemsets(self):
+        """
+        Bảng băm tuple mã item -> số giao dịch hỗ trợ chính xác của các tập phổ biến
+        (số nguyên, không bị ảnh hưởng bởi việc làm tròn để hiển thị).
+        Returns:
+            tuple: (danh sách nhãn item theo mã, dict tuple mã đã sắp xếp -> số giao dịch hỗ trợ).
+        """
+        if not self.itemset_counts:
+            raise ValueError("Chưa có tập phổ biến. Hãy gọi find_frequent_itemsets() trước.")
+        return self.item_labels.tolist(), self.itemset_counts
+
+    def generate_rules_native(self):
+        """
+        Sinh luật kết hợp trực tiếp trên bảng băm itemset đã mã hóa số nguyên, không đi qua
+        DataFrame/frozenset. Kết quả dạng cột được lưu ở self.rule_table.
+        Returns:
+            dict: Các mảng NumPy mô tả luật (xem models.rule_generator.generate_rules).
+        """
+        if self.min_conf is None:
+            raise ValueError("min_conf chưa được thiết lập. Hãy gọi set_params().")
+        self.rule_item_labels, itemset_counts = self.encode_itemsets()
+        self.rule_table = generate_rule_table(itemset_counts, self.n_transactions, self.min_conf)
+        return self.rule_table
+
+    def rules_to_frame(self, rule_table=None):
+        """
+        Giải mã luật dạng cột thành DataFrame có cùng các cột như generate_rules() để hiển thị.
+        Args:
+            rule_table (dict | None): Kết quả của generate_rules_native() (mặc định self.rule_table).
+        Returns:
+            pd.DataFrame: DataFrame chứa các luật kết hợp.
+        """
+        rule_table = rule_table if rule_table is not None else self.rule_table
+        labels = np.empty(len(self.rule_item_labels), dtype=object)
+        labels[:] = self.rule_item_labels
+
+        def decode(offsets, items):
+            decoded = labels[items]
+            return [decoded[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])]
+
+        rules = pd.DataFrame(
+            {
+                "antecedents": decode(rule_table["antecedent_offsets"], rule_table["antecedent_items"]),
+                "consequents": decode(rule_table["consequent_offsets"], rule_table["consequent_items"]),
+                "antecedent support": rule_table["antecedent_support"],
+                "consequent support": rule_table["consequent_support"],
+                "support": rule_table["support"],
+                "confidence": rule_table["confidence"],
+            }
+        )
+        self.rules = rules
+        self.rule_index = None
+        return rules
+
+    def build_rule_index(self):
+        """Tạo chỉ mục gợi ý từ self.rules (gọi lại sau mỗi lần sinh luật)."""
+        self.rule_index = RuleIndex(self.rules)
+        return self.rule_index
+
+    def recommend(self, basket, k=5, metric="confidence"):
+        """
+        Gợi ý k item tiếp theo cho một giỏ hàng dựa trên các luật đã sinh.
+        Args:
+            basket (Iterable): Các item đang có trong giỏ.
+            k (int): Số item gợi ý tối đa.
+            metric (str): "confidence" hoặc "lift".
+        Returns:
+            list[tuple]: Danh sách (item, điểm) theo điểm giảm dần.
+        """
+        if self.rule_index is None:
+            self.build_rule_index()
+        return self.rule_index.recommend(basket, k, metric)
+
     def generate_rules(self, frequent_itemsets_df):
         """
         Sinh các luật kết hợp từ tập phổ biến.
@@ -119,6 +577,7 @@ class AprioriModel:
             rules["consequents"] = rules["consequents"].apply(lambda x: list(x))
 
             self.rules = rules
+            self.rule_index = None
             return rules
 
         except Exception as e:
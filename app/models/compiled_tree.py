@@ -0,0 +1,289 @@
+import numpy as np
+import pandas as pd
+
+
+class CompiledTree:
+    # Các mảng cấu trúc cây được lưu vào file mô hình
+    ARRAYS = ("node_feature", "node_label", "node_threshold", "child_offsets", "child_values", "child_nodes")
+
+    def __init__(self, tree, data=None, target=None):
+        """
+        Biên dịch cây quyết định dạng từ điển lồng nhau (kết quả của ID3Model.build_tree)
+        thành các mảng song song để dự đoán theo lô:
+        - node_feature[i]: chỉ số thuộc tính của nút i (-1 nếu là lá);
+        - node_label[i]: mã nhãn của lá, hoặc với nút trong là nhãn có nhiều mẫu huấn luyện nhất đi qua nút
+          (dùng khi gặp giá trị chưa thấy lúc huấn luyện); nếu không có dữ liệu huấn luyện thì là nhãn
+          xuất hiện ở nhiều lá nhất của cây con;
+        - child_offsets: các cạnh của nút i nằm trong [child_offsets[i], child_offsets[i + 1]),
+          mỗi cạnh gồm mã giá trị child_values và nút con child_nodes, sắp xếp theo mã giá trị;
+        - node_threshold[i]: ngưỡng t của nút chia nhị phân "<= t" / "> t" (NaN nếu không phải),
+          khi đó cạnh đầu là nhánh "<=" và cạnh thứ hai là nhánh ">" (hai khóa này cũng có mã giá trị).
+        Args:
+            tree (dict | object): Cây quyết định, hoặc một nhãn nếu cây chỉ có một lá.
+            data (pd.DataFrame | None): Dữ liệu đã dùng để dựng cây (hàng lặp lại được đếm nhiều lần),
+                để đếm số mẫu của từng nhãn tại mỗi nút.
+            target (str | None): Cột mục tiêu trong data.
+        """
+        self.features = []  # Tên các thuộc tính xuất hiện trong cây
+        self.values = []  # Với mỗi thuộc tính: các giá trị trên cạnh (vị trí là mã giá trị)
+        self.labels = []  # Các nhãn lá (vị trí là mã nhãn)
+        feature_index, value_codes, label_codes = {}, [], {}
+        numeric = set()  # Các thuộc tính xuất hiện ở nút chia theo ngưỡng
+
+        node_feature, node_label, node_threshold, child_offsets = [], [], [], [0]
+        child_values, child_nodes = [], []
+        # Duyệt theo chiều rộng để các nút cùng mức nằm liền nhau
+        queue = [tree]
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            if not isinstance(node, dict):
+                node_feature.append(-1)
+                node_threshold.append(np.nan)
+                node_label.append(label_codes.setdefault(node, len(label_codes)))
+                child_offsets.append(len(child_values))
+                continue
+            (feature, branches), = node.items()
+            if feature not in feature_index:
+                feature_index[feature] = len(feature_index)
+                value_codes.append({})
+            f = feature_index[feature]
+            node_feature.append(f)
+            node_label.append(-1)  # Được điền sau khi biết các lá của cây con
+            threshold = self.parse_threshold(branches)
+            node_threshold.append(np.nan if threshold is None else threshold)
+            if threshold is not None:
+                # Khóa "<= t" luôn được đánh mã trước "> t" nên vẫn đứng trước sau khi sắp xếp
+                numeric.add(feature)
+            edges = sorted(
+                (value_codes[f].setdefault(value, len(value_codes[f])), len(queue) + position)
+                for position, value in enumerate(branches)
+            )
+            queue.extend(branches.values())
+            child_values.extend(code for code, _ in edges)
+            child_nodes.extend(child for _, child in edges)
+            child_offsets.append(len(child_values))
+
+        self.features = list(feature_index)
+        self.values = [pd.Index(list(codes), dtype=object) for codes in value_codes]
+        if data is not None:
+            # Nhãn có trong dữ liệu nhưng không ở lá nào vẫn có thể là nhãn đa số của một nút trong
+            for label in pd.unique(data[target]):
+                label_codes.setdefault(label, len(label_codes))
+        self.labels = np.empty(len(label_codes), dtype=object)
+        self.labels[:] = list(label_codes)
+        self.node_feature = np.array(node_feature, dtype=np.int32)
+        self.node_threshold = np.array(node_threshold, dtype=np.float64)
+        self.child_offsets = np.array(child_offsets, dtype=np.int64)
+        self.child_values = np.array(child_values, dtype=np.int32)
+        self.child_nodes = np.array(child_nodes, dtype=np.int32)
+        self.index_edges()
+        node_label = np.array(node_label, dtype=np.int32)
+        if data is None:
+            self.node_label = self.leaf_vote_labels(node_label)
+        else:
+            self.node_label = self.majority_labels(node_label, self.class_counts(data, target))
+
+    def index_edges(self):
+        """Tính các mảng phụ trợ cho dự đoán từ các mảng cấu trúc cây."""
+        thresholds = ~np.isnan(self.node_threshold)
+        numeric = set(self.node_feature[thresholds].tolist())
+        self.numeric = np.array([f in numeric for f in range(len(self.features))], dtype=bool)
+        # Khóa (nút, mã giá trị) của mọi cạnh, tăng dần, để tra cứu cạnh bằng searchsorted
+        self.stride = max(max((len(values) for values in self.values), default=0), 1) + 1
+        edge_owner = np.repeat(np.arange(len(self.node_feature)), np.diff(self.child_offsets))
+        self.edge_keys = edge_owner.astype(np.int64) * self.stride + self.child_values
+
+    def to_arrays(self):
+        """
+        Xuất cây thành các mảng số và các từ điển mã hóa (để lưu file).
+        Returns:
+            tuple: (dict tên -> mảng, dict tên -> danh sách giá trị).
+        """
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        arrays["value_offsets"] = np.concatenate(([0], np.cumsum([len(values) for values in self.values]))).astype(np.int64)
+        labels = {
+            "features": list(self.features),
+            "values": [value for values in self.values for value in values],
+            "labels": list(self.labels),
+        }
+        return arrays, labels
+
+    @classmethod
+    def from_arrays(cls, arrays, labels):
+        """
+        Dựng lại cây đã biên dịch từ kết quả to_arrays() (các mảng có thể là np.memmap chỉ đọc).
+        Returns:
+            CompiledTree: Cây đã biên dịch.
+        """
+        tree = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(tree, name, arrays[name])
+        offsets = arrays["value_offsets"]
+        tree.features = list(labels["features"])
+        tree.values = [pd.Index(labels["values"][offsets[f]:offsets[f + 1]], dtype=object) for f in range(len(tree.features))]
+        tree.labels = np.empty(len(labels["labels"]), dtype=object)
+        tree.labels[:] = labels["labels"]
+        tree.index_edges()
+        return tree
+
+    def to_tree(self):
+        """
+        Dựng lại cây dạng từ điển lồng nhau (thứ tự nhánh theo mã giá trị).
+        Returns:
+            dict | object: Cây quyết định.
+        """
+        node_feature, node_label = self.node_feature.tolist(), self.node_label.tolist()
+        offsets, values, children = self.child_offsets.tolist(), self.child_values.tolist(), self.child_nodes.tolist()
+        value_lists = [list(values_f) for values_f in self.values]
+        subtrees = [None] * len(node_feature)
+        # Nút con luôn có chỉ số lớn hơn nút cha (duyệt theo chiều rộng): dựng từ dưới lên
+        for node in range(len(node_feature) - 1, -1, -1):
+            f = node_feature[node]
+            if f < 0:
+                subtrees[node] = self.labels[node_label[node]]
+                continue
+            start, end = offsets[node], offsets[node + 1]
+            subtrees[node] = {self.features[f]: {
+                value_lists[f][value]: subtrees[child] for value, child in zip(values[start:end], children[start:end])
+            }}
+        return subtrees[0]
+
+    @staticmethod
+    def parse_threshold(branches):
+        """Trả về ngưỡng t nếu các nhánh có dạng {"<= t": ..., "> t": ...}, ngược lại None."""
+        keys = list(branches)
+        if len(keys) != 2 or not all(isinstance(key, str) for key in keys):
+            return None
+        if not keys[0].startswith("<= ") or keys[1] != "> " + keys[0][3:]:
+            return None
+        try:
+            return float(keys[0][3:])
+        except ValueError:
+            return None
+
+    def class_counts(self, data, target):
+        """
+        Đếm số mẫu của từng nhãn đi qua mỗi nút khi đưa các hàng của data xuống cây (như lúc dựng cây).
+        Returns:
+            np.ndarray: Ma trận (n_nodes, n_labels) np.int64.
+        """
+        n_nodes, n_labels = len(self.node_feature), len(self.labels)
+        label_codes = pd.Index(self.labels).get_indexer(data[target])
+        counts = np.zeros(n_nodes * n_labels, dtype=np.int64)
+
+        def visit(rows, nodes):
+            counts[:] += np.bincount(nodes * n_labels + label_codes[rows], minlength=n_nodes * n_labels)
+
+        self.descend(data, visit)
+        return counts.reshape(n_nodes, n_labels)
+
+    def majority_labels(self, node_label, counts):
+        """
+        Gán cho mỗi nút trong nhãn có nhiều mẫu huấn luyện nhất (nhãn nhỏ nhất nếu bằng nhau,
+        như ID3Model.majority_label); nút không có mẫu nào giữ nhãn theo số lá.
+        """
+        n_labels = len(self.labels)
+        rank = np.empty(n_labels, dtype=np.int64)
+        rank[pd.Series(self.labels).sort_values().index.to_numpy()] = np.arange(n_labels)
+        # Số mẫu là khóa chính, hạng nhãn (nhỏ hơn thắng) là khóa phụ
+        majority = np.argmax(counts * n_labels + (n_labels - 1 - rank), axis=1)
+        internal = (self.node_feature >= 0) & (counts.sum(axis=1) > 0)
+        node_label = self.leaf_vote_labels(node_label)
+        node_label[internal] = majority[internal]
+        return node_label
+
+    def leaf_vote_labels(self, node_label):
+        """Gán cho mỗi nút trong nhãn xuất hiện ở nhiều lá nhất của cây con (nhãn mã nhỏ hơn khi bằng nhau)."""
+        n_labels = max(len(self.labels), 1)
+        leaf_counts = np.zeros((len(node_label), n_labels), dtype=np.int64)
+        # Các nút con luôn có chỉ số lớn hơn nút cha (duyệt theo chiều rộng): cộng dồn từ dưới lên
+        for node in range(len(node_label) - 1, -1, -1):
+            if self.node_feature[node] < 0:
+                leaf_counts[node, node_label[node]] = 1
+            else:
+                children = self.child_nodes[self.child_offsets[node]:self.child_offsets[node + 1]]
+                leaf_counts[node] = leaf_counts[children].sum(axis=0)
+                node_label[node] = int(np.argmax(leaf_counts[node]))
+        return node_label
+
+    def encode(self, data):
+        """
+        Mã hóa các cột thuộc tính của data theo mã giá trị của cây (-1 cho giá trị chưa thấy).
+        Returns:
+            tuple: (ma trận mã (n_features, n_rows) np.int32, ma trận giá trị số (n_features, n_rows)
+                    np.float64 của các thuộc tính chia theo ngưỡng, NaN nếu không đổi được sang số;
+                    None nếu cây không có nút chia theo ngưỡng).
+        """
+        missing = [feature for feature in self.features if feature not in data.columns]
+        if missing:
+            raise ValueError(f"Dữ liệu thiếu các cột thuộc tính: {missing}")
+        codes = np.empty((len(self.features), len(data)), dtype=np.int32)
+        for f, feature in enumerate(self.features):
+            codes[f] = self.values[f].get_indexer(data[feature])
+        if not self.numeric.any():
+            return codes, None
+        numbers = np.full((len(self.features), len(data)), np.nan)
+        for f in np.flatnonzero(self.numeric):
+            numbers[f] = pd.to_numeric(data[self.features[f]], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        return codes, numbers
+
+    def predict(self, data, fallback="majority"):
+        """
+        Dự đoán nhãn cho mọi hàng của data bằng descend().
+        Args:
+            data (pd.DataFrame): Dữ liệu cần dự đoán (chứa các cột thuộc tính của cây).
+            fallback: Cách xử lý giá trị chưa thấy lúc huấn luyện: "majority" để trả về node_label của nút
+                đó (nhãn có nhiều mẫu huấn luyện nhất nếu cây được biên dịch cùng dữ liệu huấn luyện),
+                hoặc một giá trị bất kỳ (ví dụ None) để trả về giá trị đó.
+        Returns:
+            np.ndarray: Mảng nhãn dự đoán (dtype object) theo thứ tự hàng.
+        """
+        nodes, unseen = self.descend(data)
+        predictions = self.labels[self.node_label[nodes]]
+        if fallback != "majority" and unseen.any():
+            predictions[unseen] = fallback
+        return predictions
+
+    def descend(self, data, visit=None):
+        """
+        Đưa mọi hàng của data xuống cây đồng thời: mỗi vòng lặp là một mức của cây và chỉ dùng
+        phép toán NumPy trên mảng.
+        Args:
+            data (pd.DataFrame): Dữ liệu (chứa các cột thuộc tính của cây).
+            visit (callable | None): Được gọi visit(rows, nodes) ở mỗi mức với các hàng đang ở một nút
+                và chỉ số nút đó (mỗi nút trên đường đi của một hàng được thăm đúng một lần).
+        Returns:
+            tuple: (np.ndarray nút dừng của từng hàng, mặt nạ các hàng dừng vì gặp giá trị chưa thấy).
+        """
+        codes, numbers = self.encode(data)
+        n_rows = len(data)
+        nodes = np.zeros(n_rows, dtype=np.int64)
+        unseen = np.zeros(n_rows, dtype=bool)
+        active = np.arange(n_rows)
+        while len(active):
+            if visit is not None:
+                visit(active, nodes[active])
+            features = self.node_feature[nodes[active]]
+            active = active[features >= 0]
+            if not len(active):
+                break
+            # Nút chia theo ngưỡng: NaN không thỏa "<= t" nên đi nhánh ">" như lúc huấn luyện
+            split = ~np.isnan(self.node_threshold[nodes[active]])
+            moved = active[split]
+            if len(moved):
+                numeric_values = numbers[self.node_feature[nodes[moved]], moved]
+                right = ~(numeric_values <= self.node_threshold[nodes[moved]])
+                nodes[moved] = self.child_nodes[self.child_offsets[nodes[moved]] + right]
+            active = active[~split]
+            values = codes[self.node_feature[nodes[active]], active]
+            keys = nodes[active] * self.stride + values
+            positions = np.minimum(np.searchsorted(self.edge_keys, keys), len(self.edge_keys) - 1)
+            found = (values >= 0) & (self.edge_keys[positions] == keys)
+            # Giá trị chưa thấy: dừng tại nút hiện tại
+            unseen[active[~found]] = True
+            active = active[found]
+            nodes[active] = self.child_nodes[positions[found]]
+            active = np.concatenate((moved, active))
+        return nodes, unseen
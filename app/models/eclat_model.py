@@ -0,0 +1,273 @@
+import heapq
+
+import numpy as np
+from scipy.sparse import csc_matrix
+
+
+# Bảng đếm số bit 1 cho từng giá trị byte (dùng khi numpy không có bitwise_count)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """
+    Đếm số bit 1 trên từng hàng của mảng bitmap.
+    Args:
+        words (np.ndarray): Mảng np.uint64 dạng (n_words,) hoặc (n_rows, n_words).
+    Returns:
+        np.ndarray | int: Số bit 1 của từng hàng (hoặc của cả mảng nếu là 1 chiều).
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def min_support_count(min_sup, n_transactions):
+    """
+    Đổi ngưỡng hỗ trợ tương đối sang số giao dịch tối thiểu,
+    sao cho count / n >= min_sup đúng như phép so sánh của mlxtend.
+    """
+    count = int(np.ceil(min_sup * n_transactions))
+    while count > 0 and (count - 1) / n_transactions >= min_sup:
+        count -= 1
+    while count / n_transactions < min_sup:
+        count += 1
+    return max(count, 1)
+
+
+def pack_columns(columns):
+    """
+    Đóng gói ma trận bool (n_transactions, n_items) thành bitmap dọc theo từng item.
+    Args:
+        columns (np.ndarray): Ma trận bool, mỗi cột là một item.
+    Returns:
+        np.ndarray: Mảng np.uint64 dạng (n_items, n_words), bit t của hàng i bật
+        khi giao dịch t chứa item i.
+    """
+    n_transactions = columns.shape[0]
+    n_words = max(1, (n_transactions + 63) // 64)
+    packed = np.zeros((columns.shape[1], n_words * 8), dtype=np.uint8)
+    if n_transactions:
+        packed[:, : (n_transactions + 7) // 8] = np.packbits(columns.T, axis=1, bitorder="little")
+    return packed.view(np.uint64)
+
+
+def pack_csc(matrix):
+    """
+    Đóng gói ma trận thưa CSC (n_rows, n_columns) thành bitmap theo từng cột.
+    Returns:
+        np.ndarray: Mảng np.uint64 dạng (n_columns, n_words).
+    """
+    n_words = max(1, (matrix.shape[0] + 63) // 64)
+    bitmaps = np.zeros((matrix.shape[1], n_words), dtype=np.uint64)
+    rows = matrix.indices.astype(np.uint64)
+    columns = np.repeat(np.arange(matrix.shape[1]), np.diff(matrix.indptr))
+    bits = np.left_shift(np.uint64(1), rows & np.uint64(63))
+    np.bitwise_or.at(bitmaps, (columns, (rows >> np.uint64(6)).astype(np.int64)), bits)
+    return bitmaps
+
+
+def code_bitmaps(offsets, items, n_items, keep=None):
+    """
+    Tạo bitmap dọc trực tiếp từ giao dịch đã mã hóa dạng CSR.
+    Args:
+        offsets (np.ndarray): Giao dịch t gồm items[offsets[t]:offsets[t + 1]].
+        items (np.ndarray): Mã item (số nguyên 0..n_items-1) của mọi giao dịch nối liền.
+        n_items (int): Số mã item.
+        keep (np.ndarray | None): Các mã item cần tạo bitmap (mặc định tất cả); hàng i ứng với keep[i].
+    Returns:
+        np.ndarray: Mảng np.uint64 dạng (len(keep), n_words).
+    """
+    n_transactions = len(offsets) - 1
+    rows = np.repeat(np.arange(n_transactions), np.diff(offsets))
+    columns = np.asarray(items, dtype=np.int64)
+    n_columns = n_items
+    if keep is not None:
+        position = np.full(n_items, -1, dtype=np.int64)
+        position[keep] = np.arange(len(keep))
+        columns = position[columns]
+        mask = columns >= 0
+        rows, columns = rows[mask], columns[mask]
+        n_columns = len(keep)
+    matrix = csc_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, columns)),
+        shape=(n_transactions, n_columns),
+    )
+    return pack_csc(matrix)
+
+
+def count_itemsets(bitmaps, candidates, chunk_words=8_000_000):
+    """
+    Đếm hỗ trợ của nhiều itemset cùng độ dài bằng AND + popcount theo lô.
+    Args:
+        bitmaps (np.ndarray): Bitmap np.uint64 (n_items, n_words).
+        candidates (np.ndarray): Mảng số nguyên (n_candidates, k), mỗi hàng là chỉ số item.
+        chunk_words (int): Số từ 64 bit tối đa xử lý trong một lô (giới hạn bộ nhớ tạm).
+    Returns:
+        np.ndarray: Số giao dịch chứa từng itemset.
+    """
+    candidates = np.asarray(candidates, dtype=np.int64)
+    counts = np.zeros(len(candidates), dtype=np.int64)
+    if not len(candidates):
+        return counts
+    chunk = max(1, chunk_words // bitmaps.shape[1])
+    for start in range(0, len(candidates), chunk):
+        block_candidates = candidates[start:start + chunk]
+        block = bitmaps[block_candidates[:, 0]]
+        for j in range(1, block_candidates.shape[1]):
+            block &= bitmaps[block_candidates[:, j]]
+        counts[start:start + chunk] = popcount(block)
+    return counts
+
+
+def eclat(bitmaps, counts, min_count, max_len=None):
+    """
+    Khai thác tập phổ biến theo chiều sâu trên bitmap dọc (Eclat).
+    Hỗ trợ của một ứng viên = popcount(AND các bitmap).
+    Args:
+        bitmaps (np.ndarray): Bitmap np.uint64 (n_items, n_words) của các item phổ biến.
+        counts (np.ndarray): Số lần xuất hiện của từng item.
+        min_count (int): Số giao dịch tối thiểu.
+        max_len (int | None): Độ dài tối đa của tập phổ biến.
+    Returns:
+        list: Danh sách (tuple chỉ số item, số giao dịch hỗ trợ).
+    """
+    # Duyệt item theo hỗ trợ tăng dần để các nhánh sâu có bitmap thưa hơn
+    order = np.argsort(counts, kind="stable")
+    order = order[counts[order] >= min_count]
+    results = []
+    _eclat_extend((), bitmaps[order], order, counts[order], min_count, max_len, results)
+    return results
+
+
+def _eclat_extend(prefix, rows, items, counts, min_count, max_len, results):
+    """Mở rộng tiền tố bằng các item còn lại, mỗi mức là một phép AND vector hóa."""
+    for j in range(len(items)):
+        itemset = prefix + (int(items[j]),)
+        results.append((itemset, int(counts[j])))
+        if j + 1 == len(items) or (max_len is not None and len(itemset) >= max_len):
+            continue
+        intersections = rows[j + 1:] & rows[j]
+        new_counts = popcount(intersections)
+        mask = new_counts >= min_count
+        if mask.any():
+            _eclat_extend(
+                itemset, intersections[mask], items[j + 1:][mask], new_counts[mask],
+                min_count, max_len, results,
+            )
+
+
+def top_k_itemsets(bitmaps, counts, k, min_len=1, max_len=None):
+    """
+    Tìm k tập phổ biến nhất (không cần min_sup) bằng duyệt ưu tiên theo số đếm trên bitmap dọc.
+    Tập cha không thể phổ biến hơn tập con, nên lấy ra từ hàng đợi theo số đếm giảm dần cho
+    kết quả đúng thứ tự; ngưỡng nội bộ (số đếm thứ k lớn nhất đã gặp) được nâng dần để bỏ qua
+    các nhánh không thể lọt vào top-k, nên thời gian chạy phụ thuộc vào k thay vì min_sup.
+    Các tập có cùng số đếm với tập thứ k cũng được giữ lại, nên khi min_len = 1 kết quả chính là
+    mọi tập phổ biến (độ dài <= max_len) với min_sup = hỗ trợ của tập thứ k.
+    Args:
+        bitmaps (np.ndarray): Bitmap np.uint64 (n_items, n_words).
+        counts (np.ndarray): Số lần xuất hiện của từng item.
+        k (int): Số tập cần tìm.
+        min_len (int): Độ dài tối thiểu của tập được tính vào top-k.
+        max_len (int | None): Độ dài tối đa của tập.
+    Returns:
+        list: Danh sách (tuple chỉ số item, số giao dịch hỗ trợ) theo số đếm giảm dần.
+    """
+    if k < 1:
+        raise ValueError("k phải >= 1.")
+    # Mỗi tập chỉ được mở rộng bằng các item đứng sau item cuối của nó (như Eclat)
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] > 0]
+    rows = bitmaps[order]
+    best = []  # Heap nhỏ nhất chứa k số đếm lớn nhất đã gặp (của các tập đủ độ dài)
+
+    def discover(count, length):
+        if length < min_len:
+            return
+        if len(best) < k:
+            heapq.heappush(best, count)
+        elif count > best[0]:
+            heapq.heapreplace(best, count)
+
+    def bound():
+        return best[0] if len(best) == k else 1
+
+    frontier = []
+    for j, count in enumerate(counts[order].tolist()):
+        frontier.append((-count, (j,)))
+        discover(count, 1)
+    heapq.heapify(frontier)
+
+    results = []
+    while frontier:
+        count, itemset = heapq.heappop(frontier)
+        count = -count
+        # Mọi tập còn lại trong hàng đợi (và tập cha của chúng) đều có số đếm <= count
+        if count < bound() or (len(results) >= k and count < results[k - 1][1]):
+            break
+        if len(itemset) >= min_len:
+            results.append((itemset, count))
+        last = itemset[-1]
+        if last + 1 == len(rows) or (max_len is not None and len(itemset) >= max_len):
+            continue
+        tids = rows[itemset[0]]
+        for j in itemset[1:]:
+            tids = tids & rows[j]
+        new_counts = popcount(rows[last + 1:] & tids)
+        for offset in np.flatnonzero(new_counts >= bound()).tolist():
+            new_count = int(new_counts[offset])
+            heapq.heappush(frontier, (-new_count, itemset + (last + 1 + offset,)))
+            discover(new_count, len(itemset) + 1)
+
+    return [(tuple(sorted(int(order[j]) for j in itemset)), count) for itemset, count in results]
+
+
+def closed_itemsets(bitmaps, counts, min_count, n_transactions):
+    """
+    Khai thác trực tiếp các tập phổ biến đóng (LCM) trên bitmap dọc:
+    bao đóng của một tập giao dịch gồm mọi item có bitmap chứa tập đó, và mỗi tập đóng
+    được sinh đúng một lần nhờ phép mở rộng bảo toàn tiền tố, không cần sinh mọi tập phổ biến.
+    Args:
+        bitmaps (np.ndarray): Bitmap np.uint64 (n_items, n_words) của các item phổ biến.
+        counts (np.ndarray): Số lần xuất hiện của từng item.
+        min_count (int): Số giao dịch tối thiểu.
+        n_transactions (int): Tổng số giao dịch.
+    Returns:
+        list: Danh sách (tuple chỉ số item, số giao dịch hỗ trợ) của các tập đóng.
+    """
+    keep = np.flatnonzero(counts >= min_count)
+    bitmaps = bitmaps[keep]
+    results = []
+    if n_transactions < min_count:
+        return results
+
+    all_tids = pack_columns(np.ones((n_transactions, 1), dtype=bool))[0]
+    root = _closure(bitmaps, all_tids)
+    if root.any():
+        results.append((tuple(int(i) for i in keep[root]), n_transactions))
+    _closed_extend(bitmaps, keep, root, all_tids, -1, min_count, results)
+    return results
+
+
+def _closure(bitmaps, tids):
+    """Các item xuất hiện trong mọi giao dịch của tids (mặt nạ bool theo item)."""
+    return np.all((bitmaps & tids) == tids, axis=1)
+
+
+def _closed_extend(bitmaps, items, itemset, tids, core, min_count, results):
+    """Mở rộng tập đóng itemset bằng các item sau core, chỉ giữ bao đóng bảo toàn tiền tố."""
+    candidates = np.flatnonzero(~itemset)
+    candidates = candidates[candidates > core]
+    if not len(candidates):
+        return
+    intersections = bitmaps[candidates] & tids
+    new_counts = popcount(intersections)
+    for e, new_tids, count in zip(candidates, intersections, new_counts):
+        if count < min_count:
+            continue
+        closed = _closure(bitmaps, new_tids)
+        # Bỏ qua nếu bao đóng thêm item nằm trước e: tập này được sinh ở nhánh khác
+        if np.any(closed[:e] & ~itemset[:e]):
+            continue
+        results.append((tuple(int(i) for i in items[closed]), int(count)))
+        _closed_extend(bitmaps, items, closed, new_tids, e, min_count, results)
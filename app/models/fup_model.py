@@ -0,0 +1,102 @@
+import numpy as np
+from models.eclat_model import code_bitmaps, count_itemsets, min_support_count
+
+
+def apriori_gen(level):
+    """
+    Sinh ứng viên độ dài k+1 từ các tập phổ biến độ dài k:
+    nối hai tập có chung k-1 phần tử đầu, bỏ ứng viên có tập con độ dài k không phổ biến.
+    Args:
+        level (Iterable[tuple]): Các tập phổ biến độ dài k, mỗi tập là tuple chỉ số đã sắp xếp.
+    Returns:
+        list[tuple]: Các ứng viên độ dài k+1.
+    """
+    level = sorted(level)
+    known = set(level)
+    candidates = []
+    start = 0
+    while start < len(level):
+        # Nhóm các tập có cùng tiền tố k-1 phần tử
+        end = start
+        prefix = level[start][:-1]
+        while end < len(level) and level[end][:-1] == prefix:
+            end += 1
+        for a in range(start, end):
+            for b in range(a + 1, end):
+                candidate = level[a] + (level[b][-1],)
+                if all(candidate[:m] + candidate[m + 1:] in known for m in range(len(candidate) - 2)):
+                    candidates.append(candidate)
+        start = end
+    return candidates
+
+
+def fup_update(old_counts, old_transactions, new_transactions, n_items, min_sup):
+    """
+    Cập nhật tập phổ biến khi thêm giao dịch mới theo thuật toán FUP.
+    Tập đã phổ biến chỉ cần cộng thêm số đếm trên phần dữ liệu mới; chỉ những ứng viên
+    mới phổ biến trong phần dữ liệu mới mới phải quét lại dữ liệu cũ.
+    Args:
+        old_counts (dict): tuple mã item đã sắp xếp -> số giao dịch hỗ trợ trên dữ liệu cũ
+            (mọi tập phổ biến cũ).
+        old_transactions (tuple): (offsets, items) các giao dịch cũ dạng CSR trên mã item.
+        new_transactions (tuple): (offsets, items) các giao dịch được thêm vào.
+        n_items (int): Số mã item.
+        min_sup (float): Ngưỡng hỗ trợ đã dùng để khai thác old_counts.
+    Returns:
+        tuple: (dict tuple mã item -> số giao dịch hỗ trợ trên toàn bộ dữ liệu,
+                số itemset phải đếm lại trên dữ liệu cũ).
+    """
+    n_old, n_new = len(old_transactions[0]) - 1, len(new_transactions[0]) - 1
+    min_total = min_support_count(min_sup, n_old + n_new)
+
+    # Chỉ item phổ biến cũ hoặc xuất hiện trong dữ liệu mới mới có thể phổ biến.
+    # Hàng bitmap theo mã tăng dần nên tuple vị trí đã sắp xếp cũng là tuple mã đã sắp xếp.
+    items = np.union1d(
+        np.array([itemset[0] for itemset in old_counts if len(itemset) == 1], dtype=np.int64),
+        new_transactions[1],
+    ).astype(np.int64)
+    position = {int(item): i for i, item in enumerate(items)}
+
+    old_positions = {
+        tuple(position[item] for item in itemset): count
+        for itemset, count in old_counts.items()
+    }
+    new_bitmaps = code_bitmaps(*new_transactions, n_items, items)
+    old_item_counts = None  # Chỉ đếm khi thật sự phải quét lại dữ liệu cũ
+
+    counts = {}
+    rescanned = 0
+    candidates = [(i,) for i in range(len(items))]
+    while candidates:
+        candidate_array = np.array(candidates, dtype=np.int64)
+        new_counts = count_itemsets(new_bitmaps, candidate_array)
+        totals = np.full(len(candidates), -1, dtype=np.int64)
+        rescan = []
+        for i, candidate in enumerate(candidates):
+            old_count = old_positions.get(candidate)
+            if old_count is not None:
+                totals[i] = old_count + new_counts[i]
+            elif new_counts[i] / n_new >= min_sup:
+                # Không phổ biến trên dữ liệu cũ: chỉ có thể phổ biến nếu phổ biến trên dữ liệu mới
+                rescan.append(i)
+        if rescan:
+            rescan_array = candidate_array[rescan]
+            if rescan_array.shape[1] == 1:
+                if old_item_counts is None:
+                    old_item_counts = np.bincount(old_transactions[1], minlength=n_items)
+                old_counts_rescan = old_item_counts[items[rescan_array[:, 0]]]
+            else:
+                # Bitmap dữ liệu cũ chỉ cho các item của ứng viên phải đếm lại ở mức này,
+                # nên chi phí quét lại tỉ lệ với số ứng viên mới chứ không với số item
+                needed = np.unique(rescan_array)
+                old_bitmaps = code_bitmaps(*old_transactions, n_items, items[needed])
+                old_counts_rescan = count_itemsets(old_bitmaps, np.searchsorted(needed, rescan_array))
+            totals[rescan] = old_counts_rescan + new_counts[rescan]
+            rescanned += len(rescan)
+
+        level = [candidate for candidate, total in zip(candidates, totals) if total >= min_total]
+        for candidate, total in zip(candidates, totals):
+            if total >= min_total:
+                counts[tuple(int(items[i]) for i in candidate)] = int(total)
+        candidates = apriori_gen(level)
+    return counts, rescanned
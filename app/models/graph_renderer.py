@@ -0,0 +1,149 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import graphviz
+
+
+class GraphRenderer:
+    def __init__(self, max_entries=32, max_workers=2, poll_ms=50):
+        """
+        Dịch vụ vẽ biểu đồ Graphviz: chạy `dot` trên nhóm luồng nền (dot là tiến trình riêng nên
+        luồng Tk không bị chặn) và lưu kết quả theo mã băm của mã nguồn DOT, loại bỏ theo LRU.
+        Args:
+            max_entries (int): Số ảnh tối đa được giữ trong bộ nhớ đệm.
+            max_workers (int): Số luồng chạy dot đồng thời.
+            poll_ms (int): Chu kỳ (ms) luồng Tk kiểm tra kết quả vẽ nền.
+        """
+        self.max_entries = max_entries
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graphviz")
+        self.entries = OrderedDict()  # khóa băm -> dữ liệu ảnh
+        self.pending = {}  # khóa băm -> Future của lần vẽ đang chạy
+        self.latest = {}  # kênh hiển thị -> số thứ tự yêu cầu mới nhất
+        self.requests = 0  # Số yêu cầu render_async đã nhận
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(source, format="png"):
+        """Khóa bộ nhớ đệm: SHA-1 của định dạng và mã nguồn DOT."""
+        return hashlib.sha1(f"{format}\n{source}".encode()).hexdigest()
+
+    def lookup(self, key):
+        """Lấy ảnh đã vẽ (None nếu chưa có) và đánh dấu vừa dùng."""
+        with self.lock:
+            data = self.entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def store(self, key, data):
+        """Lưu ảnh vào bộ nhớ đệm, loại ảnh dùng lâu nhất khi vượt quá max_entries."""
+        with self.lock:
+            self.entries[key] = data
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def render(self, source, format="png"):
+        """
+        Vẽ đồng bộ (dùng bộ nhớ đệm).
+        Args:
+            source (str): Mã nguồn DOT.
+            format (str): Định dạng đầu ra của Graphviz, ví dụ "png" hoặc "svg".
+        Returns:
+            bytes: Dữ liệu ảnh.
+        """
+        key = self.key(source, format)
+        data = self.lookup(key)
+        if data is None:
+            data = graphviz.Source(source).pipe(format=format)
+            self.store(key, data)
+        return data
+
+    def submit(self, source, format="png"):
+        """
+        Đưa một lần vẽ vào nhóm luồng nền; các yêu cầu trùng mã nguồn dùng chung một lần chạy dot.
+        Returns:
+            Future: Kết quả là dữ liệu ảnh.
+        """
+        key = self.key(source, format)
+        with self.lock:
+            future = self.pending.get(key)
+            if future is not None:
+                return future
+            future = self.executor.submit(self.render_and_release, key, source, format)
+            self.pending[key] = future
+            return future
+
+    def render_and_release(self, key, source, format):
+        """Chạy dot trên luồng nền, lưu kết quả vào bộ nhớ đệm rồi bỏ khỏi danh sách đang vẽ."""
+        try:
+            data = graphviz.Source(source).pipe(format=format)
+            self.store(key, data)
+            return data
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def render_async(self, widget, source, callback, format="png", error_callback=None, channel=None):
+        """
+        Vẽ nền rồi gọi callback(dữ liệu ảnh) trên luồng Tk (kiểm tra định kỳ bằng widget.after,
+        không gọi Tk từ luồng nền). Nếu ảnh đã có trong bộ nhớ đệm, callback được gọi ngay.
+        Args:
+            widget (tk.Misc): Widget dùng để lên lịch kiểm tra trên luồng Tk.
+            source (str): Mã nguồn DOT.
+            callback (callable): Nhận dữ liệu ảnh khi vẽ xong.
+            format (str): Định dạng đầu ra của Graphviz.
+            error_callback (callable | None): Nhận ngoại lệ nếu vẽ thất bại.
+            channel (str | None): Tên vùng hiển thị; kết quả của yêu cầu cũ hơn trên cùng kênh bị bỏ qua.
+        """
+        with self.lock:
+            self.requests += 1
+            request = self.requests
+            if channel is not None:
+                self.latest[channel] = request
+
+        data = self.lookup(self.key(source, format))
+        if data is not None:
+            callback(data)
+            return
+
+        future = self.submit(source, format)
+
+        def poll():
+            if not future.done():
+                widget.after(self.poll_ms, poll)
+                return
+            if channel is not None and self.latest.get(channel) != request:
+                return
+            try:
+                data = future.result()
+            except Exception as e:
+                if error_callback is not None:
+                    error_callback(e)
+                return
+            callback(data)
+
+        widget.after(self.poll_ms, poll)
+
+    def cancel(self, channel):
+        """Bỏ qua kết quả của mọi yêu cầu đang chờ trên kênh (ví dụ khi màn hình được reset)."""
+        with self.lock:
+            self.requests += 1
+            self.latest[channel] = self.requests
+
+    def clear(self):
+        """Xóa bộ nhớ đệm."""
+        with self.lock:
+            self.entries.clear()
+
+    def shutdown(self):
+        """Dừng nhóm luồng nền (không chờ các lần vẽ đang chạy)."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,138 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from models.compiled_tree import CompiledTree
+from models.id3_model import ID3Model
+
+# Mô hình đã mã hóa dữ liệu của mỗi tiến trình con (dữ liệu chỉ được gửi một lần cho mỗi tiến trình)
+WORKER = {}
+
+
+def init_worker(data, target, params):
+    """Khởi tạo tiến trình con: mã hóa dữ liệu một lần cho mọi cây mà tiến trình này dựng."""
+    model = ID3Model()
+    model.set_numeric_splits(params["numeric_mode"])
+    model.set_growth_limits(params["max_depth"], params["min_samples_split"])
+    model.max_features = params["max_features"]
+    model.encode_columns(data, target)
+    WORKER["model"] = model
+    WORKER["method"] = params["method"]
+    WORKER["data"] = data
+    WORKER["target"] = target
+
+
+def fit_tree(seed):
+    """
+    Dựng một cây trên mẫu bootstrap (lấy có hoàn lại n hàng) với tập thuộc tính ngẫu nhiên tại mỗi nút.
+    Các hàng trùng lặp được giữ trong mảng chỉ số hàng nên không cần sao chép dữ liệu.
+    Args:
+        seed (int): Hạt giống ngẫu nhiên của cây.
+    Returns:
+        tuple: (cây quyết định, cây đã biên dịch với nhãn đa số mỗi nút đếm trên mẫu bootstrap).
+    """
+    model = WORKER["model"]
+    model.rng = np.random.default_rng(seed)
+    n_rows = len(model.target_codes)
+    rows = np.sort(model.rng.integers(0, n_rows, n_rows))
+    tree = model.build_node(rows, 0, WORKER["method"])
+    return tree, CompiledTree(tree, WORKER["data"].iloc[rows], WORKER["target"])
+
+
+class ID3Forest:
+    def __init__(self, n_estimators=10, max_features="sqrt", method="gain", numeric_mode="threshold",
+                 max_depth=None, min_samples_split=2, n_jobs=None, seed=None):
+        """
+        Rừng ngẫu nhiên gồm các cây ID3Model: mỗi cây học trên một mẫu bootstrap và chỉ xét
+        max_features thuộc tính ngẫu nhiên tại mỗi nút; các cây được dựng song song trên nhiều tiến trình.
+        Args:
+            n_estimators (int): Số cây.
+            max_features (int | str | None): Số thuộc tính xét tại mỗi nút: số nguyên, "sqrt", "log2"
+                hoặc None (tất cả, tức là bagging).
+            method (str): "gain" hoặc "gini".
+            numeric_mode (str): Cách chia thuộc tính số (xem ID3Model.set_numeric_splits).
+            max_depth (int | None): Độ sâu tối đa của mỗi cây.
+            min_samples_split (int): Số mẫu tối thiểu để chia một nút.
+            n_jobs (int | None): Số tiến trình (None = số lõi CPU, 1 = tuần tự).
+            seed (int | None): Hạt giống ngẫu nhiên của cả rừng.
+        """
+        if n_estimators < 1:
+            raise ValueError("n_estimators phải >= 1.")
+        if method not in ("gain", "gini"):
+            raise ValueError("Phương pháp tính toán không hợp lệ.")
+        if n_jobs is not None and n_jobs < 1:
+            raise ValueError("n_jobs phải >= 1 (hoặc None để dùng mọi lõi CPU).")
+        self.n_estimators = n_estimators
+        self.max_features = max_features
+        self.method = method
+        self.numeric_mode = numeric_mode
+        self.max_depth = max_depth
+        self.min_samples_split = min_samples_split
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count() or 1
+        self.seed = seed
+        self.trees = []  # Các cây dạng từ điển
+        self.compiled = []  # Các cây đã biên dịch để dự đoán theo lô
+        self.classes = None  # Các nhãn đã sắp xếp (nhãn nhỏ hơn thắng khi số phiếu bằng nhau)
+
+    def resolve_max_features(self, n_features):
+        """Đổi max_features thành số thuộc tính cụ thể (None nếu xét tất cả)."""
+        if self.max_features is None:
+            return None
+        if self.max_features == "sqrt":
+            return max(1, int(np.sqrt(n_features)))
+        if self.max_features == "log2":
+            return max(1, int(np.log2(n_features)))
+        if isinstance(self.max_features, (int, np.integer)) and self.max_features >= 1:
+            return min(int(self.max_features), n_features)
+        raise ValueError("max_features không hợp lệ.")
+
+    def fit(self, data, target):
+        """
+        Huấn luyện rừng.
+        Args:
+            data (pd.DataFrame): Tập dữ liệu.
+            target (str): Cột mục tiêu.
+        Returns:
+            ID3Forest: Chính đối tượng này.
+        """
+        params = {
+            "numeric_mode": self.numeric_mode,
+            "max_depth": self.max_depth,
+            "min_samples_split": self.min_samples_split,
+            "max_features": self.resolve_max_features(len(data.columns) - 1),
+            "method": self.method,
+        }
+        # Mỗi cây có hạt giống độc lập nên kết quả không phụ thuộc số tiến trình
+        seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(self.seed).spawn(self.n_estimators)]
+        n_workers = min(self.n_jobs, self.n_estimators)
+        if n_workers == 1:
+            init_worker(data, target, params)
+            results = [fit_tree(seed) for seed in seeds]
+            WORKER.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker,
+                                     initargs=(data, target, params)) as executor:
+                results = list(executor.map(fit_tree, seeds))
+
+        self.classes = pd.Index(pd.unique(data[target])).sort_values()
+        self.trees = [tree for tree, _ in results]
+        self.compiled = [compiled for _, compiled in results]
+        return self
+
+    def predict_batch(self, data):
+        """
+        Dự đoán theo đa số phiếu: mỗi cây dự đoán cả lô bằng cây đã biên dịch (giá trị chưa thấy
+        lấy nhãn có nhiều mẫu bootstrap nhất tại nút đó), rồi các phiếu được đếm bằng một lần np.bincount.
+        Args:
+            data (pd.DataFrame): Các bản ghi cần dự đoán.
+        Returns:
+            np.ndarray: Nhãn dự đoán theo thứ tự hàng.
+        """
+        if not self.compiled:
+            raise ValueError("Rừng chưa được huấn luyện. Hãy gọi fit() trước.")
+        n_rows, n_classes = len(data), len(self.classes)
+        votes = np.concatenate([self.classes.get_indexer(tree.predict(data)) for tree in self.compiled])
+        rows = np.tile(np.arange(n_rows, dtype=np.int64), len(self.compiled))
+        counts = np.bincount(rows * n_classes + votes, minlength=n_rows * n_classes).reshape(n_rows, n_classes)
+        return self.classes.to_numpy(dtype=object)[np.argmax(counts, axis=1)]
@@ -1,6 +1,10 @@
+from statistics import NormalDist
+
 import pandas as pd
 import numpy as np
 from graphviz import Digraph
+from models.compiled_tree import CompiledTree
+from models.model_store import data_fingerprint, load_model_file, save_model_file
 
 class ID3Model:
     def __init__(self):
@@ -8,6 +12,69 @@ class ID3Model:
         Khởi tạo ID3 Model.
         """
         self.tree = None
+        self.compiled = None  # Cây đã biên dịch thành mảng để dự đoán theo lô
+        self.feature_names = []  # Các thuộc tính (không gồm cột mục tiêu) theo thứ tự cột
+        self.feature_codes = None  # Ma trận mã số nguyên (n_features, n_rows), mỗi thuộc tính liên tục trong bộ nhớ
+        self.feature_values = []  # Giá trị gốc ứng với mã của từng thuộc tính
+        self.target_codes = None  # Mã số nguyên của nhãn
+        self.classes = None  # Giá trị nhãn ứng với mã
+        self.numeric_mode = "categorical"  # Cách chia thuộc tính số: "categorical", "threshold" hoặc "histogram"
+        self.n_bins = 256  # Số khoảng tối đa của mỗi thuộc tính số ở chế độ "histogram"
+        self.numeric = []  # Với mỗi thuộc tính: True nếu được chia nhị phân theo ngưỡng
+        self.max_depth = None  # Độ sâu tối đa của cây (None = không giới hạn)
+        self.min_samples_split = 2  # Số mẫu tối thiểu để một nút được chia tiếp
+        self.min_gain = 0.0  # Gain (hoặc Gini giảm) tối thiểu để chấp nhận phép chia
+        self.pruning = None  # Cắt tỉa sau khi dựng cây: None, "pessimistic" hoặc "reduced_error"
+        self.validation_fraction = 0.3  # Tỉ lệ dữ liệu giữ lại để kiểm định khi cắt tỉa giảm lỗi
+        self.confidence = 0.25  # Mức tin cậy của cắt tỉa bi quan (như C4.5)
+        self.max_features = None  # Số thuộc tính chọn ngẫu nhiên để xét tại mỗi nút (None = tất cả)
+        self.rng = None  # Bộ sinh số ngẫu nhiên cho max_features
+        self.params = {}  # Tham số của lần huấn luyện gần nhất (được lưu cùng mô hình)
+        self.fingerprint = None  # Dấu vân tay dữ liệu huấn luyện và tham số
+
+    def set_numeric_splits(self, mode="threshold", n_bins=256):
+        """
+        Chọn cách chia các thuộc tính số trong build_tree_indexed().
+        Args:
+            mode (str): "categorical" để mỗi giá trị là một nhánh như ID3 gốc, "threshold" để chia nhị phân
+                "<= t" / "> t" theo kiểu C4.5 với mọi điểm cắt, "histogram" để chỉ xét các điểm cắt
+                giữa tối đa n_bins khoảng phân vị (nhanh hơn với dữ liệu rất lớn).
+            n_bins (int): Số khoảng tối đa ở chế độ "histogram".
+        """
+        if mode not in ("categorical", "threshold", "histogram"):
+            raise ValueError("Chế độ chia thuộc tính số không hợp lệ.")
+        if n_bins < 2:
+            raise ValueError("n_bins phải >= 2.")
+        self.numeric_mode = mode
+        self.n_bins = n_bins
+
+    def set_growth_limits(self, max_depth=None, min_samples_split=2, min_gain=0.0, pruning=None,
+                          validation_fraction=0.3, confidence=0.25):
+        """
+        Đặt các điều kiện dừng và cách cắt tỉa cho build_tree_and_store().
+        Args:
+            max_depth (int | None): Độ sâu tối đa (None = không giới hạn, 0 = chỉ một lá).
+            min_samples_split (int): Nút có ít mẫu hơn trở thành lá.
+            min_gain (float): Phép chia có Gain (hoặc Gini giảm) nhỏ hơn bị bỏ, nút trở thành lá.
+            pruning (str | None): None, "pessimistic" (ước lượng lỗi bi quan trên dữ liệu huấn luyện như C4.5)
+                hoặc "reduced_error" (giữ lại validation_fraction dữ liệu để kiểm định).
+            validation_fraction (float): Tỉ lệ dữ liệu kiểm định cho "reduced_error".
+            confidence (float): Mức tin cậy CF của "pessimistic" (càng nhỏ cắt tỉa càng mạnh).
+        """
+        if max_depth is not None and max_depth < 0:
+            raise ValueError("max_depth phải >= 0.")
+        if min_samples_split < 2 or min_gain < 0:
+            raise ValueError("min_samples_split phải >= 2 và min_gain phải >= 0.")
+        if pruning not in (None, "pessimistic", "reduced_error"):
+            raise ValueError("Cách cắt tỉa không hợp lệ.")
+        if not 0 < validation_fraction < 1 or not 0 < confidence < 0.5:
+            raise ValueError("validation_fraction phải thuộc (0, 1) và confidence phải thuộc (0, 0.5).")
+        self.max_depth = max_depth
+        self.min_samples_split = min_samples_split
+        self.min_gain = min_gain
+        self.pruning = pruning
+        self.validation_fraction = validation_fraction
+        self.confidence = confidence
 
     def entropy(self, data):
         """
@@ -31,9 +98,85 @@ class ID3Model:
         probabilities = data.value_counts(normalize=True)
         return 1 - sum(p ** 2 for p in probabilities)
 
+    def class_probabilities(self, counts):
+        """
+        Đổi bảng đếm nhãn thành xác suất, mỗi hàng sắp xếp giảm dần như value_counts(normalize=True).
+        Args:
+            counts (np.ndarray): Số mẫu theo từng nhãn, dạng (n_branches, n_classes).
+        Returns:
+            np.ndarray: Xác suất cùng kích thước (hàng rỗng cho toàn 0).
+        """
+        counts = np.sort(np.asarray(counts, dtype=np.int64), axis=-1)[..., ::-1]
+        totals = counts.sum(axis=-1, keepdims=True)
+        return np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+
+    def row_sums(self, values):
+        """Cộng tuần tự từ trái sang phải theo từng hàng (cùng thứ tự làm tròn với sum() của Python)."""
+        total = np.zeros(values.shape[:-1])
+        for j in range(values.shape[-1]):
+            total = total + values[..., j]
+        return total
+
+    def entropy_from_counts(self, counts):
+        """
+        Tính Entropy từ bảng đếm nhãn, cho cùng kết quả với entropy() trên tập con tương ứng.
+        Args:
+            counts (np.ndarray): Số mẫu theo từng nhãn, dạng (n_classes,) hoặc (n_branches, n_classes).
+        Returns:
+            np.ndarray: Entropy của từng hàng.
+        """
+        probabilities = self.class_probabilities(counts)
+        logs = np.log2(probabilities, out=np.zeros(probabilities.shape), where=probabilities > 0)
+        return -self.row_sums(probabilities * logs)
+
+    def gini_from_counts(self, counts):
+        """
+        Tính chỉ số Gini từ bảng đếm nhãn, cho cùng kết quả với gini_index() trên tập con tương ứng.
+        Args:
+            counts (np.ndarray): Số mẫu theo từng nhãn, dạng (n_classes,) hoặc (n_branches, n_classes).
+        Returns:
+            np.ndarray: Chỉ số Gini của từng hàng.
+        """
+        probabilities = self.class_probabilities(counts)
+        return 1 - self.row_sums(probabilities ** 2)
+
+    def contingency_table(self, feature_codes, n_values, target_codes, n_classes):
+        """
+        Lập bảng đếm (giá trị thuộc tính x nhãn) bằng một lần np.bincount trên mã kết hợp.
+        Args:
+            feature_codes (np.ndarray): Mã số nguyên của thuộc tính (-1 cho giá trị thiếu).
+            n_values (int): Số giá trị phân biệt của thuộc tính.
+            target_codes (np.ndarray): Mã số nguyên của nhãn.
+            n_classes (int): Số nhãn phân biệt.
+        Returns:
+            np.ndarray: Bảng đếm dạng (n_values, n_classes).
+        """
+        valid = (feature_codes >= 0) & (target_codes >= 0)
+        combined = feature_codes[valid].astype(np.int64) * n_classes + target_codes[valid]
+        return np.bincount(combined, minlength=n_values * n_classes).reshape(n_values, n_classes)
+
+    def split_score(self, table, method="gain", total_rows=None):
+        """
+        Tính Gain (hoặc Gini giảm) của một phép chia từ bảng đếm của nó.
+        Args:
+            table (np.ndarray): Bảng đếm (giá trị thuộc tính x nhãn).
+            method (str): "gain" hoặc "gini".
+            total_rows (int | None): Số mẫu tại nút (mặc định bằng tổng bảng đếm).
+        Returns:
+            float: Giá trị Gain hoặc Gini giảm.
+        """
+        impurity = self.entropy_from_counts if method == "gain" else self.gini_from_counts
+        branch_sizes = table.sum(axis=1)
+        total_rows = total_rows or branch_sizes.sum()
+        # Cộng dồn tuần tự theo thứ tự nhánh để Gain trùng khớp với cách tính trên từng tập con
+        weighted = np.cumsum((branch_sizes / total_rows) * impurity(table))
+        return float(impurity(table.sum(axis=0)) - (weighted[-1] if len(weighted) else 0.0))
+
     def information_gain(self, data, target, feature, method="gain"):
         """
         Tính thông tin thu được (Gain) hoặc chỉ số Gini giảm.
+        Thuộc tính và nhãn được mã hóa số nguyên một lần, mọi số đếm lấy từ một bảng đếm
+        thay vì lọc tập con theo từng giá trị.
         Args:
             data (pd.DataFrame): Tập dữ liệu.
             target (str): Cột mục tiêu.
@@ -42,28 +185,17 @@ class ID3Model:
         Returns:
             float: Giá trị Gain hoặc Gini giảm.
         """
-        total_rows = len(data)
-        unique_values = data[feature].unique()
-
-        if method == "gain":
-            parent_entropy = self.entropy(data[target])
-            weighted_entropy = 0
-            for value in unique_values:
-                subset = data[data[feature] == value]
-                weighted_entropy += (len(subset) / total_rows) * self.entropy(subset[target])
-            return parent_entropy - weighted_entropy
-
-        elif method == "gini":
-            parent_gini = self.gini_index(data[target])
-            weighted_gini = 0
-            for value in unique_values:
-                subset = data[data[feature] == value]
-                weighted_gini += (len(subset) / total_rows) * self.gini_index(subset[target])
-            return parent_gini - weighted_gini
+        if method not in ("gain", "gini"):
+            raise ValueError("Phương pháp tính toán không hợp lệ.")
+        feature_codes, feature_values = pd.factorize(data[feature])
+        target_codes, classes = pd.factorize(data[target])
+        table = self.contingency_table(feature_codes, len(feature_values), target_codes, len(classes))
+        return self.split_score(table, method, len(data))
 
     def best_split(self, data, target, method):
         """
         Tìm thuộc tính tốt nhất để chia dữ liệu.
+        Nhãn chỉ được mã hóa một lần cho mọi thuộc tính tại nút.
         Args:
             data (pd.DataFrame): Tập dữ liệu.
             target (str): Cột mục tiêu.
@@ -72,7 +204,12 @@ class ID3Model:
             str: Tên thuộc tính tốt nhất.
         """
         features = [col for col in data.columns if col != target]
-        gains = {feature: self.information_gain(data, target, feature, method) for feature in features}
+        target_codes, classes = pd.factorize(data[target])
+        gains = {}
+        for feature in features:
+            feature_codes, feature_values = pd.factorize(data[feature])
+            table = self.contingency_table(feature_codes, len(feature_values), target_codes, len(classes))
+            gains[feature] = self.split_score(table, method, len(data))
         return max(gains, key=gains.get)
 
     def build_tree(self, data, target, method="gain", depth=0):
@@ -105,19 +242,372 @@ class ID3Model:
 
         return tree
 
+    def encode_columns(self, data, target):
+        """
+        Mã hóa dữ liệu một lần thành ma trận số nguyên theo cột (mỗi hàng của ma trận là một thuộc tính,
+        liên tục trong bộ nhớ) để các nút của cây chỉ cần mảng chỉ số hàng thay vì bản sao DataFrame.
+        Thuộc tính số (khi numeric_mode khác "categorical") được mã hóa theo thứ hạng giá trị tăng dần,
+        tức là chỉ sắp xếp một lần cho cả cây; feature_values khi đó là giá trị lớn nhất của mỗi hạng.
+        Args:
+            data (pd.DataFrame): Tập dữ liệu.
+            target (str): Cột mục tiêu.
+        """
+        self.feature_names = [col for col in data.columns if col != target]
+        self.feature_codes = np.empty((len(self.feature_names), len(data)), dtype=np.int32)
+        self.feature_values = []
+        self.numeric = []
+        for i, feature in enumerate(self.feature_names):
+            column = data[feature]
+            numeric = (
+                self.numeric_mode != "categorical"
+                and pd.api.types.is_numeric_dtype(column)
+                and not pd.api.types.is_bool_dtype(column)
+            )
+            if numeric:
+                codes, values = self.rank_numeric(column.to_numpy())
+            else:
+                codes, values = pd.factorize(column)
+            self.feature_codes[i] = codes
+            self.feature_values.append(values)
+            self.numeric.append(numeric)
+        self.target_codes, self.classes = pd.factorize(data[target])
+
+    def rank_numeric(self, values):
+        """
+        Mã hóa một cột số theo thứ hạng: mã nhỏ hơn ứng với giá trị nhỏ hơn, NaN có hạng riêng ở cuối
+        (nên có thể được tách thành nhánh "> giá trị lớn nhất").
+        Ở chế độ "histogram", các giá trị được gom vào tối đa n_bins khoảng phân vị; NaN vẫn giữ hạng riêng.
+        Args:
+            values (np.ndarray): Giá trị của cột.
+        Returns:
+            tuple: (mã hạng của từng hàng, np.ndarray giá trị lớn nhất của mỗi hạng dùng làm ngưỡng).
+        """
+        unique, codes = np.unique(values, return_inverse=True)
+        if self.numeric_mode == "histogram" and len(unique) > self.n_bins:
+            finite = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+            edges = np.unique(np.quantile(finite, np.linspace(0, 1, self.n_bins + 1)[1:-1], method="lower"))
+            # Khoảng b gồm các giá trị trong (edges[b - 1], edges[b]]; ngưỡng là giá trị lớn nhất có thật trong khoảng
+            bins = np.searchsorted(edges, unique, side="left")
+            if values.dtype.kind == "f" and len(unique) > 1 and np.isnan(unique[-1]):
+                # NaN không gộp vào khoảng trên cùng
+                bins[-1] = bins[-2] + 1
+            last = np.searchsorted(bins, np.arange(bins[-1] + 1), side="right") - 1
+            return bins[codes], unique[last]
+        return codes, unique
+
+    def node_split(self, feature, rows, target_codes, method):
+        """
+        Tính Gain của một thuộc tính tại một nút từ mảng chỉ số hàng.
+        Returns:
+            tuple: (Gain, mã các giá trị có mặt tại nút theo thứ tự xuất hiện); với thuộc tính số là
+                (Gain, mã hạng của ngưỡng tốt nhất), hoặc None nếu mọi hàng có cùng giá trị.
+        """
+        if self.numeric[feature]:
+            return self.threshold_split(feature, rows, target_codes, method)
+        codes = self.feature_codes[feature][rows]
+        present, first = np.unique(codes, return_index=True)
+        present = present[np.argsort(first)]
+        n_classes = len(self.classes)
+        table = np.bincount(
+            codes.astype(np.int64) * n_classes + target_codes,
+            minlength=len(self.feature_values[feature]) * n_classes,
+        ).reshape(-1, n_classes)
+        return self.split_score(table[present], method, len(rows)), present
+
+    def threshold_split(self, feature, rows, target_codes, method):
+        """
+        Tìm ngưỡng chia nhị phân tốt nhất của một thuộc tính số: đếm nhãn theo từng hạng giá trị
+        (đã sắp xếp sẵn khi mã hóa), rồi một lần cộng dồn cho bảng đếm nhánh trái của mọi điểm cắt.
+        Returns:
+            tuple | None: (Gain, mã hạng lớn nhất thuộc nhánh "<="), hoặc None nếu không có điểm cắt.
+        """
+        codes = self.feature_codes[feature][rows]
+        n_classes = len(self.classes)
+        n_ranks = len(self.feature_values[feature])
+        if len(rows) * 8 < n_ranks:
+            # Nút nhỏ so với số hạng: chỉ đánh số lại các hạng có mặt
+            present, codes = np.unique(codes, return_inverse=True)
+            n_ranks = len(present)
+        else:
+            present = None
+        table = np.bincount(
+            codes.astype(np.int64) * n_classes + target_codes, minlength=n_ranks * n_classes
+        ).reshape(n_ranks, n_classes)
+        if present is None:
+            present = np.flatnonzero(table.any(axis=1))
+            table = table[present]
+        if len(present) < 2:
+            return None
+
+        impurity = self.entropy_from_counts if method == "gain" else self.gini_from_counts
+        left = np.cumsum(table, axis=0)[:-1]
+        right = table.sum(axis=0) - left
+        left_sizes = left.sum(axis=1)
+        scores = -(left_sizes * impurity(left) + (len(rows) - left_sizes) * impurity(right)) / len(rows)
+        best = int(np.argmax(scores))
+        return float(impurity(table.sum(axis=0)) + scores[best]), int(present[best])
+
+    def majority_label(self, target_codes):
+        """Nhãn phổ biến nhất trong các mã nhãn (nhãn nhỏ nhất nếu bằng nhau, như mode())."""
+        counts = np.bincount(target_codes, minlength=len(self.classes))
+        return pd.Series(self.classes[counts == counts.max()]).sort_values().iloc[0]
+
+    def build_node(self, rows, used, method, depth=0):
+        """
+        Xây dựng cây con cho các hàng rows (tăng dần), bỏ qua các thuộc tính đã dùng.
+        Args:
+            rows (np.ndarray): Chỉ số các hàng thuộc nút.
+            used (int): Mặt nạ bit các thuộc tính đã dùng trên đường từ gốc.
+            method (str): "gain" hoặc "gini".
+            depth (int): Độ sâu hiện tại của cây.
+        Returns:
+            dict | object: Cây con hoặc nhãn lá.
+        """
+        target_codes = self.target_codes[rows]
+        # Dừng khi tất cả các nhãn giống nhau
+        if (target_codes == target_codes[0]).all():
+            return self.classes[target_codes[0]]
+
+        # Dừng khi đạt độ sâu tối đa hoặc nút quá ít mẫu
+        if (self.max_depth is not None and depth >= self.max_depth) or len(rows) < self.min_samples_split:
+            return self.majority_label(target_codes)
+
+        # Thuộc tính số có thể được chia lại ở các mức sâu hơn với ngưỡng khác nên không bị đánh dấu đã dùng
+        features = [i for i in range(len(self.feature_names)) if self.numeric[i] or not used >> i & 1]
+        # Rừng ngẫu nhiên: chỉ xét một tập con ngẫu nhiên các thuộc tính tại mỗi nút
+        if self.max_features is not None and len(features) > self.max_features:
+            features = sorted(self.rng.choice(features, self.max_features, replace=False).tolist())
+        splits = [self.node_split(feature, rows, target_codes, method) for feature in features]
+
+        # Tìm thuộc tính tốt nhất để chia (thuộc tính đứng trước thắng khi bằng nhau, như max())
+        best_feature, best_gain, best_split = None, None, None
+        for feature, split in zip(features, splits):
+            if split is not None and (best_gain is None or split[0] > best_gain):
+                best_feature, (best_gain, best_split) = feature, split
+
+        # Dừng khi không còn thuộc tính nào để chia hoặc phép chia tốt nhất không đủ Gain
+        if best_feature is None or (self.min_gain > 0 and best_gain < self.min_gain):
+            return self.majority_label(target_codes)
+        tree = {self.feature_names[best_feature]: {}}
+        codes = self.feature_codes[best_feature][rows]
+        values = self.feature_values[best_feature]
+
+        if self.numeric[best_feature]:
+            # Hạng được sắp xếp tăng dần nên nhánh "<=" là các hàng có mã hạng không vượt quá ngưỡng
+            threshold = values[best_split]
+            left = codes <= best_split
+            tree[self.feature_names[best_feature]][f"<= {threshold}"] = self.build_node(rows[left], used, method, depth + 1)
+            tree[self.feature_names[best_feature]][f"> {threshold}"] = self.build_node(rows[~left], used, method, depth + 1)
+            return tree
+
+        # Chia chỉ số hàng theo giá trị: một lần sắp xếp ổn định giữ nguyên thứ tự hàng trong mỗi nhánh
+        order = np.argsort(codes, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(values)))))
+        for value in best_split:
+            subset = rows[order[starts[value]:starts[value + 1]]]
+            tree[self.feature_names[best_feature]][values[value]] = self.build_node(
+                subset, used | 1 << best_feature, method, depth + 1
+            )
+        return tree
+
+    def build_tree_indexed(self, data, target, method="gain"):
+        """
+        Xây dựng cây quyết định ID3 không sao chép dữ liệu: dữ liệu được mã hóa một lần,
+        mỗi nút chỉ giữ mảng chỉ số hàng và mặt nạ bit các thuộc tính đã dùng.
+        Kết quả giống hệt build_tree() khi numeric_mode là "categorical"; nếu đã gọi set_numeric_splits(),
+        thuộc tính số được chia nhị phân với nhánh "<= t" / "> t".
+        Args:
+            data (pd.DataFrame): Tập dữ liệu.
+            target (str): Cột mục tiêu.
+            method (str): Phương pháp tính toán: "gain" hoặc "gini".
+        Returns:
+            dict: Cây quyết định dưới dạng từ điển.
+        """
+        if method not in ("gain", "gini"):
+            raise ValueError("Phương pháp tính toán không hợp lệ.")
+        self.encode_columns(data, target)
+        return self.build_node(np.arange(len(data)), 0, method)
+
+    def pessimistic_errors(self, n_rows, n_errors):
+        """
+        Số lỗi ước lượng bi quan của một lá theo C4.5: cận trên (mức tin cậy self.confidence)
+        của số lỗi trên n_rows mẫu; chính xác theo phân phối nhị thức khi không có lỗi,
+        xấp xỉ chuẩn có hiệu chỉnh liên tục trong các trường hợp còn lại.
+        """
+        if n_rows == 0:
+            return 0.0
+        if n_errors == 0:
+            return float(n_rows * (1 - self.confidence ** (1 / n_rows)))
+        if n_errors + 0.5 >= n_rows:
+            return float(n_errors + 0.67 * (n_rows - n_errors))
+        coeff = NormalDist().inv_cdf(1 - self.confidence) ** 2
+        errors = n_errors + 0.5
+        upper = (errors + coeff / 2 + np.sqrt(coeff * (errors * (1 - errors / n_rows) + coeff / 4))) / (n_rows + coeff)
+        return float(n_rows * upper)
+
+    def prune_tree(self, tree, data, target, validation=None):
+        """
+        Cắt tỉa cây từ dưới lên: thay một cây con bằng lá mang nhãn đa số (trên dữ liệu huấn luyện)
+        khi lỗi của lá không lớn hơn lỗi của cây con. Lỗi được ước lượng bi quan trên dữ liệu huấn luyện
+        nếu validation là None, ngược lại là số lỗi thật trên tập kiểm định (reduced-error pruning).
+        Args:
+            tree (dict | object): Cây cần cắt tỉa.
+            data (pd.DataFrame): Dữ liệu đã dùng để dựng cây.
+            target (str): Cột mục tiêu.
+            validation (pd.DataFrame | None): Tập kiểm định.
+        Returns:
+            dict | object: Cây đã cắt tỉa.
+        """
+        frame = data if validation is None else pd.concat([data, validation], ignore_index=True)
+        columns = {column: frame[column].to_numpy() for column in frame.columns if column != target}
+        labels, classes = pd.factorize(frame[target])
+        rows = np.arange(len(frame))
+        pruned, _ = self.prune_node(tree, rows, columns, labels, classes, len(data), validation is not None)
+        return pruned
+
+    def prune_node(self, node, rows, columns, labels, classes, n_train, reduced_error):
+        """
+        Cắt tỉa đệ quy một nút với các hàng đi tới nút đó (hàng < n_train thuộc dữ liệu huấn luyện).
+        Returns:
+            tuple: (nút sau cắt tỉa, số lỗi ước lượng của nút).
+        """
+        train = rows[rows < n_train]
+        counts = np.bincount(labels[train], minlength=len(classes))
+        if len(train):
+            # Nhãn đa số, nhãn nhỏ nhất nếu bằng nhau (như majority_label)
+            candidates = np.flatnonzero(counts == counts.max())
+            label_code = candidates[pd.Series(classes[candidates]).sort_values().index[0]]
+            label = classes[label_code]
+        else:
+            label_code, label = -1, None
+
+        def leaf_errors(leaf_label):
+            if reduced_error:
+                return float(np.count_nonzero(classes[labels[rows[rows >= n_train]]] != leaf_label))
+            return self.pessimistic_errors(len(train), len(train) - int(np.count_nonzero(classes[labels[train]] == leaf_label)))
+
+        if not isinstance(node, dict):
+            return node, leaf_errors(node)
+
+        (feature, branches), = node.items()
+        values = columns[feature][rows]
+        threshold = CompiledTree.parse_threshold(branches)
+        if threshold is not None:
+            left = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan) <= threshold
+            masks = [left, ~left]
+        else:
+            masks = [values == value for value in branches]
+        subtree, subtree_errors = {}, 0.0
+        for (value, child), mask in zip(branches.items(), masks):
+            subtree[value], errors = self.prune_node(child, rows[mask], columns, labels, classes, n_train, reduced_error)
+            subtree_errors += errors
+        # Các hàng có giá trị chưa thấy không đi xuống nhánh nào: tính là lỗi nếu khác nhãn đa số
+        unrouted = rows[~np.any(masks, axis=0)]
+        if reduced_error:
+            unrouted = unrouted[unrouted >= n_train]
+        subtree_errors += float(np.count_nonzero(labels[unrouted] != label_code))
+
+        if label_code >= 0:
+            errors = leaf_errors(label)
+            if errors <= subtree_errors:
+                return label, errors
+        return {feature: subtree}, subtree_errors
+
     def build_tree_and_store(self, data, target, method="gain"):
         """
-        Xây dựng cây và lưu vào self.tree.
+        Xây dựng cây và lưu vào self.tree, rồi cắt tỉa nếu đã chọn self.pruning.
+        Với "reduced_error", cây được dựng trên phần dữ liệu còn lại sau khi giữ
+        self.validation_fraction số hàng (chọn ngẫu nhiên cố định) để kiểm định.
         Args:
             data (pd.DataFrame): Tập dữ liệu.
             target (str): Cột mục tiêu.
             method (str): Phương pháp tính toán.
         """
-        self.tree = self.build_tree(data, target, method)
+        self.params = {
+            "target": str(target), "method": method, "numeric_mode": self.numeric_mode, "n_bins": self.n_bins,
+            "max_depth": self.max_depth, "min_samples_split": self.min_samples_split, "min_gain": self.min_gain,
+            "pruning": self.pruning, "validation_fraction": self.validation_fraction, "confidence": self.confidence,
+        }
+        self.fingerprint = data_fingerprint(data, self.params)
+        train = data
+        if self.pruning == "reduced_error":
+            validation = data.sample(frac=self.validation_fraction, random_state=0)
+            train = data.drop(index=validation.index)
+            if len(train) == 0 or len(validation) == 0:
+                raise ValueError("Dữ liệu quá ít để tách tập kiểm định.")
+            self.tree = self.prune_tree(self.build_tree_indexed(train, target, method), train, target, validation)
+        elif self.pruning == "pessimistic":
+            self.tree = self.prune_tree(self.build_tree_indexed(data, target, method), data, target)
+        else:
+            self.tree = self.build_tree_indexed(data, target, method)
+        # Biên dịch ngay khi còn dữ liệu huấn luyện để nhãn đa số của mỗi nút tính theo số mẫu
+        self.compile_tree(self.tree, train, target)
         return self.tree
 
+    def compile_tree(self, tree=None, data=None, target=None):
+        """
+        Biên dịch cây dạng từ điển (mặc định self.tree) thành mảng song song để dự đoán theo lô.
+        Args:
+            tree (dict | object | None): Cây quyết định (None = self.tree).
+            data (pd.DataFrame | None): Dữ liệu đã dùng để dựng cây; khi có, nhãn đa số của mỗi nút trong
+                là nhãn có nhiều mẫu nhất, ngược lại là nhãn xuất hiện ở nhiều lá nhất.
+            target (str | None): Cột mục tiêu trong data.
+        Returns:
+            CompiledTree: Cây đã biên dịch.
+        """
+        tree = self.tree if tree is None else tree
+        if tree is None:
+            raise ValueError("Chưa có cây quyết định. Hãy gọi build_tree_and_store() trước.")
+        self.compiled = CompiledTree(tree, data, target)
+        return self.compiled
+
+    def predict_batch(self, data, fallback="majority"):
+        """
+        Dự đoán nhãn cho nhiều bản ghi cùng lúc bằng cây đã biên dịch.
+        Args:
+            data (pd.DataFrame): Các bản ghi cần dự đoán (các cột thuộc tính như lúc huấn luyện).
+            fallback: "majority" để dùng nhãn có nhiều mẫu huấn luyện nhất tại nút gặp giá trị chưa thấy,
+                hoặc một giá trị cố định (ví dụ None) để trả về thay thế.
+        Returns:
+            np.ndarray: Nhãn dự đoán theo thứ tự hàng.
+        """
+        if self.compiled is None:
+            self.compile_tree()
+        return self.compiled.predict(data, fallback)
+
 
 
+    def save_model(self, path):
+        """
+        Lưu cây đã huấn luyện vào file nhị phân (cây biên dịch dạng mảng, có thể ánh xạ bộ nhớ khi đọc)
+        kèm tham số huấn luyện và dấu vân tay dữ liệu.
+        Args:
+            path (str): Đường dẫn file.
+        """
+        if self.tree is None:
+            raise ValueError("Chưa có cây quyết định để lưu.")
+        if self.compiled is None:
+            self.compile_tree()
+        arrays, labels = self.compiled.to_arrays()
+        save_model_file(path, "id3", arrays, labels, self.params, self.fingerprint)
+
+    def load_model(self, path, mmap=True):
+        """
+        Đọc cây đã lưu bằng save_model(): các mảng được ánh xạ bộ nhớ nên predict_batch dùng được ngay,
+        cây dạng từ điển được dựng lại để hiển thị.
+        Args:
+            path (str): Đường dẫn file.
+            mmap (bool): Ánh xạ bộ nhớ thay vì đọc toàn bộ file.
+        Returns:
+            dict | object: Cây quyết định.
+        """
+        header, arrays, labels = load_model_file(path, "id3", mmap)
+        self.compiled = CompiledTree.from_arrays(arrays, labels)
+        self.tree = self.compiled.to_tree()
+        self.params = header["params"]
+        self.fingerprint = header["fingerprint"]
+        return self.tree
+
     def generate_graph(self, tree):
         """
         Tạo biểu đồ Graphviz từ cây quyết định và trả về dữ liệu nhị phân.
@@ -126,6 +616,17 @@ class ID3Model:
         Returns:
             bytes: Hình ảnh biểu đồ dưới dạng nhị phân.
         """
+        return self.build_graph(tree).pipe(format="png")
+
+    def build_graph(self, tree):
+        """
+        Tạo đối tượng Digraph của cây quyết định (chưa vẽ); mã nguồn DOT (thuộc tính source)
+        có thể được vẽ nền bằng GraphRenderer.
+        Args:
+            tree (dict): Cây quyết định được sinh ra từ thuật toán ID3.
+        Returns:
+            Digraph: Biểu đồ Graphviz.
+        """
         dot = Digraph(format='png')
 
         def add_edges(subtree, parent):
@@ -142,10 +643,14 @@ class ID3Model:
                     dot.node(leaf_name, f"{key}: {value}", shape="box", style="filled", color="lightgreen")
                     dot.edge(parent, leaf_name)  # Không có label cho cạnh
 
+        # Cây chỉ có một lá (ví dụ do giới hạn độ sâu hoặc cắt tỉa)
+        if not isinstance(tree, dict):
+            dot.node("leaf", str(tree), shape="box", style="filled", color="lightgreen")
+            return dot
+
         # Tạo node gốc đầu tiên từ key chính của cây
         root_key = list(tree.keys())[0]
         dot.node(root_key, root_key, shape="ellipse", style="filled", color="lightblue")
         add_edges(tree[root_key], root_key)
 
-        # Trả về biểu đồ dưới dạng nhị phân
-        return dot.pipe(format="png")
+        return dot
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+def build_item_labels(items):
+    """
+    Tạo từ điển item: mỗi item phân biệt được gán một mã int32 liên tiếp theo thứ tự đã sắp xếp.
+    Args:
+        items (Iterable): Các item (có thể lặp lại).
+    Returns:
+        pd.Index: Nhãn item, vị trí trong Index chính là mã của item.
+    """
+    _, labels = pd.factorize(pd.Series(items, dtype=object), sort=True)
+    return pd.Index(labels, dtype=object)
+
+
+def merge_item_labels(labels, items):
+    """
+    Bổ sung các item mới vào từ điển mà vẫn giữ thứ tự sắp xếp.
+    Returns:
+        tuple: (từ điển mới, mảng remap sao cho mã cũ c thành remap[c]).
+    """
+    merged = labels.union(build_item_labels(items))
+    return merged, merged.get_indexer(labels).astype(np.int32)
+
+
+def encode_transactions(data, labels):
+    """
+    Mã hóa DataFrame (cột 'ID', 'items') thành giao dịch dạng CSR trên mã item.
+    Giao dịch được sắp theo ID như groupby('ID'); item trong mỗi giao dịch được sắp xếp và bỏ trùng.
+    Args:
+        data (pd.DataFrame): Dữ liệu giao dịch, mỗi hàng là một cặp (ID, item).
+        labels (pd.Index): Từ điển item, phải chứa mọi item của data.
+    Returns:
+        tuple: (danh sách ID, offsets np.int64, items np.int32); giao dịch t gồm
+        items[offsets[t]:offsets[t + 1]].
+    """
+    id_codes, ids = pd.factorize(data['ID'], sort=True)
+    item_codes = labels.get_indexer(data['items'])
+    mask = (id_codes >= 0) & (item_codes >= 0)  # Bỏ hàng thiếu ID hoặc item
+    # Khóa (giao dịch, item) duy nhất: sắp xếp một lần cho cả thứ tự giao dịch lẫn item
+    keys = np.unique(id_codes[mask].astype(np.int64) * len(labels) + item_codes[mask])
+    transactions = keys // len(labels) if len(labels) else keys
+    offsets = np.searchsorted(transactions, np.arange(len(ids) + 1)).astype(np.int64)
+    items = (keys - transactions * len(labels)).astype(np.int32)
+    return ids.tolist(), offsets, items
+
+
+def decode_transactions(offsets, items, labels):
+    """Giải mã giao dịch dạng CSR về danh sách các danh sách item (chỉ dùng để hiển thị)."""
+    decoded = np.asarray(labels, dtype=object)[items]
+    return [decoded[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])]
@@ -0,0 +1,77 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FrequentItemsetCache:
+    def __init__(self, max_datasets=8):
+        """
+        Bộ nhớ đệm kết quả khai thác tập phổ biến theo từng bộ dữ liệu.
+        Với mỗi bộ dữ liệu chỉ giữ kết quả có min_sup thấp nhất đã khai thác (bảng đếm theo mã item;
+        cùng dấu vân tay nghĩa là cùng từ điển item nên mã không đổi): mọi truy vấn với min_sup cao hơn
+        được trả lời bằng cách lọc kết quả đó.
+        Args:
+            max_datasets (int): Số bộ dữ liệu tối đa được giữ (loại bỏ theo LRU).
+        """
+        self.max_datasets = max_datasets
+        self.entries = OrderedDict()  # fingerprint -> (min_sup, bảng đếm tuple mã item -> số giao dịch, số giao dịch)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(binary_matrix):
+        """
+        Tính dấu vân tay (SHA-1) của ma trận nhị phân, gồm tên cột và vị trí các ô True.
+        Args:
+            binary_matrix (pd.DataFrame): Ma trận nhị phân (dày hoặc thưa), có thể chứa cột 'ID'.
+        Returns:
+            str: Chuỗi hex định danh bộ dữ liệu.
+        """
+        items = binary_matrix.drop(columns=['ID'], errors='ignore')
+        digest = hashlib.sha1()
+        digest.update(repr(items.columns.tolist()).encode())
+        digest.update(str(items.shape).encode())
+        if hasattr(items, "sparse"):
+            matrix = items.sparse.to_coo().tocsr()
+            matrix.sum_duplicates()
+            digest.update(matrix.indptr.astype(np.int64).tobytes())
+            digest.update(matrix.indices.astype(np.int64).tobytes())
+        else:
+            digest.update(np.packbits(items.to_numpy(dtype=bool)).tobytes())
+        return digest.hexdigest()
+
+    def get(self, fingerprint, min_sup):
+        """
+        Lấy tập phổ biến với ngưỡng min_sup nếu đã khai thác ở ngưỡng bằng hoặc thấp hơn.
+        Returns:
+            dict | None: Bảng đếm đã lọc theo min_sup, hoặc None nếu phải khai thác lại.
+        """
+        entry = self.entries.get(fingerprint)
+        if entry is None or entry[0] > min_sup:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(fingerprint)
+        self.hits += 1
+        _, counts, n_transactions = entry
+        return {itemset: count for itemset, count in counts.items() if count / n_transactions >= min_sup}
+
+    def mined_min_sup(self, fingerprint):
+        """Ngưỡng min_sup thấp nhất đã khai thác cho bộ dữ liệu (None nếu chưa có)."""
+        entry = self.entries.get(fingerprint)
+        return entry[0] if entry is not None else None
+
+    def put(self, fingerprint, min_sup, itemset_counts, n_transactions):
+        """Lưu kết quả nếu ngưỡng thấp hơn kết quả đang giữ, rồi loại bộ dữ liệu ít dùng nhất."""
+        entry = self.entries.get(fingerprint)
+        if entry is None or min_sup < entry[0]:
+            self.entries[fingerprint] = (min_sup, dict(itemset_counts), n_transactions)
+        self.entries.move_to_end(fingerprint)
+        while len(self.entries) > self.max_datasets:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Xóa toàn bộ bộ nhớ đệm."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
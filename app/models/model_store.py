@@ -0,0 +1,116 @@
+import hashlib
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"DMMODEL\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64  # Mỗi mảng bắt đầu ở vị trí chia hết cho 64 byte để ánh xạ bộ nhớ hiệu quả
+PREAMBLE = struct.Struct("<8sIQ")  # magic, phiên bản, độ dài header JSON
+
+
+def data_fingerprint(data, params=None):
+    """
+    Dấu vân tay (SHA-1) của dữ liệu huấn luyện và tham số: tên cột, kích thước, giá trị băm từng hàng.
+    Args:
+        data (pd.DataFrame): Dữ liệu huấn luyện.
+        params (dict | None): Tham số huấn luyện (phải chuyển được sang JSON).
+    Returns:
+        str: Chuỗi hex.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr([str(column) for column in data.columns]).encode())
+    digest.update(str(data.shape).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def to_json_value(value):
+    """Đổi một giá trị nhãn/thuộc tính sang kiểu JSON, giữ phân biệt int, float, bool và chuỗi."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    raise ValueError(f"Không thể lưu giá trị kiểu {type(value).__name__}: {value!r}")
+
+
+def align(position):
+    """Làm tròn lên vị trí căn lề ALIGNMENT byte."""
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def save_model_file(path, kind, arrays, labels, params, fingerprint):
+    """
+    Ghi mô hình vào một file: phần đầu cố định (magic, phiên bản), header JSON mô tả mô hình,
+    rồi các mảng NumPy liền nhau, mỗi mảng căn lề 64 byte để có thể ánh xạ bộ nhớ khi đọc.
+    Args:
+        path (str): Đường dẫn file.
+        kind (str): Loại mô hình, ví dụ "id3" hoặc "naive_bayes".
+        arrays (dict): Tên -> np.ndarray số.
+        labels (dict): Tên -> danh sách giá trị (từ điển mã hóa: vị trí là mã số nguyên).
+        params (dict): Tham số huấn luyện.
+        fingerprint (str | None): Dấu vân tay dữ liệu huấn luyện.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    header = {
+        "model": kind,
+        "fingerprint": fingerprint,
+        "params": params,
+        "labels": {name: [to_json_value(value) for value in values] for name, values in labels.items()},
+        "arrays": {},
+    }
+    # Vị trí các mảng phụ thuộc độ dài header nên tính lặp đến khi ổn định
+    header_length = 0
+    while True:
+        position = align(PREAMBLE.size + header_length)
+        for name, array in arrays.items():
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+            position = align(position + array.nbytes)
+        encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        if len(encoded) == header_length:
+            break
+        header_length = len(encoded)
+
+    with open(path, "wb") as file:
+        file.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        file.write(encoded)
+        for name, array in arrays.items():
+            file.seek(header["arrays"][name]["offset"])
+            file.write(array.tobytes())
+
+
+def load_model_file(path, kind=None, mmap=True):
+    """
+    Đọc file mô hình.
+    Args:
+        path (str): Đường dẫn file.
+        kind (str | None): Loại mô hình mong đợi (None = không kiểm tra).
+        mmap (bool): Ánh xạ bộ nhớ các mảng (chỉ đọc) thay vì đọc toàn bộ vào RAM.
+    Returns:
+        tuple: (header dict, dict tên -> mảng, dict tên -> danh sách giá trị).
+    """
+    with open(path, "rb") as file:
+        preamble = file.read(PREAMBLE.size)
+        if len(preamble) != PREAMBLE.size:
+            raise ValueError("File mô hình không hợp lệ.")
+        magic, version, header_length = PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ValueError("File mô hình không hợp lệ.")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Phiên bản định dạng {version} mới hơn phiên bản được hỗ trợ ({FORMAT_VERSION}).")
+        header = json.loads(file.read(header_length).decode("utf-8"))
+        if kind is not None and header["model"] != kind:
+            raise ValueError(f"File chứa mô hình '{header['model']}', không phải '{kind}'.")
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+            if mmap and int(np.prod(shape)) > 0:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=spec["offset"], shape=shape)
+            else:
+                file.seek(spec["offset"])
+                arrays[name] = np.frombuffer(file.read(dtype.itemsize * int(np.prod(shape))), dtype=dtype).reshape(shape)
+    return header, arrays, header["labels"]
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from collections import defaultdict
+from models.model_store import data_fingerprint, load_model_file, save_model_file
 
 
 class NaiveBayesModel:
@@ -10,9 +11,13 @@ class NaiveBayesModel:
         """
         self.laplace_smoothing = laplace_smoothing
         self.class_probs = {}  # P(C): Xác suất tiên nghiệm
-        self.cond_probs = {}   # P(X|C): Xác suất có điều kiện
         self.feature_values = defaultdict(set)  # Giá trị thuộc tính duy nhất cho từng cột
         self.is_trained = False  # Kiểm tra trạng thái huấn luyện của model
+        self.fingerprint = None  # Dấu vân tay dữ liệu huấn luyện và tham số
+        # P(X|C) dạng log: thuộc tính -> (các lớp, các giá trị, ma trận log P(X|C) kích thước lớp x giá trị,
+        # NaN là giá trị không có trong bảng của lớp)
+        self.log_tables = {}
+        self.batch_tables = None  # Bảng tra cứu cho predict_batch (tính lại sau mỗi lần huấn luyện/tải)
 
     def fit(self, X, y):
         """
@@ -27,36 +32,65 @@ class NaiveBayesModel:
         if len(X) != len(y):
             raise ValueError("Số lượng mẫu X và y phải khớp nhau.")
 
+        self.fingerprint = data_fingerprint(
+            X.assign(**{"__target__": y.to_numpy()}), {"laplace_smoothing": self.laplace_smoothing, "target": str(y.name)}
+        )
         n_samples = len(y)
         classes = y.unique()
+        # Mã số nguyên của nhãn theo thứ tự xuất hiện (như y.unique())
+        class_codes = pd.Index(classes).get_indexer(y)
+        class_counts = np.bincount(class_codes, minlength=len(classes))
 
         # Tính toán P(C) - Xác suất tiên nghiệm
-        for c in classes:
-            self.class_probs[c] = (y == c).sum() / n_samples
+        for c, count in zip(classes, class_counts):
+            self.class_probs[c] = count / n_samples
 
-        # Tính toán P(X|C) - Xác suất có điều kiện
+        # Tính toán P(X|C) - Xác suất có điều kiện từ bảng đếm (lớp x giá trị) của từng thuộc tính
         for column in X.columns:
-            self.cond_probs[column] = {}
-            for c in classes:
-                self.cond_probs[column][c] = defaultdict(int)
-                subset = X[y == c][column]
-                for value in subset:
-                    self.feature_values[column].add(value)
-                    self.cond_probs[column][c][value] += 1
-
-                # Áp dụng làm trơn Laplace nếu cần
-                total_count = sum(self.cond_probs[column][c].values())
-                if self.laplace_smoothing:
-                    for value in self.feature_values[column]:
-                        self.cond_probs[column][c][value] = (self.cond_probs[column][c][value] + 1) / (
-                            total_count + len(self.feature_values[column])
-                        )
-                else:
-                    for value in self.feature_values[column]:
-                        self.cond_probs[column][c][value] = self.cond_probs[column][c][value] / total_count
-
+            column_values = X[column].unique()
+            value_codes = pd.Index(column_values).get_indexer(X[column])
+            counts = np.bincount(
+                class_codes.astype(np.int64) * len(column_values) + value_codes,
+                minlength=len(classes) * len(column_values),
+            ).reshape(len(classes), len(column_values))
+            self.log_tables[column] = self.conditional_tables(column, classes, column_values, counts)
+
+        self.batch_tables = None
         self.is_trained = True  # Đánh dấu mô hình đã được huấn luyện
 
+    def conditional_tables(self, column, classes, column_values, counts):
+        """
+        Tính bảng log P(X|C) của một thuộc tính trên cả ma trận đếm (lớp x giá trị):
+        log P = log((count + alpha) / (total + alpha * k)), với alpha = 1 khi làm trơn Laplace (0 nếu không)
+        và k là số giá trị trong bảng của lớp. Lấy log của đúng thương số như cách tính gốc (không tách thành
+        hiệu hai log) để điểm các lớp trùng nhau từng bit và argmax chọn lớp đầu tiên khi hòa. Các lớp
+        được xử lý theo thứ tự xuất hiện và bảng của lớp thứ k chỉ chứa các giá trị đã gặp ở các lớp 0..k
+        (cùng các giá trị từ lần fit trước), mẫu số Laplace dùng số giá trị đã gặp tại thời điểm đó.
+        Args:
+            column (str): Tên thuộc tính.
+            classes (np.ndarray): Các nhãn theo thứ tự xuất hiện.
+            column_values (np.ndarray): Các giá trị của thuộc tính (vị trí là mã giá trị).
+            counts (np.ndarray): Ma trận đếm (n_classes, n_values).
+        Returns:
+            tuple: (danh sách lớp, pd.Index các giá trị, ma trận log P(X|C) với NaN ở giá trị không có trong bảng).
+        """
+        # Giá trị đã biết từ lần fit trước nhưng không có trong dữ liệu này: thêm cột đếm 0
+        known = self.feature_values[column]
+        values = list(column_values)
+        values += [value for value in known if value not in set(values)]
+        counts = np.pad(counts, ((0, 0), (0, len(values) - counts.shape[1])))
+        prior = np.array([value in known for value in values], dtype=bool)
+
+        # Giá trị có trong bảng của lớp k: đã gặp ở một lớp 0..k hoặc đã biết từ trước
+        present = np.logical_or.accumulate(counts > 0, axis=0) | prior
+        totals = counts.sum(axis=1, keepdims=True)
+        alpha = 1 if self.laplace_smoothing else 0
+        with np.errstate(divide="ignore"):
+            log_probs = np.log((counts + alpha) / (totals + alpha * present.sum(axis=1, keepdims=True)))
+
+        self.feature_values[column].update(value for value, seen in zip(values, present[-1]) if seen)
+        return list(classes), pd.Index(values), np.where(present, log_probs, np.nan)
+
     def predict(self, sample):
         """
         Dự đoán nhãn lớp cho một mẫu.
@@ -70,25 +104,131 @@ class NaiveBayesModel:
         if not self.is_trained:
             raise ValueError("Mô hình chưa được huấn luyện. Vui lòng gọi phương thức `fit()` trước khi dự đoán.")
 
-        class_scores = {}
-        for c in self.class_probs:
-            class_scores[c] = np.log(self.class_probs[c])  # Log của P(C)
-            for feature, value in sample.items():
-                if value in self.cond_probs[feature][c]:
-                    class_scores[c] += np.log(self.cond_probs[feature][c][value])
-                else:
-                    # Xử lý trường hợp giá trị không tồn tại
-                    class_scores[c] += np.log(1e-6 if not self.laplace_smoothing else 1 / (len(self.feature_values[feature]) + 1))
+        if self.batch_tables is None:
+            self.compile_tables()
+        classes, log_priors, tables = self.batch_tables
+
+        # Log của P(C) cộng log P(X|C) của từng thuộc tính (giá trị không tồn tại dùng hàng cuối của bảng)
+        class_scores = log_priors.copy()
+        for feature, value in sample.items():
+            _, table, positions = tables[feature]
+            class_scores += table[positions.get(value, -1)]
 
         # Trả về nhãn lớp với xác suất cao nhất
-        return max(class_scores, key=class_scores.get)
+        return classes[int(np.argmax(class_scores))]
 
+    def class_table(self, feature, classes):
+        """
+        Bảng log P(X|C) của một thuộc tính với các hàng theo thứ tự classes.
+        Returns:
+            tuple: (pd.Index các giá trị, ma trận log P(X|C) kích thước (len(classes), số giá trị)).
+        """
+        table_classes, values, log_probs = self.log_tables[feature]
+        rows = pd.Index(table_classes).get_indexer(classes)
+        if (rows < 0).any():
+            raise ValueError(f"Thuộc tính '{feature}' không có bảng xác suất cho mọi lớp.")
+        return values, log_probs[rows]
+
+    def compile_tables(self):
+        """
+        Chuẩn bị bảng tra cứu cho predict()/predict_batch() một lần cho mỗi mô hình đã huấn luyện: với mỗi
+        thuộc tính, một ma trận (số giá trị + 1, số lớp) chứa log P(X|C); hàng cuối (và các ô giá trị không có
+        trong bảng của lớp) là giá trị thay thế cho giá trị chưa thấy: log(1e-6), hoặc log(1 / (k + 1))
+        khi làm trơn Laplace với k là số giá trị của thuộc tính.
+        """
+        classes = list(self.class_probs)
+        log_priors = np.log(np.array([self.class_probs[c] for c in classes], dtype=np.float64))
+        tables = {}
+        for feature in self.log_tables:
+            values, log_probs = self.class_table(feature, classes)
+            fallback = np.log(1e-6 if not self.laplace_smoothing else 1 / (len(self.feature_values[feature]) + 1))
+            table = np.full((len(values) + 1, len(classes)), fallback)
+            table[:-1] = np.where(np.isnan(log_probs), fallback, log_probs).T
+            tables[feature] = (values, table, {value: j for j, value in enumerate(values)})
+        self.batch_tables = (classes, log_priors, tables)
+
+    def predict_batch(self, data):
+        """
+        Dự đoán cho nhiều bản ghi: mỗi thuộc tính được đổi sang mã giá trị rồi tra bảng log P(X|C)
+        bằng chỉ số mảng và cộng dồn theo thuộc tính. Nhãn dự đoán giống hệt predict() cho từng hàng.
 
+        Args:
+            data (pd.DataFrame): Các bản ghi cần dự đoán (phải có đủ các cột thuộc tính của mô hình).
+
+        Returns:
+            tuple: (np.ndarray nhãn dự đoán, pd.DataFrame log P(C|X) đã chuẩn hóa với mỗi cột là một lớp).
+        """
+        if not self.is_trained:
+            raise ValueError("Mô hình chưa được huấn luyện. Vui lòng gọi phương thức `fit()` trước khi dự đoán.")
+        if self.batch_tables is None:
+            self.compile_tables()
+        classes, log_priors, tables = self.batch_tables
+        missing = [feature for feature in tables if feature not in data.columns]
+        if missing:
+            raise ValueError(f"Dữ liệu thiếu các cột thuộc tính: {', '.join(map(str, missing))}")
+
+        scores = np.tile(log_priors, (len(data), 1))
+        for feature, (values, table, _) in tables.items():
+            # Mã -1 (giá trị chưa thấy) trỏ tới hàng cuối của bảng
+            scores += table[values.get_indexer(data[feature])]
+
+        labels = np.array(classes, dtype=object)[np.argmax(scores, axis=1)]
+        with np.errstate(invalid="ignore"):
+            log_posteriors = scores - np.logaddexp.reduce(scores, axis=1, keepdims=True)
+        return labels, pd.DataFrame(log_posteriors, index=data.index, columns=classes)
+
+    def save_model(self, path):
+        """
+        Lưu mô hình vào file nhị phân: nhãn, thuộc tính và giá trị được mã hóa số nguyên (vị trí trong danh sách),
+        xác suất lưu trong mảng NumPy có thể ánh xạ bộ nhớ. Mỗi thuộc tính chiếm một khoảng cột
+        [value_offsets[i], value_offsets[i + 1]) của ma trận log_cond_probs (n_classes, tổng số giá trị);
+        NaN đánh dấu giá trị không có trong bảng của lớp đó.
+        Args:
+            path (str): Đường dẫn file.
+        """
+        if not self.is_trained:
+            raise ValueError("Mô hình chưa được huấn luyện.")
+        features, classes = list(self.log_tables), list(self.class_probs)
+        tables = [self.class_table(feature, classes) for feature in features]
+        value_offsets = np.concatenate(([0], np.cumsum([len(values) for values, _ in tables]))).astype(np.int64)
+        arrays = {
+            "class_probs": np.array([self.class_probs[c] for c in classes], dtype=np.float64),
+            "log_cond_probs": np.concatenate([log_probs for _, log_probs in tables], axis=1),
+            "value_offsets": value_offsets,
+        }
+        labels = {"features": features, "classes": classes, "values": [value for values, _ in tables for value in values]}
+        save_model_file(path, "naive_bayes", arrays, labels, {"laplace_smoothing": self.laplace_smoothing}, self.fingerprint)
+
+    def load_model(self, path, mmap=True):
+        """
+        Đọc mô hình đã lưu bằng save_model() và dựng lại các bảng log xác suất
+        (file cũ lưu xác suất ở mảng cond_probs thay vì log_cond_probs).
+        Args:
+            path (str): Đường dẫn file.
+            mmap (bool): Ánh xạ bộ nhớ thay vì đọc toàn bộ file.
+        """
+        header, arrays, labels = load_model_file(path, "naive_bayes", mmap)
+        self.reset()
+        self.laplace_smoothing = header["params"]["laplace_smoothing"]
+        self.fingerprint = header["fingerprint"]
+        classes, offsets = labels["classes"], arrays["value_offsets"]
+        if "log_cond_probs" in arrays:
+            log_cond_probs = arrays["log_cond_probs"]
+        else:
+            with np.errstate(divide="ignore"):
+                log_cond_probs = np.log(arrays["cond_probs"])
+        self.class_probs.update(zip(classes, arrays["class_probs"].tolist()))
+        for i, feature in enumerate(labels["features"]):
+            values = labels["values"][offsets[i]:offsets[i + 1]]
+            self.feature_values[feature] = set(values)
+            self.log_tables[feature] = (classes, pd.Index(values), np.asarray(log_cond_probs[:, offsets[i]:offsets[i + 1]]))
+        self.is_trained = True
 
     def reset(self):
         """
         Reset lại trạng thái của model.
         """
         self.class_probs.clear()
-        self.cond_probs.clear()
         self.feature_values.clear()
+        self.log_tables.clear()
+        self.batch_tables = None
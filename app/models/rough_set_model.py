@@ -122,30 +122,37 @@ class RoughSetModel:
         - X: Tập X.
         """
         try:
-            # Đảm bảo các dữ liệu đầu vào là set
-            lower = set(lower)
-            upper = set(upper)
-            boundary = set(boundary)
-            outside = set(outside)
-            X = set(X)
-
-            dot = Digraph(format='png')
-
-            # Thêm các nút
-            dot.node('X', f"X: {', '.join(map(str, X))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
-            dot.node('Upper', f"Upper B X: {', '.join(map(str, upper))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
-            dot.node('Lower', f"Lower B X: {', '.join(map(str, lower))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
-            dot.node('Boundary', f"Boundary B X: {', '.join(map(str, boundary))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
-            dot.node('Outside', f"Outside B X: {', '.join(map(str, outside))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
-
-            # Thêm các cạnh
-            dot.edge('X', 'Upper')
-            dot.edge('Upper', 'Lower')
-            dot.edge('Upper', 'Boundary')
-            dot.edge('X', 'Outside')
-
             # Trả về biểu đồ dưới dạng dữ liệu nhị phân
-            return dot.pipe(format='png')
+            return self.build_graph(lower, upper, boundary, outside, X).pipe(format='png')
 
         except Exception as e:
-            raise ValueError(f"Không thể tạo biểu đồ: {e}")
\ No newline at end of file
+            raise ValueError(f"Không thể tạo biểu đồ: {e}")
+
+    def build_graph(self, lower, upper, boundary, outside, X):
+        """
+        Tạo đối tượng Digraph minh họa tập thô (chưa vẽ); mã nguồn DOT có thể được vẽ nền bằng GraphRenderer.
+        Các tham số giống generate_graph().
+        """
+        # Đảm bảo các dữ liệu đầu vào là set
+        lower = set(lower)
+        upper = set(upper)
+        boundary = set(boundary)
+        outside = set(outside)
+        X = set(X)
+
+        dot = Digraph(format='png')
+
+        # Thêm các nút
+        dot.node('X', f"X: {', '.join(map(str, X))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
+        dot.node('Upper', f"Upper B X: {', '.join(map(str, upper))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
+        dot.node('Lower', f"Lower B X: {', '.join(map(str, lower))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
+        dot.node('Boundary', f"Boundary B X: {', '.join(map(str, boundary))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
+        dot.node('Outside', f"Outside B X: {', '.join(map(str, outside))}", shape='box', style='rounded,filled', color='blue:red', gradientangle='90', fillcolor='white')
+
+        # Thêm các cạnh
+        dot.edge('X', 'Upper')
+        dot.edge('Upper', 'Lower')
+        dot.edge('Upper', 'Boundary')
+        dot.edge('X', 'Outside')
+
+        return dot
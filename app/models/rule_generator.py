@@ -0,0 +1,63 @@
+from array import array
+
+import numpy as np
+from models.fup_model import apriori_gen
+
+
+def generate_rules(itemset_counts, n_transactions, min_conf):
+    """
+    Sinh luật kết hợp trực tiếp từ bảng băm itemset (mã số nguyên) -> số giao dịch hỗ trợ.
+    Với mỗi itemset, hậu quả được mở rộng theo từng mức như Apriori: nếu X - H -> H không đủ
+    độ tin cậy thì mọi hậu quả lớn hơn chứa H cũng không đủ, nên bị cắt tỉa ngay.
+    Args:
+        itemset_counts (dict): tuple mã item đã sắp xếp -> số giao dịch hỗ trợ (mọi tập phổ biến).
+        n_transactions (int): Tổng số giao dịch.
+        min_conf (float): Ngưỡng độ tin cậy tối thiểu. Độ tin cậy được tính từ số đếm nguyên
+            nên luật có độ tin cậy đúng bằng ngưỡng (ví dụ 8/10 = 0.8) không bị loại do sai số làm tròn.
+    Returns:
+        dict: Kết quả dạng cột gồm 'antecedent_offsets', 'antecedent_items',
+        'consequent_offsets', 'consequent_items' (CSR: luật r dùng items[offsets[r]:offsets[r + 1]])
+        và các mảng 'antecedent_support', 'consequent_support', 'support', 'confidence', 'lift'.
+    """
+    antecedent_items, consequent_items = array("i"), array("i")
+    antecedent_lengths, consequent_lengths = array("q"), array("q")
+    antecedent_support, consequent_support = array("d"), array("d")
+    support, confidence = array("d"), array("d")
+
+    for itemset, itemset_count in itemset_counts.items():
+        if len(itemset) < 2:
+            continue
+        consequents = [(item,) for item in itemset]
+        while consequents:
+            passed = []
+            for consequent in consequents:
+                antecedent = tuple(item for item in itemset if item not in consequent)
+                antecedent_count = itemset_counts[antecedent]
+                rule_confidence = itemset_count / antecedent_count
+                if rule_confidence < min_conf:
+                    continue
+                passed.append(consequent)
+                antecedent_items.extend(antecedent)
+                consequent_items.extend(consequent)
+                antecedent_lengths.append(len(antecedent))
+                consequent_lengths.append(len(consequent))
+                antecedent_support.append(antecedent_count / n_transactions)
+                consequent_support.append(itemset_counts[consequent] / n_transactions)
+                support.append(itemset_count / n_transactions)
+                confidence.append(rule_confidence)
+            # Hậu quả dài hơn chỉ sinh từ các hậu quả đã đạt ngưỡng, và phải chừa lại tiền đề
+            consequents = apriori_gen(passed) if passed and len(passed[0]) + 1 < len(itemset) else []
+
+    confidence = np.frombuffer(confidence, dtype=np.float64)
+    consequent_support = np.frombuffer(consequent_support, dtype=np.float64)
+    return {
+        "antecedent_offsets": np.concatenate(([0], np.cumsum(np.frombuffer(antecedent_lengths, dtype=np.int64)))),
+        "antecedent_items": np.frombuffer(antecedent_items, dtype=np.int32),
+        "consequent_offsets": np.concatenate(([0], np.cumsum(np.frombuffer(consequent_lengths, dtype=np.int64)))),
+        "consequent_items": np.frombuffer(consequent_items, dtype=np.int32),
+        "antecedent_support": np.frombuffer(antecedent_support, dtype=np.float64),
+        "consequent_support": consequent_support,
+        "support": np.frombuffer(support, dtype=np.float64),
+        "confidence": confidence,
+        "lift": confidence / consequent_support if len(confidence) else confidence,
+    }
@@ -0,0 +1,121 @@
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+
+class RuleIndex:
+    # Các độ đo có thể dùng để xếp hạng gợi ý
+    METRICS = ("confidence", "lift")
+
+    def __init__(self, rules):
+        """
+        Chỉ mục luật kết hợp để trả lời nhanh "với giỏ hàng này, nên gợi ý gì tiếp theo".
+        Các luật được gom theo tiền đề; mỗi tiền đề giữ, cho từng độ đo, danh sách
+        (điểm, item hậu quả) đã sắp xếp giảm dần. Chỉ mục đảo item -> tiền đề chứa item
+        dùng cho các giỏ hàng lớn, khi liệt kê tập con của giỏ quá tốn kém.
+        Args:
+            rules (pd.DataFrame): Kết quả của AprioriModel.generate_rules() (cột 'antecedents',
+                'consequents', 'consequent support', 'confidence').
+        """
+        if rules is None or rules.empty:
+            raise ValueError("Chưa có luật kết hợp. Hãy sinh luật trước khi tạo chỉ mục.")
+        self.item_codes = {}
+        self.antecedent_ids = {}  # tuple mã item đã sắp xếp -> mã tiền đề
+        scored = {metric: [] for metric in self.METRICS}  # mã tiền đề -> {item: điểm cao nhất}
+
+        confidence = rules["confidence"].to_numpy(dtype=np.float64)
+        lift = confidence / rules["consequent support"].to_numpy(dtype=np.float64)
+        for antecedent, consequent, rule_confidence, rule_lift in zip(
+            rules["antecedents"], rules["consequents"], confidence.tolist(), lift.tolist()
+        ):
+            key = tuple(sorted(self.item_codes.setdefault(item, len(self.item_codes)) for item in antecedent))
+            antecedent_id = self.antecedent_ids.get(key)
+            if antecedent_id is None:
+                antecedent_id = self.antecedent_ids[key] = len(self.antecedent_ids)
+                for metric in self.METRICS:
+                    scored[metric].append({})
+            for item in consequent:
+                code = self.item_codes.setdefault(item, len(self.item_codes))
+                for metric, score in (("confidence", rule_confidence), ("lift", rule_lift)):
+                    best = scored[metric][antecedent_id]
+                    if best.get(code, -1.0) < score:
+                        best[code] = score
+        self.n_rules = len(rules)
+        self.item_labels = list(self.item_codes)
+
+        # Danh sách gợi ý đã sắp xếp theo từng độ đo cho mỗi tiền đề
+        self.postings = {
+            metric: [
+                sorted(((score, code) for code, score in best.items()), key=lambda pair: -pair[0])
+                for best in scored[metric]
+            ]
+            for metric in self.METRICS
+        }
+
+        # Chỉ mục đảo item -> các tiền đề chứa item
+        keys = list(self.antecedent_ids)
+        self.antecedent_lengths = np.array([len(key) for key in keys], dtype=np.int64)
+        self.max_antecedent_length = int(self.antecedent_lengths.max())
+        items = np.array([code for key in keys for code in key], dtype=np.int64)
+        owners = np.repeat(np.arange(len(keys)), self.antecedent_lengths)
+        order = np.argsort(items, kind="stable")
+        self.item_offsets = np.searchsorted(items[order], np.arange(len(self.item_codes) + 1))
+        self.item_antecedents = owners[order]
+
+    def matching_antecedents(self, codes):
+        """
+        Các tiền đề nằm trọn trong giỏ hàng (codes: mã item đã sắp xếp, không trùng).
+        Giỏ nhỏ: liệt kê tập con và tra bảng băm; giỏ lớn: đếm trên chỉ mục đảo.
+        """
+        max_length = min(self.max_antecedent_length, len(codes))
+        n_subsets = sum(comb(len(codes), length) for length in range(1, max_length + 1))
+        n_postings = int(sum(self.item_offsets[code + 1] - self.item_offsets[code] for code in codes))
+        if n_subsets <= n_postings:
+            matched = []
+            for length in range(1, max_length + 1):
+                for subset in combinations(codes, length):
+                    antecedent_id = self.antecedent_ids.get(subset)
+                    if antecedent_id is not None:
+                        matched.append(antecedent_id)
+            return matched
+        postings = np.concatenate([self.item_antecedents[self.item_offsets[code]:self.item_offsets[code + 1]] for code in codes])
+        antecedents, hits = np.unique(postings, return_counts=True)
+        return antecedents[hits == self.antecedent_lengths[antecedents]].tolist()
+
+    def recommend(self, basket, k=5, metric="confidence"):
+        """
+        Gợi ý k item tốt nhất cho một giỏ hàng. Luật khớp khi toàn bộ tiền đề nằm trong giỏ;
+        điểm của một item là điểm cao nhất trong các luật khớp có item đó ở hậu quả,
+        và item đã có trong giỏ không được gợi ý.
+        Args:
+            basket (Iterable): Các item đang có trong giỏ.
+            k (int): Số item gợi ý tối đa.
+            metric (str): "confidence" hoặc "lift".
+        Returns:
+            list[tuple]: Danh sách (item, điểm) theo điểm giảm dần.
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Độ đo không hợp lệ: {metric}. Chọn một trong {self.METRICS}.")
+        codes = sorted({self.item_codes[item] for item in basket if item in self.item_codes})
+        if not codes:
+            return []
+        in_basket = set(codes)
+        # Mỗi danh sách đã sắp xếp: k + |giỏ| phần tử đầu là đủ để chứa k gợi ý tốt nhất của nó
+        limit = k + len(codes)
+        postings = self.postings[metric]
+        best = {}
+        for antecedent_id in self.matching_antecedents(codes):
+            for score, code in postings[antecedent_id][:limit]:
+                if code not in in_basket and best.get(code, -1.0) < score:
+                    best[code] = score
+        top = sorted(best.items(), key=lambda pair: -pair[1])[:k]
+        return [(self.item_labels[code], score) for code, score in top]
+
+    def recommend_batch(self, baskets, k=5, metric="confidence"):
+        """
+        Gợi ý cho nhiều giỏ hàng.
+        Returns:
+            list[list[tuple]]: Với mỗi giỏ, danh sách (item, điểm) theo điểm giảm dần.
+        """
+        return [self.recommend(basket, k, metric) for basket in baskets]
@@ -0,0 +1,96 @@
+from statistics import NormalDist
+
+import numpy as np
+from models.eclat_model import code_bitmaps, eclat, min_support_count, popcount
+from models.fup_model import apriori_gen
+from models.son_model import count_partition
+
+
+def sample_transactions(offsets, items, sample_size, seed=None):
+    """
+    Lấy ngẫu nhiên (không hoàn lại) sample_size giao dịch từ dữ liệu dạng CSR.
+    Returns:
+        tuple: (offsets, items) của mẫu, giữ nguyên thứ tự giao dịch.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(offsets) - 1, size=sample_size, replace=False))
+    lengths = np.diff(offsets)[rows]
+    sample_offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    # Vị trí của từng phần tử mẫu trong mảng items gốc
+    positions = np.repeat(offsets[rows] - sample_offsets[:-1], lengths) + np.arange(sample_offsets[-1])
+    return sample_offsets, items[positions]
+
+
+def negative_border(frequent, n_items):
+    """
+    Biên âm của một họ tập phổ biến đóng với phép lấy tập con: các tập không thuộc họ
+    nhưng mọi tập con trực tiếp đều thuộc họ (kể cả các item đơn không phổ biến).
+    Args:
+        frequent (set[tuple]): Các tuple mã item đã sắp xếp.
+        n_items (int): Số mã item.
+    Returns:
+        list[tuple]: Các tập thuộc biên âm.
+    """
+    by_length = {}
+    for itemset in frequent:
+        by_length.setdefault(len(itemset), []).append(itemset)
+    border = [(item,) for item in range(n_items) if (item,) not in frequent]
+    for level in by_length.values():
+        border.extend(candidate for candidate in apriori_gen(level) if candidate not in frequent)
+    return border
+
+
+def toivonen(offsets, items, n_items, min_sup, sample_fraction=0.1, delta=0.01, seed=None):
+    """
+    Khai thác tập phổ biến xấp xỉ theo Toivonen: khai thác một mẫu ngẫu nhiên ở ngưỡng hạ thấp,
+    rồi đếm lại trên toàn bộ dữ liệu trong một lượt các tập phổ biến của mẫu cùng biên âm của chúng.
+    Nếu không tập nào của biên âm phổ biến thì kết quả chắc chắn chính xác; ngược lại có thể
+    còn sót các tập cha của những tập biên âm đó.
+    Args:
+        offsets (np.ndarray): Giao dịch t gồm items[offsets[t]:offsets[t + 1]].
+        items (np.ndarray): Mã item của mọi giao dịch nối liền.
+        n_items (int): Số mã item.
+        min_sup (float): Ngưỡng hỗ trợ tối thiểu.
+        sample_fraction (float): Tỉ lệ giao dịch được lấy mẫu.
+        delta (float): Xác suất (một phía) để hỗ trợ trên mẫu của một tập phổ biến rơi dưới ngưỡng hạ thấp.
+        seed (int | None): Hạt giống ngẫu nhiên.
+    Returns:
+        tuple: (dict tuple mã item -> số giao dịch hỗ trợ trên toàn bộ dữ liệu, dict báo cáo gồm
+                'sample_size', 'lowered_min_sup', 'n_candidates', 'n_border', 'border_frequent', 'exact').
+    """
+    n_transactions = len(offsets) - 1
+    sample_size = min(n_transactions, max(1, int(round(n_transactions * sample_fraction))))
+    sample_offsets, sample_items = sample_transactions(offsets, items, sample_size, seed)
+
+    # Hạ ngưỡng theo xấp xỉ chuẩn của phân phối nhị thức tại min_sup, nhưng không quá một nửa
+    # để mẫu nhỏ không làm bùng nổ số ứng viên; biên âm vẫn cho biết kết quả có chính xác hay không
+    epsilon = NormalDist().inv_cdf(1 - delta) * np.sqrt(min_sup * (1 - min_sup) / sample_size)
+    lowered_min_sup = float(max(min_sup - epsilon, min_sup / 2))
+    sample_min_count = min_support_count(lowered_min_sup, sample_size)
+    keep = np.flatnonzero(np.bincount(sample_items, minlength=n_items) >= sample_min_count)
+    bitmaps = code_bitmaps(sample_offsets, sample_items, n_items, keep)
+    sample_frequent = {
+        tuple(sorted(int(keep[position]) for position in itemset))
+        for itemset, _ in eclat(bitmaps, popcount(bitmaps), sample_min_count)
+    }
+
+    # Một lượt đếm trên toàn bộ dữ liệu cho cả tập phổ biến của mẫu lẫn biên âm
+    border = negative_border(sample_frequent, n_items)
+    candidates = list(sample_frequent) + border
+    counts = count_partition(offsets, items, n_items, candidates)
+    min_count = min_support_count(min_sup, n_transactions)
+    border_frequent = int(np.count_nonzero(counts[len(sample_frequent):] >= min_count))
+
+    report = {
+        "sample_size": sample_size,
+        "lowered_min_sup": lowered_min_sup,
+        "n_candidates": len(candidates),
+        "n_border": len(border),
+        "border_frequent": border_frequent,
+        "exact": border_frequent == 0,
+    }
+    return {
+        itemset: int(count)
+        for itemset, count in zip(candidates, counts)
+        if count >= min_count
+    }, report
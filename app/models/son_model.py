@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from models.eclat_model import code_bitmaps, count_itemsets, eclat, min_support_count, popcount
+
+# Số giao dịch tối thiểu của một phân vùng; dữ liệu nhỏ hơn được khai thác trong tiến trình hiện tại
+MIN_PARTITION_SIZE = 5000
+
+
+def mine_partition(offsets, items, n_items, min_sup):
+    """
+    Khai thác tập phổ biến cục bộ trên một phân vùng (pha 1 của SON).
+    Args:
+        offsets, items: Giao dịch của phân vùng dạng CSR trên mã item (offsets bắt đầu từ 0).
+        n_items (int): Số mã item.
+        min_sup (float): Ngưỡng hỗ trợ tối thiểu.
+    Returns:
+        list[tuple]: Các tập phổ biến cục bộ, mỗi tập là tuple mã item đã sắp xếp.
+    """
+    min_count = min_support_count(min_sup, len(offsets) - 1)
+    keep = np.flatnonzero(np.bincount(items, minlength=n_items) >= min_count)
+    bitmaps = code_bitmaps(offsets, items, n_items, keep)
+    return [
+        tuple(sorted(int(keep[position]) for position in itemset))
+        for itemset, _ in eclat(bitmaps, popcount(bitmaps), min_count)
+    ]
+
+
+def count_partition(offsets, items, n_items, candidates):
+    """
+    Đếm số giao dịch chứa từng ứng viên trên một phân vùng (pha 2 của SON).
+    Ứng viên một item được đếm bằng np.bincount (mỗi giao dịch không chứa item trùng lặp);
+    bitmap chỉ được tạo cho các item thuộc ứng viên dài từ 2 trở lên, nên số item đơn
+    (ví dụ cả biên âm gồm mọi item không phổ biến) không làm tăng bộ nhớ.
+    Returns:
+        np.ndarray: Số đếm theo đúng thứ tự của candidates.
+    """
+    counts = np.zeros(len(candidates), dtype=np.int64)
+    by_length = {}
+    for i, itemset in enumerate(candidates):
+        by_length.setdefault(len(itemset), []).append(i)
+
+    singles = by_length.pop(1, None)
+    if singles:
+        item_counts = np.bincount(items, minlength=n_items)
+        counts[singles] = item_counts[[candidates[i][0] for i in singles]]
+    if not by_length:
+        return counts
+
+    keep = np.unique([item for indices in by_length.values() for i in indices for item in candidates[i]]).astype(np.int64)
+    bitmaps = code_bitmaps(offsets, items, n_items, keep)
+    for indices in by_length.values():
+        positions = np.searchsorted(keep, np.array([candidates[i] for i in indices], dtype=np.int64))
+        counts[indices] = count_itemsets(bitmaps, positions)
+    return counts
+
+
+def son(offsets, items, n_items, min_sup, n_workers=None):
+    """
+    Khai thác tập phổ biến theo thuật toán SON trên nhiều tiến trình:
+    chia giao dịch thành các phân vùng, khai thác cục bộ song song, hợp các tập phổ biến
+    cục bộ thành ứng viên rồi đếm hỗ trợ toàn cục bằng một lượt đếm song song thứ hai.
+    Args:
+        offsets (np.ndarray): Giao dịch t gồm items[offsets[t]:offsets[t + 1]].
+        items (np.ndarray): Mã item của mọi giao dịch nối liền.
+        n_items (int): Số mã item.
+        min_sup (float): Ngưỡng hỗ trợ tối thiểu.
+        n_workers (int | None): Số tiến trình (mặc định bằng số lõi CPU).
+    Returns:
+        dict: tuple mã item đã sắp xếp -> số giao dịch hỗ trợ của các tập phổ biến toàn cục.
+    """
+    n_transactions = len(offsets) - 1
+    n_workers = n_workers or os.cpu_count() or 1
+    n_partitions = max(1, min(n_workers, n_transactions // MIN_PARTITION_SIZE))
+    bounds = np.linspace(0, n_transactions, n_partitions + 1).astype(int)
+    # Mỗi phân vùng chỉ gồm hai mảng số nguyên nên chi phí gửi sang tiến trình con rất nhỏ
+    partition_offsets = [offsets[bounds[i]:bounds[i + 1] + 1] - offsets[bounds[i]] for i in range(n_partitions)]
+    partition_items = [items[offsets[bounds[i]]:offsets[bounds[i + 1]]] for i in range(n_partitions)]
+
+    if n_partitions == 1:
+        candidates = mine_partition(offsets, items, n_items, min_sup)
+        counts = count_partition(offsets, items, n_items, candidates)
+    else:
+        with ProcessPoolExecutor(max_workers=n_partitions) as executor:
+            # Tập phổ biến toàn cục phải phổ biến cục bộ trên ít nhất một phân vùng
+            local_results = executor.map(
+                mine_partition, partition_offsets, partition_items,
+                [n_items] * n_partitions, [min_sup] * n_partitions,
+            )
+            candidates = list(set().union(*local_results))
+            counts = sum(executor.map(
+                count_partition, partition_offsets, partition_items,
+                [n_items] * n_partitions, [candidates] * n_partitions,
+            ))
+
+    return {
+        itemset: int(count)
+        for itemset, count in zip(candidates, counts)
+        if count / n_transactions >= min_sup
+    }
@@ -0,0 +1,92 @@
+import numpy as np
+from scipy.sparse import csc_matrix
+from models.eclat_model import pack_csc
+
+
+class SupersetIndex:
+    def __init__(self, itemsets, supports=None):
+        """
+        Chỉ mục đảo từ mỗi item sang bitmap các itemset chứa item đó.
+        Giao (AND) bitmap của các item trong X cho ra mọi tập cha của X,
+        nên câu hỏi "X có tập cha thực sự không?" không cần so sánh từng cặp.
+        Args:
+            itemsets (Iterable[frozenset]): Danh sách itemset cần đánh chỉ mục.
+            supports (Iterable[float | int] | None): Độ hỗ trợ (hoặc số giao dịch hỗ trợ) tương ứng; khi có, các itemset được
+                xếp theo độ hỗ trợ giảm dần để tra cứu hỗ trợ của tập cha lớn nhất bằng bit thấp nhất.
+        """
+        itemsets = list(itemsets)
+        if supports is not None:
+            supports = list(supports)
+            self.order = sorted(range(len(itemsets)), key=lambda i: (-supports[i], -len(itemsets[i])))
+            self.supports = [supports[i] for i in self.order]
+        else:
+            # Sắp xếp theo độ dài giảm dần: các tập dài hơn X luôn nằm ở các bit thấp
+            self.order = sorted(range(len(itemsets)), key=lambda i: -len(itemsets[i]))
+            self.supports = None
+        self.itemsets = [itemsets[i] for i in self.order]
+        lengths = np.array([len(itemset) for itemset in self.itemsets], dtype=np.int64)
+        # Bitmap các itemset có độ dài > k, với k = 0..độ dài lớn nhất
+        max_length = int(lengths.max()) if len(lengths) else 0
+        self.longer_masks = [self.to_bitmap(lengths > k) for k in range(max_length + 1)]
+
+        # Ma trận thưa (itemset x item) rồi đóng gói theo cột thành bitmap
+        self.item_position = {}
+        rows, columns = [], []
+        for position, itemset in enumerate(self.itemsets):
+            for item in itemset:
+                columns.append(self.item_position.setdefault(item, len(self.item_position)))
+                rows.append(position)
+        membership = csc_matrix(
+            (np.ones(len(rows), dtype=bool), (rows, columns)),
+            shape=(len(self.itemsets), len(self.item_position)),
+        )
+        # Bitmap dạng số nguyên Python: phép AND trên số lớn nhanh hơn lặp từng từ
+        self.item_bitmaps = [
+            int.from_bytes(row.astype("<u8").tobytes(), "little") for row in pack_csc(membership)
+        ]
+
+    @staticmethod
+    def to_bitmap(mask):
+        """Chuyển mặt nạ bool thành bitmap số nguyên (bit p ứng với phần tử p)."""
+        return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+    def longer_mask(self, length):
+        """Bitmap các itemset có độ dài lớn hơn length."""
+        if length >= len(self.longer_masks):
+            return 0
+        return self.longer_masks[length]
+
+    def supersets(self, itemset, mask=None):
+        """
+        Bitmap các itemset trong chỉ mục chứa itemset (kể cả chính nó).
+        Args:
+            itemset (Iterable): Itemset cần tra cứu.
+            mask (int | None): Chỉ giữ các bit nằm trong mask.
+        Returns:
+            int: Bitmap, bit p bật khi self.itemsets[p] là tập cha của itemset.
+        """
+        result = mask if mask is not None else (1 << len(self.itemsets)) - 1
+        for item in itemset:
+            position = self.item_position.get(item)
+            if position is None:
+                return 0
+            result &= self.item_bitmaps[position]
+            if not result:
+                return 0
+        return result
+
+    def has_proper_superset(self, itemset):
+        """Kiểm tra itemset có tập cha thực sự nào trong chỉ mục hay không."""
+        return self.supersets(itemset, self.longer_mask(len(itemset))) != 0
+
+    def support(self, itemset):
+        """
+        Độ hỗ trợ lớn nhất trong các tập cha của itemset (với tập đóng, đây chính là
+        độ hỗ trợ của itemset). Cần khởi tạo chỉ mục với supports.
+        Returns:
+            float | int | None: Độ hỗ trợ (cùng kiểu với supports), hoặc None nếu không có tập cha nào.
+        """
+        bits = self.supersets(itemset)
+        if not bits:
+            return None
+        return self.supports[(bits & -bits).bit_length() - 1]
@@ -42,13 +42,60 @@ class AprioriView(tk.Frame):
         threshold_frame.pack(pady=10, padx=20, fill="x")
 
         tk.Label(threshold_frame, text="min_sup:", bg="#F8F9FA").grid(row=0, column=0, padx=10, pady=5, sticky="w")
-        self.min_sup_entry = tk.Entry(threshold_frame, width=10)
-        self.min_sup_entry.grid(row=0, column=1, padx=10, pady=5)
+        min_sup_frame = tk.Frame(threshold_frame, bg="#F8F9FA")
+        min_sup_frame.grid(row=0, column=1, padx=10, pady=5)
+        self.min_sup_entry = tk.Entry(min_sup_frame, width=10)
+        self.min_sup_entry.pack(side="left")
+
+        # Khai thác xấp xỉ trên một mẫu ngẫu nhiên (Toivonen), kèm tỉ lệ lấy mẫu
+        self.sampling_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(min_sup_frame, text="Lấy mẫu", variable=self.sampling_var, bg="#F8F9FA").pack(side="left", padx=(10, 0))
+        self.sample_fraction_entry = tk.Entry(min_sup_frame, width=5)
+        self.sample_fraction_entry.insert(0, "0.1")
+        self.sample_fraction_entry.pack(side="left")
 
         tk.Label(threshold_frame, text="min_conf:", bg="#F8F9FA").grid(row=0, column=2, padx=10, pady=5, sticky="w")
         self.min_conf_entry = tk.Entry(threshold_frame, width=10)
         self.min_conf_entry.grid(row=0, column=3, padx=10, pady=5)
 
+        # Combobox chọn thuật toán khai thác tập phổ biến
+        tk.Label(threshold_frame, text="Thuật toán:", bg="#F8F9FA").grid(row=0, column=4, padx=10, pady=5, sticky="w")
+        self.algorithm_combobox = ttk.Combobox(threshold_frame, state="readonly", width=16)
+        self.algorithm_combobox['values'] = ['Apriori', 'FP-Growth', 'Eclat', 'SON (song song)']
+        self.algorithm_combobox.grid(row=0, column=5, padx=10, pady=5)
+        self.algorithm_combobox.current(0)  # Chọn "Apriori" làm mặc định
+
+        # Sinh luật từ tập phổ biến đóng thay vì toàn bộ tập phổ biến
+        self.closed_rules_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(threshold_frame, text="Sinh luật từ tập đóng", variable=self.closed_rules_var, bg="#F8F9FA").grid(row=0, column=6, padx=10, pady=5, sticky="w")
+
+        # Chế độ top-k: tìm k tập phổ biến nhất thay vì dùng min_sup, có thể giới hạn độ dài
+        top_k_frame = tk.Frame(threshold_frame, bg="#F8F9FA")
+        top_k_frame.grid(row=2, column=0, columnspan=7, padx=10, pady=5, sticky="w")
+        self.top_k_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(top_k_frame, text="Top-k, k =", variable=self.top_k_var, bg="#F8F9FA").pack(side="left")
+        self.top_k_entry = tk.Entry(top_k_frame, width=6)
+        self.top_k_entry.insert(0, "10")
+        self.top_k_entry.pack(side="left")
+        tk.Label(top_k_frame, text="Độ dài từ:", bg="#F8F9FA").pack(side="left", padx=(10, 0))
+        self.min_len_entry = tk.Entry(top_k_frame, width=4)
+        self.min_len_entry.insert(0, "1")
+        self.min_len_entry.pack(side="left")
+        tk.Label(top_k_frame, text="đến:", bg="#F8F9FA").pack(side="left")
+        self.max_len_entry = tk.Entry(top_k_frame, width=4)
+        self.max_len_entry.pack(side="left")
+
+        # Gợi ý item cho giỏ hàng từ các luật đã sinh
+        tk.Label(threshold_frame, text="Giỏ hàng:", bg="#F8F9FA").grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.basket_entry = tk.Entry(threshold_frame, width=30)
+        self.basket_entry.grid(row=1, column=1, columnspan=3, padx=10, pady=5, sticky="w")
+        tk.Label(threshold_frame, text="Xếp theo:", bg="#F8F9FA").grid(row=1, column=4, padx=10, pady=5, sticky="w")
+        self.recommend_metric_combobox = ttk.Combobox(threshold_frame, state="readonly", width=16)
+        self.recommend_metric_combobox['values'] = ['Độ Tin Cậy', 'Lift']
+        self.recommend_metric_combobox.grid(row=1, column=5, padx=10, pady=5)
+        self.recommend_metric_combobox.current(0)
+        tk.Button(threshold_frame, text="Gợi Ý", bg="#007BFF", fg="white", command=self.controller.recommend).grid(row=1, column=6, padx=10, pady=5, sticky="w")
+
     def init_treeview_section(self):
         """Khu vực TreeView cho dữ liệu và kết quả."""
         # Dữ liệu ban đầu
@@ -63,6 +110,9 @@ class AprioriView(tk.Frame):
         # Tập phổ biến tối đại
         self.add_treeview_section("Tập Phổ Biến Tối Đại", "maximal_tree")
 
+        # Tập phổ biến đóng
+        self.add_treeview_section("Tập Phổ Biến Đóng", "closed_tree")
+
         # Luật kết hợp
         self.add_treeview_section("Luật Kết Hợp", "rules_tree")
 
@@ -90,7 +140,9 @@ class AprioriView(tk.Frame):
         button_frame.pack(pady=10)
 
         tk.Button(button_frame, text="Tìm Tập Phổ Biến", bg="#007BFF", fg="white", command=self.controller.find_frequent_itemsets).pack(side="left", padx=10)
+        tk.Button(button_frame, text="Thêm Giao Dịch", bg="#007BFF", fg="white", command=self.controller.append_transactions).pack(side="left", padx=10)
         tk.Button(button_frame, text="Tìm Tập Phổ Biến Tối Đại", bg="#007BFF", fg="white", command=self.controller.find_maximal_itemsets).pack(side="left", padx=10)
+        tk.Button(button_frame, text="Tìm Tập Phổ Biến Đóng", bg="#007BFF", fg="white", command=self.controller.find_closed_itemsets).pack(side="left", padx=10)
         tk.Button(button_frame, text="Sinh Luật Kết Hợp", bg="#007BFF", fg="white", command=self.controller.generate_rules).pack(side="left", padx=10)
         tk.Button(button_frame, text="Reset", bg="#DC3545", fg="white", command=self.controller.reset).pack(side="left", padx=10)
         tk.Button(button_frame, text="Quay Lại Menu", bg="#DC3545", fg="white", command=self.controller.go_back_to_menu).pack(side="left", padx=10)
@@ -10,6 +10,7 @@ class ID3View(tk.Frame):
         """
         super().__init__(root, bg="#F8F9FA")
         self.controller = controller
+        self.max_image_size = 4000  # Ảnh biểu đồ lớn hơn (pixel) được hiển thị theo ô trên Canvas cuộn được
         self.init_ui()
 
     def init_ui(self):
@@ -65,6 +66,33 @@ class ID3View(tk.Frame):
         self.method_combobox.grid(row=0, column=1, padx=10, pady=5)
         self.method_combobox.current(0)  # Chọn "Gain" làm mặc định
 
+        # Combobox chọn cách chia thuộc tính số
+        tk.Label(method_frame, text="Thuộc Tính Số:", bg="#F8F9FA").grid(row=0, column=2, padx=10, pady=5, sticky="w")
+        self.numeric_combobox = ttk.Combobox(method_frame, state="readonly", width=20)
+        self.numeric_combobox['values'] = ['Phân loại', 'Ngưỡng (C4.5)', 'Histogram']
+        self.numeric_combobox.grid(row=0, column=3, padx=10, pady=5)
+        self.numeric_combobox.current(0)  # Mặc định mỗi giá trị một nhánh như trước; chia theo ngưỡng phải chọn
+
+        # Điều kiện dừng khi dựng cây (để trống độ sâu = không giới hạn)
+        tk.Label(method_frame, text="Độ Sâu Tối Đa:", bg="#F8F9FA").grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.max_depth_entry = tk.Entry(method_frame, width=23)
+        self.max_depth_entry.grid(row=1, column=1, padx=10, pady=5)
+        tk.Label(method_frame, text="Số Mẫu Tối Thiểu:", bg="#F8F9FA").grid(row=1, column=2, padx=10, pady=5, sticky="w")
+        self.min_samples_entry = tk.Entry(method_frame, width=23)
+        self.min_samples_entry.insert(0, "2")
+        self.min_samples_entry.grid(row=1, column=3, padx=10, pady=5)
+        tk.Label(method_frame, text="Gain Tối Thiểu:", bg="#F8F9FA").grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        self.min_gain_entry = tk.Entry(method_frame, width=23)
+        self.min_gain_entry.insert(0, "0")
+        self.min_gain_entry.grid(row=2, column=1, padx=10, pady=5)
+
+        # Combobox chọn cách cắt tỉa sau khi dựng cây
+        tk.Label(method_frame, text="Cắt Tỉa:", bg="#F8F9FA").grid(row=2, column=2, padx=10, pady=5, sticky="w")
+        self.pruning_combobox = ttk.Combobox(method_frame, state="readonly", width=20)
+        self.pruning_combobox['values'] = ['Không', 'Bi quan (C4.5)', 'Giảm lỗi']
+        self.pruning_combobox.grid(row=2, column=3, padx=10, pady=5)
+        self.pruning_combobox.current(0)
+
     def init_result_section(self):
         """Khu vực kết quả tính toán."""
         result_frame = tk.LabelFrame(self, text="Kết Quả Tính Toán", bg="#F8F9FA")
@@ -96,6 +124,8 @@ class ID3View(tk.Frame):
         button_frame.pack(pady=10)
 
         tk.Button(button_frame, text="Phân Tích", bg="#2182f0", fg="white", command=lambda: self.controller.train_model(self.method_combobox.get())).pack(side="left", padx=10)
+        tk.Button(button_frame, text="Lưu Mô Hình", bg="#2182f0", fg="white", command=self.controller.save_model).pack(side="left", padx=10)
+        tk.Button(button_frame, text="Tải Mô Hình", bg="#2182f0", fg="white", command=self.controller.load_model).pack(side="left", padx=10)
         tk.Button(button_frame, text="Reset", bg="#DC3545", fg="white", command=self.controller.reset).pack(side="left", padx=10)
         tk.Button(button_frame, text="Quay Lại", bg="#DC3545", fg="white", command=self.controller.go_back_to_menu).pack(side="left", padx=10)
 
@@ -126,6 +156,9 @@ class ID3View(tk.Frame):
 
         # Tạo hình ảnh từ dữ liệu nhị phân
         image = Image.open(io.BytesIO(graph_data))
+        if max(image.size) > self.max_image_size:
+            self.display_tiled_graph(image)
+            return
         photo = ImageTk.PhotoImage(image)
 
         # Hiển thị hình ảnh trên Label
@@ -133,6 +166,31 @@ class ID3View(tk.Frame):
         label.image = photo  # Giữ tham chiếu để không bị garbage collect
         label.pack(padx=10, pady=5)
 
+    def display_tiled_graph(self, image, tile_size=1024):
+        """
+        Hiển thị ảnh biểu đồ rất lớn trên Canvas có thanh cuộn, cắt thành các ô nhỏ
+        thay vì một PhotoImage khổng lồ.
+        Args:
+            image (PIL.Image.Image): Ảnh biểu đồ.
+            tile_size (int): Kích thước cạnh mỗi ô (pixel).
+        """
+        width, height = image.size
+        canvas = tk.Canvas(self.graph_frame, bg="#F8F9FA", width=min(width, 1400), height=min(height, 700),
+                           scrollregion=(0, 0, width, height), highlightthickness=0)
+        x_scrollbar = ttk.Scrollbar(self.graph_frame, orient="horizontal", command=canvas.xview)
+        y_scrollbar = ttk.Scrollbar(self.graph_frame, orient="vertical", command=canvas.yview)
+        canvas.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+        y_scrollbar.pack(side="right", fill="y")
+        x_scrollbar.pack(side="bottom", fill="x")
+        canvas.pack(side="left", fill="both", expand=True)
+
+        canvas.tiles = []  # Giữ tham chiếu để không bị garbage collect
+        for top in range(0, height, tile_size):
+            for left in range(0, width, tile_size):
+                tile = ImageTk.PhotoImage(image.crop((left, top, min(left + tile_size, width), min(top + tile_size, height))))
+                canvas.create_image(left, top, anchor="nw", image=tile)
+                canvas.tiles.append(tile)
+
     def update_log(self, message):
         """Cập nhật log."""
         self.log_label.config(text=f"Log: {message}")
@@ -152,6 +210,13 @@ class ID3View(tk.Frame):
 
         # Reset Combobox về giá trị mặc định
         self.method_combobox.current(0)
+        self.numeric_combobox.current(0)
+        self.pruning_combobox.current(0)
+        self.max_depth_entry.delete(0, "end")
+        self.min_samples_entry.delete(0, "end")
+        self.min_samples_entry.insert(0, "2")
+        self.min_gain_entry.delete(0, "end")
+        self.min_gain_entry.insert(0, "0")
 
         # Xóa Log
         self.log_label.config(text="Log:")
@@ -74,6 +74,10 @@ class NaiveBayesView(tk.Frame):
         tk.Label(column_frame, text="Cột Mục Tiêu:", bg="#F8F9FA").grid(row=0, column=3, padx=10, pady=5, sticky="w")
         self.target_combobox = ttk.Combobox(column_frame, state="readonly")
         self.target_combobox.grid(row=1, column=3, padx=10, pady=5)
+
+        # Tùy chọn làm trơn Laplace
+        self.laplace_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(column_frame, text="Làm trơn Laplace", variable=self.laplace_var, bg="#F8F9FA").grid(row=2, column=3, padx=10, pady=5, sticky="w")
         
 
 
@@ -103,6 +107,9 @@ class NaiveBayesView(tk.Frame):
         """Thêm các nút điều khiển."""
         tk.Button(self, text="Cập Nhật Mẫu", bg="#2182f0", fg="white", command=self.controller.update_sample_inputs).pack(pady=10)
         tk.Button(self, text="Phân Loại", bg="#2182f0", fg="white", command=self.controller.classify_sample).pack(pady=10)
+        tk.Button(self, text="Phân Loại File", bg="#2182f0", fg="white", command=self.controller.classify_file).pack(pady=10)
+        tk.Button(self, text="Lưu Mô Hình", bg="#2182f0", fg="white", command=self.controller.save_model).pack(pady=10)
+        tk.Button(self, text="Tải Mô Hình", bg="#2182f0", fg="white", command=self.controller.load_model).pack(pady=10)
         tk.Button(self, text="Reset", bg="#DC3545", fg="white", command=self.controller.reset_data).pack(pady=10)
         tk.Button(self, text="Quay lại Menu", bg="#DC3545", fg="white", command=self.controller.go_back_to_menu).pack(pady=10)
 
@@ -144,6 +151,11 @@ class NaiveBayesView(tk.Frame):
         """Hiển thị kết quả phân loại."""
         self.result_text.delete(1.0, "end")
         self.result_text.insert("end", f"Kết Quả: {result}\n")
+
+    def show_batch_result(self, summary):
+        """Hiển thị tóm tắt kết quả phân loại cả file."""
+        self.result_text.delete(1.0, "end")
+        self.result_text.insert("end", f"{summary}\n")
         
     
 
@@ -0,0 +1,64 @@
+"""
+So sánh thời gian khai thác tập phổ biến giữa Apriori, FP-Growth và Eclat
+trên các tập giao dịch tổng hợp có kích thước tăng dần.
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_apriori_engines.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.apriori_model import AprioriModel
+
+
+def make_baskets(n_transactions, n_items=200, avg_len=10, seed=0):
+    """Sinh dữ liệu giao dịch dạng (ID, items) với tần suất item theo phân phối Zipf."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, n_items + 1)
+    weights /= weights.sum()
+    rows = []
+    for tid in range(n_transactions):
+        size = max(1, rng.poisson(avg_len))
+        items = rng.choice(n_items, size=min(size, n_items), replace=False, p=weights)
+        rows.extend((tid, f"i{item}") for item in items)
+    return pd.DataFrame(rows, columns=["ID", "items"])
+
+
+def run(algorithm, data, min_sup):
+    """Chạy một thuật toán và trả về (thời gian, kết quả)."""
+    model = AprioriModel()
+    model.set_params(min_sup, None)
+    model.set_algorithm(algorithm)
+    model.prepare_transactions(data)
+    binary_matrix = model.generate_binary_matrix()
+    start = time.perf_counter()
+    result = model.find_frequent_itemsets(binary_matrix)
+    return time.perf_counter() - start, result
+
+
+def main():
+    algorithms = AprioriModel.ALGORITHMS
+    print(f"{'min_sup':>8} {'giao dịch':>10} " + " ".join(f"{a + ' (s)':>13}" for a in algorithms)
+          + f" {'số tập':>8} {'khớp':>6}")
+    for min_sup in (0.02, 0.01):
+        for n_transactions in (1_000, 5_000, 20_000):
+            data = make_baskets(n_transactions, avg_len=15)
+            timings, results = zip(*(run(algorithm, data, min_sup) for algorithm in algorithms))
+            reference = results[0]
+            same = all(
+                result["itemsets"].tolist() == reference["itemsets"].tolist()
+                and np.allclose(result["support"], reference["support"])
+                for result in results[1:]
+            )
+            print(f"{min_sup:>8} {n_transactions:>10} " + " ".join(f"{t:>13.3f}" for t in timings)
+                  + f" {len(reference):>8} {str(same):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Đo thời gian huấn luyện ID3Forest theo số tiến trình và so sánh độ chính xác
+của rừng với một cây ID3 đơn.
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_id3_forest.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.id3_forest import ID3Forest
+from models.id3_model import ID3Model
+from benchmark_id3_numeric import make_numeric_table
+
+
+def main():
+    train, test = make_numeric_table(20_000, n_features=10), make_numeric_table(20_000, n_features=10, seed=1)
+    expected = test["label"].to_numpy()
+    features = test.drop(columns=["label"])
+
+    model = ID3Model()
+    model.set_numeric_splits()
+    start = time.perf_counter()
+    model.build_tree_and_store(train, "label", "gain")
+    accuracy = np.mean(model.predict_batch(features) == expected)
+    print(f"Một cây ID3: {time.perf_counter() - start:6.2f} s | độ chính xác {accuracy:.3f}")
+
+    print(f"Số lõi CPU: {os.cpu_count()}")
+    baseline = None
+    for n_jobs in (1, 2, 4, 8):
+        forest = ID3Forest(n_estimators=32, n_jobs=n_jobs, seed=0)
+        start = time.perf_counter()
+        forest.fit(train, "label")
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        start = time.perf_counter()
+        accuracy = np.mean(forest.predict_batch(features) == expected)
+        predict_time = time.perf_counter() - start
+        print(f"Rừng 32 cây, {n_jobs} tiến trình: huấn luyện {elapsed:6.2f} s (tăng tốc {baseline / elapsed:4.2f}x)"
+              f" | dự đoán {predict_time:5.2f} s | độ chính xác {accuracy:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+So sánh bộ nhớ cấp phát (tracemalloc) và thời gian dựng cây giữa ID3Model.build_tree
+(sao chép DataFrame ở mỗi nhánh) và ID3Model.build_tree_indexed (mảng chỉ số hàng).
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_id3_memory.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.id3_model import ID3Model
+
+
+def make_table(n_rows, n_features=10, noise=0.1, seed=0):
+    """Bảng phân loại ngẫu nhiên: nhãn phụ thuộc hai thuộc tính đầu, có nhiễu để cây đủ sâu."""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        f"f{i}": rng.choice(list("abcdef")[: 2 + i % 5], n_rows) for i in range(n_features)
+    })
+    data["label"] = np.where(
+        (data["f0"] == "a") ^ (data["f1"] == "b") ^ (rng.random(n_rows) < noise), "yes", "no"
+    )
+    return data
+
+
+def measure(build, data):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = build(data, "label", "gain")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, elapsed, peak / 2**20
+
+
+def count_nodes(tree):
+    if not isinstance(tree, dict):
+        return 1
+    return 1 + sum(count_nodes(child) for branches in tree.values() for child in branches.values())
+
+
+def main():
+    for n_rows, n_features in ((5_000, 10), (20_000, 10), (10_000, 40)):
+        data = make_table(n_rows, n_features)
+        model = ID3Model()
+        old_tree, old_time, old_peak = measure(model.build_tree, data)
+        new_tree, new_time, new_peak = measure(model.build_tree_indexed, data)
+        print(
+            f"{n_rows:>7} x {n_features:<3} {count_nodes(new_tree):>5} nút | build_tree: {old_time:7.2f} s, "
+            f"đỉnh {old_peak:8.1f} MiB | build_tree_indexed: {new_time:6.2f} s, đỉnh {new_peak:7.1f} MiB"
+            f" | giống nhau: {old_tree == new_tree}"
+        )
+
+
+if __name__ == "__main__":
+    main()
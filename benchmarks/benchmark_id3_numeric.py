@@ -0,0 +1,42 @@
+"""
+So sánh cây ID3 trên dữ liệu có thuộc tính liên tục: mỗi giá trị một nhánh ("categorical")
+với chia nhị phân theo ngưỡng ("threshold") và theo khoảng phân vị ("histogram").
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_id3_numeric.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.id3_model import ID3Model
+from benchmark_id3_memory import count_nodes
+
+
+def make_numeric_table(n_rows, n_features=5, noise=0.05, seed=0):
+    """Bảng có các thuộc tính số thực: nhãn phụ thuộc ngưỡng trên hai thuộc tính đầu, có nhiễu."""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({f"x{i}": rng.normal(size=n_rows).round(4) for i in range(n_features)})
+    data["label"] = np.where((data["x0"] > 0.3) ^ (data["x1"] < -0.5) ^ (rng.random(n_rows) < noise), "yes", "no")
+    return data
+
+
+def main():
+    train, test = make_numeric_table(20_000), make_numeric_table(20_000, seed=1)
+    for mode in ("categorical", "threshold", "histogram"):
+        model = ID3Model()
+        model.set_numeric_splits(mode, n_bins=64)
+        start = time.perf_counter()
+        tree = model.build_tree_and_store(train, "label", "gain")
+        elapsed = time.perf_counter() - start
+        accuracy = np.mean(model.predict_batch(test.drop(columns=["label"])) == test["label"].to_numpy())
+        print(f"{mode:<12} {elapsed:7.2f} s | {count_nodes(tree):>7} nút | độ chính xác trên tập kiểm tra: {accuracy:.3f}")
+
+
+if __name__ == "__main__":
+    main()
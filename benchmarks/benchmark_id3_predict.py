@@ -0,0 +1,54 @@
+"""
+Đo thông lượng dự đoán (hàng/giây) của ID3Model.predict_batch (cây biên dịch thành mảng)
+so với duyệt cây từ điển cho từng hàng.
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_id3_predict.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.id3_model import ID3Model
+from benchmark_id3_memory import make_table
+
+
+def predict_row(tree, row):
+    """Duyệt cây từ điển cho một bản ghi (None nếu gặp giá trị chưa thấy)."""
+    while isinstance(tree, dict):
+        (feature, branches), = tree.items()
+        if row[feature] not in branches:
+            return None
+        tree = branches[row[feature]]
+    return tree
+
+
+def main():
+    model = ID3Model()
+    train = make_table(20_000)
+    tree = model.build_tree_and_store(train, "label", "gain")
+    start = time.perf_counter()
+    model.compile_tree(tree, train, "label")
+    print(f"Biên dịch {len(model.compiled.node_feature)} nút: {time.perf_counter() - start:.3f} s")
+
+    for n_rows in (10_000, 1_000_000):
+        data = make_table(n_rows, seed=1).drop(columns=["label"])
+        start = time.perf_counter()
+        predictions = model.predict_batch(data, fallback=None)
+        batch = n_rows / (time.perf_counter() - start)
+
+        sample = data.iloc[:10_000]
+        start = time.perf_counter()
+        reference = [predict_row(tree, row) for row in sample.to_dict("records")]
+        per_row = len(sample) / (time.perf_counter() - start)
+        same = np.array_equal(predictions[:len(sample)], np.array(reference, dtype=object))
+        print(f"{n_rows:>9} hàng: predict_batch {batch:>12,.0f} hàng/s | duyệt từng hàng {per_row:>10,.0f} hàng/s"
+              f" | khớp: {same}")
+
+
+if __name__ == "__main__":
+    main()
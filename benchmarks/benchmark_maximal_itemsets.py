@@ -0,0 +1,58 @@
+"""
+So sánh cách tìm tập phổ biến tối đại cũ (so sánh từng cặp) với chỉ mục tập cha
+khi số tập phổ biến tăng dần.
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_maximal_itemsets.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.apriori_model import AprioriModel
+from benchmark_apriori_engines import make_baskets
+
+# Cách cũ là O(n^2): bỏ qua khi số tập phổ biến vượt ngưỡng này
+PAIRWISE_LIMIT = 10_000
+
+
+def maximal_pairwise(frequent_itemsets):
+    """Cách làm trước đây: so sánh mọi cặp itemset bằng phép tập con thực sự."""
+    maximal_itemsets = frequent_itemsets.copy()
+    maximal_itemsets['is_subset'] = maximal_itemsets['itemsets'].apply(
+        lambda itemset: any(
+            itemset < other for other in maximal_itemsets['itemsets'] if itemset != other
+        )
+    )
+    return maximal_itemsets[~maximal_itemsets['is_subset']].drop(columns=['is_subset'])
+
+
+def main():
+    data = make_baskets(20_000, avg_len=15)
+    print(f"{'min_sup':>8} {'số tập':>8} {'tối đại':>8} {'từng cặp (s)':>13} {'chỉ mục (s)':>12} {'khớp':>6}")
+    for min_sup in (0.05, 0.03, 0.02, 0.01, 0.005):
+        model = AprioriModel()
+        model.set_params(min_sup, None)
+        model.set_algorithm("eclat")
+        model.prepare_transactions(data)
+        model.find_frequent_itemsets(model.generate_binary_matrix(sparse=True))
+
+        start = time.perf_counter()
+        maximal = model.find_maximal_frequent_itemsets()
+        t_index = time.perf_counter() - start
+
+        if len(model.frequent_itemsets) <= PAIRWISE_LIMIT:
+            start = time.perf_counter()
+            expected = maximal_pairwise(model.frequent_itemsets)
+            t_pairwise = f"{time.perf_counter() - start:.3f}"
+            same = str(expected.equals(maximal))
+        else:
+            t_pairwise, same = "-", "-"
+        print(f"{min_sup:>8} {len(model.frequent_itemsets):>8} {len(maximal):>8} "
+              f"{t_pairwise:>13} {t_index:>12.3f} {same:>6}")
+
+
+if __name__ == "__main__":
+    main()
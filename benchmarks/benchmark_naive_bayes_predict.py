@@ -0,0 +1,44 @@
+"""
+Đo thông lượng dự đoán (hàng/giây) của NaiveBayesModel.predict_batch (tra bảng log xác suất
+theo mã giá trị) so với predict() cho từng hàng.
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_naive_bayes_predict.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.naive_bayes_model import NaiveBayesModel
+from benchmark_naive_bayes_fit import make_categorical_table
+
+
+def main():
+    train = make_categorical_table(100_000)
+    model = NaiveBayesModel(laplace_smoothing=True)
+    model.fit(train.drop(columns=["label"]), train["label"])
+    start = time.perf_counter()
+    model.compile_tables()
+    print(f"Chuẩn bị bảng tra cứu: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    for n_rows in (10_000, 1_000_000):
+        data = make_categorical_table(n_rows, seed=1).drop(columns=["label"])
+        start = time.perf_counter()
+        labels, _ = model.predict_batch(data)
+        batch = n_rows / (time.perf_counter() - start)
+
+        sample = data.iloc[:10_000]
+        start = time.perf_counter()
+        reference = [model.predict(row) for row in sample.to_dict("records")]
+        per_row = len(sample) / (time.perf_counter() - start)
+        same = np.array_equal(labels[:len(sample)], np.array(reference, dtype=object))
+        print(f"{n_rows:>9} hàng: predict_batch {batch:>12,.0f} hàng/s | predict từng hàng {per_row:>10,.0f} hàng/s"
+              f" | khớp: {same}")
+
+
+if __name__ == "__main__":
+    main()
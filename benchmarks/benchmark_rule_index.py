@@ -0,0 +1,53 @@
+"""
+Đo số truy vấn gợi ý mỗi giây (QPS) của RuleIndex, truy vấn đơn lẻ và theo lô.
+
+Chạy từ thư mục gốc dự án:
+    python benchmarks/benchmark_rule_index.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from models.apriori_model import AprioriModel
+from benchmark_apriori_engines import make_baskets
+
+
+def main():
+    data = make_baskets(20_000, avg_len=12)
+    model = AprioriModel()
+    model.set_params(0.005, 0.2)
+    model.set_algorithm("eclat")
+    model.prepare_transactions(data)
+    model.find_frequent_itemsets(model.generate_binary_matrix(sparse=True))
+    model.generate_rules_native()
+    model.rules_to_frame()
+
+    start = time.perf_counter()
+    index = model.build_rule_index()
+    print(f"Số luật: {index.n_rules}, tạo chỉ mục: {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(1)
+    baskets = [
+        [f"i{item}" for item in rng.choice(60, size=rng.integers(1, 6), replace=False)]
+        for _ in range(5_000)
+    ]
+    for metric in index.METRICS:
+        start = time.perf_counter()
+        for basket in baskets[:1_000]:
+            index.recommend(basket, k=5, metric=metric)
+        single = 1_000 / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(0, len(baskets), 500):
+            index.recommend_batch(baskets[i:i + 500], k=5, metric=metric)
+        batch = len(baskets) / (time.perf_counter() - start)
+        print(f"{metric:>10}: đơn lẻ {single:>10.0f} QPS ({1e6 / single:.1f} µs/truy vấn), "
+              f"theo lô {batch:>10.0f} QPS")
+
+
+if __name__ == "__main__":
+    main()
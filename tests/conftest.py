@@ -0,0 +1,61 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from mlxtend.frequent_patterns import apriori
+from scipy.sparse import csr_matrix
+
+# Các module của ứng dụng được import theo dạng "from models.x import Y" (thư mục gốc là app/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+
+def make_random_csr(seed, n_transactions=300, n_items=40):
+    """Giao dịch ngẫu nhiên dạng CSR (item trong mỗi giao dịch đã sắp xếp, không trùng lặp)."""
+    rng = np.random.default_rng(seed)
+    popularity = 1 / np.arange(1, n_items + 1)
+    rows = [np.flatnonzero(rng.random(n_items) < 0.6 * popularity) for _ in range(n_transactions)]
+    offsets = np.concatenate(([0], np.cumsum([len(row) for row in rows]))).astype(np.int64)
+    return offsets, np.concatenate(rows).astype(np.int32), rows
+
+
+@pytest.fixture
+def random_csr():
+    """Hàm sinh giao dịch ngẫu nhiên dạng CSR: random_csr(seed, n_transactions=300, n_items=40)."""
+    return make_random_csr
+
+
+def mlxtend_apriori_counts(offsets, items, n_items, min_sup):
+    """Tập phổ biến của mlxtend.apriori (cách khai thác gốc) dạng tuple mã item -> số giao dịch hỗ trợ."""
+    n_transactions = len(offsets) - 1
+    matrix = csr_matrix((np.ones(len(items), dtype=bool), items, offsets), shape=(n_transactions, n_items))
+    result = apriori(pd.DataFrame(matrix.toarray()), min_support=min_sup, use_colnames=True)
+    return {
+        tuple(sorted(int(item) for item in itemset)): int(round(support * n_transactions))
+        for itemset, support in zip(result["itemsets"], result["support"])
+    }
+
+
+@pytest.fixture
+def apriori_counts():
+    """Kết quả tham chiếu của mlxtend.apriori trên giao dịch CSR: apriori_counts(offsets, items, n_items, min_sup)."""
+    return mlxtend_apriori_counts
+
+
+def make_random_transactions(seed, n_transactions=12, n_items=5, density=0.7):
+    """Giao dịch ngẫu nhiên nhỏ: số giao dịch ít nên nhiều luật có độ tin cậy đúng bằng một phân số đơn giản."""
+    rng = np.random.default_rng(seed)
+    rows = [
+        (f"o{t}", f"i{item}")
+        for t in range(n_transactions)
+        for item in range(n_items)
+        if rng.random() < density
+    ]
+    return pd.DataFrame(rows, columns=["ID", "items"])
+
+
+@pytest.fixture
+def random_transactions():
+    """Hàm sinh giao dịch ngẫu nhiên dạng (ID, items): random_transactions(seed, n_transactions, n_items, density)."""
+    return make_random_transactions
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.compiled_tree import CompiledTree
+from models.id3_forest import ID3Forest
+from models.id3_model import ID3Model
+
+
+def skewed_leaves(n_rare=2):
+    """Một lá 'yes' có 1000 mẫu và n_rare lá 'no' mỗi lá 1 mẫu."""
+    rare = [f"a{i}" for i in range(2, n_rare + 2)]
+    return pd.DataFrame({"A": ["a1"] * 1000 + rare, "label": ["yes"] * 1000 + ["no"] * n_rare})
+
+
+def test_unseen_value_falls_back_to_label_with_most_training_samples(tmp_path):
+    model = ID3Model()
+    tree = model.build_tree_and_store(skewed_leaves(), "label", "gain")
+    unseen = pd.DataFrame({"A": ["a4", "a2"]})
+    assert model.predict_batch(unseen).tolist() == ["yes", "no"]
+    assert model.predict_batch(unseen, fallback=None).tolist() == [None, "no"]
+    # Không có dữ liệu huấn luyện: nhãn xuất hiện ở nhiều lá nhất
+    assert CompiledTree(tree).predict(unseen).tolist() == ["no", "no"]
+
+    model.save_model(tmp_path / "tree.dmm")
+    loaded = ID3Model()
+    loaded.load_model(tmp_path / "tree.dmm")
+    assert loaded.predict_batch(unseen).tolist() == ["yes", "no"]
+
+
+def test_class_counts_follow_the_training_partition():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=1500)
+    x[rng.random(1500) < 0.05] = np.nan
+    data = pd.DataFrame({"x": x, "c": rng.choice(list("abc"), 1500)})
+    data["label"] = np.where((np.nan_to_num(x) > 0.3) ^ (data["c"] == "a"), "p", "q")
+    model = ID3Model()
+    model.set_numeric_splits("threshold")
+    model.set_growth_limits(max_depth=5)
+    tree = model.build_tree_and_store(data, "label", "gain")
+
+    compiled = CompiledTree(tree, data, "label")
+    counts = compiled.class_counts(data, "label")
+    assert counts[0].sum() == len(data)
+    for node in np.flatnonzero(compiled.node_feature >= 0):
+        children = compiled.child_nodes[compiled.child_offsets[node]:compiled.child_offsets[node + 1]]
+        assert (counts[children].sum(axis=0) == counts[node]).all()
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_forest_fallback_uses_bootstrap_counts(n_jobs):
+    forest = ID3Forest(n_estimators=3, max_features=None, n_jobs=n_jobs, seed=0).fit(skewed_leaves(8), "label")
+    assert forest.predict_batch(pd.DataFrame({"A": ["unseen"]})).tolist() == ["yes"]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.apriori_model import AprioriModel
+from models.fup_model import fup_update
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fup_update_matches_full_mining(seed, random_csr, apriori_counts):
+    old_offsets, old_items, _ = random_csr(seed, n_transactions=300)
+    # Lô mới ưu tiên các item hiếm của dữ liệu cũ để buộc phải quét lại
+    new_offsets, new_items, _ = random_csr(seed + 100, n_transactions=80)
+    new_items = (39 - new_items).astype(np.int32)
+    sorted_rows = [np.sort(new_items[start:end]) for start, end in zip(new_offsets[:-1], new_offsets[1:])]
+    new_items = np.concatenate(sorted_rows).astype(np.int32)
+
+    old_counts = apriori_counts(old_offsets, old_items, 40, 0.05)
+    counts, rescanned = fup_update(old_counts, (old_offsets, old_items), (new_offsets, new_items), 40, 0.05)
+
+    offsets = np.concatenate((old_offsets, new_offsets[1:] + old_offsets[-1]))
+    items = np.concatenate((old_items, new_items))
+    assert counts == apriori_counts(offsets, items, 40, 0.05)
+    assert rescanned > 0
+
+
+def test_length_limited_top_k_is_not_updated_incrementally():
+    # a, b có trong cả 10 giao dịch; c trong 5, d trong 5 giao dịch còn lại
+    rows = [(f"o{t}", item) for t in range(10) for item in ("a", "b", "c" if t < 5 else "d")]
+    model = AprioriModel()
+    model.prepare_transactions(pd.DataFrame(rows, columns=["ID", "items"]))
+    top_k = model.find_top_k_itemsets(4, 1, 1)
+    assert set(top_k["itemsets"]) == {frozenset(item) for item in "abcd"}
+    # Kết quả bị cắt theo độ dài không được dùng làm tập phổ biến hiện tại
+    assert model.frequent_itemsets is None
+    with pytest.raises(ValueError):
+        model.update_frequent_itemsets(pd.DataFrame([("n0", "c"), ("n1", "d")], columns=["ID", "items"]))
+
+
+def test_complete_top_k_is_updated_incrementally():
+    rows = [(f"o{t}", item) for t in range(10) for item in ("a", "b", "c" if t < 5 else "d")]
+    model = AprioriModel()
+    model.prepare_transactions(pd.DataFrame(rows, columns=["ID", "items"]))
+    model.find_top_k_itemsets(4)
+    updated = model.update_frequent_itemsets(pd.DataFrame([("n0", "c"), ("n1", "d")], columns=["ID", "items"]))
+    assert frozenset("ab") in set(updated["itemsets"])
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.id3_model import ID3Model
+
+
+def table_with_missing(n_rows=2000, seed=0):
+    """Nhãn 'missing' đúng khi x thiếu giá trị; ngoài ra nhãn phụ thuộc ngưỡng x > 0."""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n_rows).round(3)
+    x[rng.random(n_rows) < 0.1] = np.nan
+    label = np.where(np.isnan(x), "missing", np.where(x > 0, "high", "low"))
+    return pd.DataFrame({"x": x, "label": label})
+
+
+def test_rank_numeric_keeps_missing_values_in_their_own_bin():
+    model = ID3Model()
+    model.set_numeric_splits("histogram", n_bins=8)
+    values = np.array([5.0, np.nan, 1.0, 2.0, 3.0, 4.0, 6.0, 7.0, 8.0, 9.0, 10.0, np.nan])
+    codes, thresholds = model.rank_numeric(values)
+    missing = np.isnan(values)
+    assert len(set(codes[missing])) == 1
+    assert codes[missing][0] == codes.max()
+    assert codes[~missing].max() < codes[missing][0]
+    assert np.isnan(thresholds[-1]) and not np.isnan(thresholds[:-1]).any()
+
+
+@pytest.mark.parametrize("mode", ["threshold", "histogram"])
+def test_missing_values_get_their_own_branch(mode):
+    data = table_with_missing()
+    model = ID3Model()
+    model.set_numeric_splits(mode, n_bins=16)
+    model.build_tree_and_store(data, "label", "gain")
+    predictions = model.predict_batch(data.drop(columns=["label"]))
+    assert (predictions == data["label"].to_numpy()).mean() > 0.95
+    assert (predictions[data["x"].isna().to_numpy()] == "missing").all()
+
+
+def test_categorical_is_the_default_numeric_mode():
+    assert ID3Model().numeric_mode == "categorical"
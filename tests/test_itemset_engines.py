@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+from mlxtend.frequent_patterns import apriori
+
+from models.apriori_model import AprioriModel
+from models.itemset_cache import FrequentItemsetCache
+
+ALGORITHMS = ["apriori", "fpgrowth", "eclat", "son"]
+
+
+def one_hot_reference(data, min_sup):
+    """Tập phổ biến của mlxtend trên ma trận one-hot theo nhãn item (cách khai thác gốc)."""
+    one_hot = pd.crosstab(data["ID"], data["items"]).astype(bool)
+    result = apriori(one_hot, min_support=min_sup, use_colnames=True)
+    return {frozenset(itemset): support for itemset, support in zip(result["itemsets"], result["support"])}
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("seed", range(4))
+def test_engines_on_item_codes_match_one_hot_labels(seed, algorithm, sparse, random_transactions):
+    data = random_transactions(seed, n_transactions=60, n_items=9, density=0.4)
+    model = AprioriModel()
+    model.prepare_transactions(data)
+    model.set_params(0.2, 0.6)
+    model.set_algorithm(algorithm)
+    frequent = model.find_frequent_itemsets(model.generate_binary_matrix(sparse=sparse))
+
+    reference = one_hot_reference(data, 0.2)
+    assert set(frequent["itemsets"]) == reference.keys()
+    for itemset, support in zip(frequent["itemsets"], frequent["support"]):
+        assert support == pytest.approx(reference[itemset])
+        assert model.itemset_counts[tuple(model.item_labels.get_indexer(sorted(itemset)))] == round(support * 60)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_closed_itemsets_on_item_codes(seed, random_transactions):
+    data = random_transactions(seed, n_transactions=60, n_items=9, density=0.4)
+    model = AprioriModel()
+    model.prepare_transactions(data)
+    model.set_params(0.2, 0.6)
+    closed = model.find_closed_frequent_itemsets(model.generate_binary_matrix())
+
+    reference = one_hot_reference(data, 0.2)
+    expected = {
+        itemset for itemset, support in reference.items()
+        if not any(itemset < other and reference[other] == support for other in reference)
+    }
+    assert set(closed["itemsets"]) == expected
+
+
+def test_binary_matrix_must_match_prepared_transactions(random_transactions):
+    model = AprioriModel()
+    model.prepare_transactions(random_transactions(0, n_transactions=60, n_items=9, density=0.4))
+    model.set_params(0.2, 0.6)
+    with pytest.raises(ValueError):
+        model.find_frequent_itemsets(pd.DataFrame({"i0": [True, False]}))
+
+
+def test_cached_counts_match_mining_at_higher_min_sup(random_transactions):
+    data = random_transactions(1, n_transactions=60, n_items=9, density=0.4)
+    model = AprioriModel()
+    model.prepare_transactions(data)
+    model.set_params(0.2, 0.6)
+    model.find_frequent_itemsets(model.generate_binary_matrix())
+    cache = FrequentItemsetCache()
+    cache.put("data", 0.2, model.itemset_counts, model.n_transactions)
+
+    model.set_params(0.3, 0.6)
+    cached = model.set_frequent_itemsets(cache.get("data", 0.3))
+    cached_counts = model.itemset_counts
+    mined = model.find_frequent_itemsets(model.generate_binary_matrix())
+    assert cached_counts == model.itemset_counts
+    assert cached["itemsets"].tolist() == mined["itemsets"].tolist()
+    assert cache.get("data", 0.1) is None
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.naive_bayes_model import NaiveBayesModel
+
+
+def weather():
+    data = pd.DataFrame(
+        {
+            "outlook": ["sunny", "sunny", "rain", "rain", "overcast", "sunny", "rain", "overcast"],
+            "wind": ["weak", "strong", "weak", "strong", "weak", "weak", "weak", "strong"],
+            "play": ["no", "no", "yes", "no", "yes", "yes", "yes", "yes"],
+        }
+    )
+    return data[["outlook", "wind"]], data["play"]
+
+
+def test_laplace_log_table_matches_hand_computation():
+    X, y = weather()
+    model = NaiveBayesModel(laplace_smoothing=True)
+    model.fit(X, y)
+    classes, values, log_probs = model.log_tables["outlook"]
+    assert classes == ["no", "yes"]
+    # Lớp "no" (3 mẫu) chỉ gặp sunny, rain: k = 2; lớp "yes" (5 mẫu) gặp đủ 3 giá trị: k = 3
+    expected = {
+        ("no", "sunny"): (2 + 1) / (3 + 2),
+        ("no", "rain"): (1 + 1) / (3 + 2),
+        ("yes", "sunny"): (1 + 1) / (5 + 3),
+        ("yes", "rain"): (2 + 1) / (5 + 3),
+        ("yes", "overcast"): (2 + 1) / (5 + 3),
+    }
+    for (c, value), probability in expected.items():
+        assert log_probs[classes.index(c), values.get_loc(value)] == pytest.approx(np.log(probability))
+    assert np.isnan(log_probs[classes.index("no"), values.get_loc("overcast")])
+
+
+@pytest.mark.parametrize("laplace", [False, True])
+def test_predict_matches_predict_batch(laplace):
+    X, y = weather()
+    model = NaiveBayesModel(laplace_smoothing=laplace)
+    model.fit(X, y)
+    samples = pd.DataFrame(
+        {"outlook": ["sunny", "rain", "overcast", "snow"], "wind": ["weak", "strong", "calm", "strong"]}
+    )
+    labels, log_posteriors = model.predict_batch(samples)
+    assert labels.tolist() == [model.predict(sample) for sample in samples.to_dict("records")]
+    assert np.allclose(np.exp(log_posteriors).sum(axis=1), 1)
+
+
+def test_exact_tie_keeps_legacy_label():
+    # P(p) P(X|p) = 3/4 * 1/3 * 1/4 * 1/3 = 1/48 = 1/4 * 1/3 * 1/2 * 1/2 = P(q) P(X|q): hai lớp hòa về mặt toán học.
+    # Cách tính gốc lấy log của từng thương số và được q; điểm số phải trùng từng bit để argmax chọn như cũ.
+    X = pd.DataFrame({"f0": list("abba"), "f1": list("abca"), "f2": list("bcca")})
+    y = pd.Series(list("ppqp"))
+    model = NaiveBayesModel(laplace_smoothing=True)
+    model.fit(X, y)
+    sample = {"f0": "c", "f1": "c", "f2": "c"}
+    labels, log_posteriors = model.predict_batch(pd.DataFrame([sample]))
+    assert model.predict(sample) == "q"
+    assert labels.tolist() == ["q"]
+    assert np.allclose(np.exp(log_posteriors.to_numpy()), 0.5)
+
+
+@pytest.mark.parametrize("laplace", [False, True])
+def test_log_tables_are_log_of_legacy_quotient(laplace):
+    X, y = weather()
+    model = NaiveBayesModel(laplace_smoothing=laplace)
+    model.fit(X, y)
+    classes, values, log_probs = model.log_tables["wind"]
+    alpha = 1 if laplace else 0
+    for c, k in zip(["no", "yes"], [2, 2]):
+        total = (y == c).sum()
+        for value in ["weak", "strong"]:
+            count = ((X["wind"] == value) & (y == c)).sum()
+            assert log_probs[classes.index(c), values.get_loc(value)] == np.log((count + alpha) / (total + alpha * k))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    X, y = weather()
+    model = NaiveBayesModel(laplace_smoothing=True)
+    model.fit(X, y)
+    model.save_model(tmp_path / "model.dmm")
+
+    loaded = NaiveBayesModel()
+    loaded.load_model(tmp_path / "model.dmm")
+    assert loaded.laplace_smoothing
+    labels, log_posteriors = model.predict_batch(X)
+    loaded_labels, loaded_log_posteriors = loaded.predict_batch(X)
+    assert loaded_labels.tolist() == labels.tolist()
+    assert np.allclose(loaded_log_posteriors, log_posteriors)
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from models.son_model import count_partition
+from models.sampling_model import toivonen
+
+
+def brute_force_count(rows, itemset):
+    return sum(1 for row in rows if set(itemset) <= set(row.tolist()))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_partition_matches_brute_force(seed, random_csr):
+    offsets, items, rows = random_csr(seed)
+    candidates = [(item,) for item in range(40)] + [(0, 1), (0, 2), (1, 3), (0, 1, 2), (5, 39)]
+    counts = count_partition(offsets, items, 40, candidates)
+    assert counts.tolist() == [brute_force_count(rows, candidate) for candidate in candidates]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sampling_matches_exact_mining(seed, random_csr, apriori_counts):
+    offsets, items, _ = random_csr(seed)
+    exact = apriori_counts(offsets, items, 40, 0.05)
+    counts, report = toivonen(offsets, items, 40, 0.05, sample_fraction=0.5, seed=seed)
+    if report["exact"]:
+        assert counts == exact
+    else:
+        assert counts.items() <= exact.items()
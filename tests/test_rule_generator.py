@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mlxtend.frequent_patterns import association_rules
+
+from models.apriori_model import AprioriModel
+
+# mlxtend so độ tin cậy dạng số thực (support / support) nên có thể loại luật đúng bằng ngưỡng
+# (ví dụ (8/12) / (10/12) = 0.7999...); luật tham chiếu được lấy với ngưỡng trừ đi sai số nhỏ.
+EPSILON = 1e-9
+
+
+def boundary_transactions():
+    """A xuất hiện trong 10/12 giao dịch, B trong 10/12, {A, B} trong 8/12: độ tin cậy A -> B đúng bằng 0.8."""
+    rows = [(f"o{t}", "A") for t in range(10)] + [(f"o{t}", "B") for t in [*range(8), 10, 11]]
+    return pd.DataFrame(rows, columns=["ID", "items"])
+
+
+def mine(data, min_sup, min_conf):
+    model = AprioriModel()
+    model.prepare_transactions(data)
+    model.set_params(min_sup, min_conf)
+    model.find_frequent_itemsets(model.generate_binary_matrix())
+    return model
+
+
+def rule_confidences(rules):
+    return {
+        (frozenset(antecedent), frozenset(consequent)): confidence
+        for antecedent, consequent, confidence in zip(rules["antecedents"], rules["consequents"], rules["confidence"])
+    }
+
+
+def reference_rules(model, min_conf):
+    """Luật của mlxtend.association_rules trên cùng tập phổ biến, giữ cả luật đúng bằng ngưỡng."""
+    return association_rules(
+        model.frequent_itemsets, num_itemsets=model.num_itemsets, metric="confidence", min_threshold=min_conf - EPSILON
+    )
+
+
+def assert_same_rules(native, reference):
+    native, reference = rule_confidences(native), rule_confidences(reference)
+    assert native.keys() == reference.keys()
+    for rule, confidence in native.items():
+        assert confidence == pytest.approx(reference[rule])
+
+
+def test_rule_at_exact_min_conf_is_kept():
+    model = mine(boundary_transactions(), 0.5, 0.8)
+    model.generate_rules_native()
+    rules = rule_confidences(model.rules_to_frame())
+    assert rules == {(frozenset("A"), frozenset("B")): 0.8, (frozenset("B"), frozenset("A")): 0.8}
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("min_conf", [0.5, 0.6, 0.75, 0.8])
+def test_native_rules_match_mlxtend(seed, min_conf, random_transactions):
+    model = mine(random_transactions(seed), 0.5, min_conf)
+    model.generate_rules_native()
+    native = model.rules_to_frame()
+    assert_same_rules(native, reference_rules(model, min_conf))
+
+
+def test_closed_rule_at_exact_min_conf_is_kept():
+    model = mine(boundary_transactions(), 0.5, 0.8)
+    closed = model.find_closed_frequent_itemsets(model.generate_binary_matrix())
+    rules = rule_confidences(model.generate_rules_from_closed(closed))
+    assert rules == {(frozenset("A"), frozenset("B")): 0.8, (frozenset("B"), frozenset("A")): 0.8}
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("min_conf", [0.5, 0.75, 0.8])
+def test_closed_rules_match_mlxtend(seed, min_conf, random_transactions):
+    model = mine(random_transactions(seed), 0.5, min_conf)
+    closed = model.find_closed_frequent_itemsets(model.generate_binary_matrix())
+    native = model.generate_rules_from_closed(closed)
+    # Luật sinh từ tập đóng là các luật A -> C - A với C là tập đóng
+    closed_sets = set(closed["itemsets"])
+    reference = reference_rules(model, min_conf)
+    is_closed = np.array([a | c in closed_sets for a, c in zip(reference["antecedents"], reference["consequents"])], dtype=bool)
+    reference = reference[is_closed]
+    assert_same_rules(native, reference)